@@ -6,20 +6,24 @@ Provides REST endpoints to manage search.json configuration
 import json
 import logging
 import os
+import threading
+import time
 import uuid
 from datetime import datetime
 
-import apprise
 import requests
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
 
 from reddit_scraper import config as rs_config
+from reddit_scraper import control as rs_control
 from reddit_scraper import credentials as rs_credentials
+from reddit_scraper import events as rs_events
+from reddit_scraper import metrics as rs_metrics
 from reddit_scraper import models
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+CORS(app, expose_headers=['ETag'])  # Enable CORS for all routes (ETag readable by the UI)
 
 # Configuration (paths + shared helpers come from the reddit_scraper package)
 DATA_DIR = rs_config.get_data_dir()
@@ -32,13 +36,66 @@ MONITOR_INPUT_FIELDS = tuple(f for f in models.Monitor.model_fields if f != 'id'
 
 
 def load_config():
-    """Load configuration from search.json (normalizing ids/fields). Delegates to shared package."""
-    return rs_config.load_managed_config()
+    """Load configuration from search.json (normalizing ids/fields). Served from the shared
+    package's in-process cache, which is only re-read when the file's stat changes."""
+    return rs_config.get_cached_config()
 
 
 def save_config(config):
-    """Save configuration to search.json file."""
-    rs_config.save_config(config)
+    """Save configuration to search.json file (and refresh the in-process cache), then tell
+    the bot over its control socket so the change applies immediately."""
+    rs_config.save_managed_config(config)
+    rs_control.notify('config_changed')
+
+
+def monitor_position(monitors, monitor_id):
+    """Index of monitor_id in `monitors` (a load_config() list) via the cache's id index,
+    or None. Verified against the list in case the file changed between the two reads."""
+    i, _ = rs_config.find_cached_monitor(monitor_id)
+    if i is None or i >= len(monitors) or monitors[i].get('id') != monitor_id:
+        return None
+    return i
+
+
+def conditional(response, etag=None):
+    """Tag a GET response with an ETag (given, or a hash of the body) and answer a matching
+    If-None-Match with a bodiless 304, so polling clients don't re-download unchanged data."""
+    if etag:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    return response.make_conditional(request)
+
+
+def not_modified(etag):
+    """A 304 for `etag` if the client already has it, else None (lets a handler skip
+    building a large body it won't send)."""
+    if etag and request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+@app.before_request
+def start_timer():
+    g.request_started = time.monotonic()
+
+
+@app.after_request
+def record_request(response):
+    """Count/time every request by route pattern (not raw path, to keep label sets small)."""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    rs_metrics.API_REQUESTS.inc(method=request.method, endpoint=endpoint, status=response.status_code)
+    if 'request_started' in g:
+        rs_metrics.API_LATENCY.observe(time.monotonic() - g.request_started, endpoint=endpoint)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text-format metrics for this API process (see reddit_scraper.metrics)."""
+    return Response(rs_metrics.render(), content_type=rs_metrics.CONTENT_TYPE)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -95,7 +152,57 @@ def bot_status():
     except Exception as e:
         status.setdefault('error', str(e))
 
-    return jsonify(status)
+    # The body mixes bot_status.json (its updated_at changes on every write) with the source
+    # capability, so the ETag is a hash of the whole body rather than updated_at alone.
+    return conditional(jsonify(status))
+
+
+# Seconds between SSE keep-alive comments (keeps proxies from closing an idle stream).
+EVENTS_KEEPALIVE_SECONDS = 15
+# An open /api/events stream holds one server thread for as long as the page stays open, so
+# each worker serves at most this many at once, leaving its other threads for the rest of
+# the API (see server_options). Extra streams get a 503 and the page just goes without
+# live updates.
+EVENTS_MAX_STREAMS = int(os.environ.get('API_EVENT_STREAMS', '4'))
+_event_streams = threading.BoundedSemaphore(EVENTS_MAX_STREAMS)
+
+
+def format_sse(cursor, event):
+    """One Server-Sent Events frame; the id is the log cursor so reconnects resume."""
+    return f"id: {cursor}\nevent: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n\n"
+
+
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    """Live feed of bot events (status transitions, monitor runs, matches) as SSE, tailed
+    from the bot's append-only event log. EventSource reconnects send Last-Event-ID, so a
+    dropped connection picks up where it left off."""
+    if not _event_streams.acquire(blocking=False):
+        response = jsonify({'error': 'Too many open event streams'})
+        response.headers['Retry-After'] = str(EVENTS_KEEPALIVE_SECONDS)
+        return response, 503
+    try:
+        tail = rs_events.EventTail(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    except Exception:
+        _event_streams.release()
+        raise
+
+    def generate():
+        yield "retry: 3000\n\n"
+        while True:
+            batch = tail.wait(EVENTS_KEEPALIVE_SECONDS)
+            if not batch:
+                yield ": keep-alive\n\n"
+            for cursor, event in batch:
+                yield format_sse(cursor, event)
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+    response.call_on_close(_event_streams.release)  # when the client goes away
+    return response
 
 
 @app.route('/api/subreddits/search', methods=['GET'])
@@ -169,8 +276,12 @@ def validate_subreddit(subreddit_name):
 def get_monitors():
     """Get all monitors."""
     try:
+        etag = rs_config.get_cached_config_etag()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         config = load_config()
-        return jsonify({'monitors': config.get('subreddits_to_search', [])})
+        return conditional(jsonify({'monitors': config.get('subreddits_to_search', [])}), etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -187,18 +298,20 @@ def create_monitor():
         if not data.get('subreddit'):
             return jsonify({'error': 'Subreddit is required'}), 400
 
-        config = load_config()
-        monitors = config.get('subreddits_to_search', [])
+        # Locked read-modify-write so a concurrent update from another worker isn't lost.
+        with rs_config.config_lock():
+            config = load_config()
+            monitors = config.get('subreddits_to_search', [])
 
-        # Validate + default through the model (which normalizes subreddit, fills name, etc.).
-        payload = {field: data[field] for field in MONITOR_INPUT_FIELDS if field in data}
-        payload['id'] = str(uuid.uuid4())
-        payload.setdefault('color', DEFAULT_COLORS[len(monitors) % len(DEFAULT_COLORS)])
-        new_monitor = models.Monitor(**payload).to_stored_dict()
+            # Validate + default through the model (which normalizes subreddit, fills name, etc.).
+            payload = {field: data[field] for field in MONITOR_INPUT_FIELDS if field in data}
+            payload['id'] = str(uuid.uuid4())
+            payload.setdefault('color', DEFAULT_COLORS[len(monitors) % len(DEFAULT_COLORS)])
+            new_monitor = models.Monitor(**payload).to_stored_dict()
 
-        monitors.append(new_monitor)
-        config['subreddits_to_search'] = monitors
-        save_config(config)
+            monitors.append(new_monitor)
+            config['subreddits_to_search'] = monitors
+            save_config(config)
 
         return jsonify(new_monitor), 201
     except Exception as e:
@@ -209,14 +322,10 @@ def create_monitor():
 def get_monitor(monitor_id):
     """Get a specific monitor by ID."""
     try:
-        config = load_config()
-        monitors = config.get('subreddits_to_search', [])
-
-        for monitor in monitors:
-            if monitor.get('id') == monitor_id:
-                return jsonify(monitor)
-
-        return jsonify({'error': 'Monitor not found'}), 404
+        _, monitor = rs_config.find_cached_monitor(monitor_id)
+        if monitor is None:
+            return jsonify({'error': 'Monitor not found'}), 404
+        return jsonify(monitor)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -230,25 +339,23 @@ def update_monitor(monitor_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
-        config = load_config()
-        monitors = config.get('subreddits_to_search', [])
-
-        for i, monitor in enumerate(monitors):
-            if monitor.get('id') == monitor_id:
-                # Merge the client-settable fields onto the existing monitor, then re-validate
-                # + re-serialize through the model (preserving id and any bot-only fields).
-                merged = dict(monitor)
-                for field in MONITOR_INPUT_FIELDS:
-                    if field in data:
-                        merged[field] = data[field]
-                monitors[i] = models.Monitor(**merged).to_stored_dict()
-
-                config['subreddits_to_search'] = monitors
-                save_config(config)
-
-                return jsonify(monitors[i])
-
-        return jsonify({'error': 'Monitor not found'}), 404
+        with rs_config.config_lock():
+            config = load_config()
+            monitors = config['subreddits_to_search']
+            i = monitor_position(monitors, monitor_id)
+            if i is None:
+                return jsonify({'error': 'Monitor not found'}), 404
+
+            # Merge the client-settable fields onto the existing monitor, then re-validate
+            # + re-serialize through the model (preserving id and any bot-only fields).
+            merged = dict(monitors[i])
+            for field in MONITOR_INPUT_FIELDS:
+                if field in data:
+                    merged[field] = data[field]
+            monitors[i] = models.Monitor(**merged).to_stored_dict()
+            save_config(config)
+
+        return jsonify(monitors[i])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -257,19 +364,38 @@ def update_monitor(monitor_id):
 def delete_monitor(monitor_id):
     """Delete a monitor."""
     try:
-        config = load_config()
-        monitors = config.get('subreddits_to_search', [])
+        with rs_config.config_lock():
+            config = load_config()
+            i = monitor_position(config['subreddits_to_search'], monitor_id)
+            if i is None:
+                return jsonify({'error': 'Monitor not found'}), 404
+
+            deleted = config['subreddits_to_search'].pop(i)
+            save_config(config)
+        return jsonify({'deleted': deleted})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        for i, monitor in enumerate(monitors):
-            if monitor.get('id') == monitor_id:
-                deleted = monitors.pop(i)
-                config['subreddits_to_search'] = monitors
-                save_config(config)
-                return jsonify({'deleted': deleted})
 
+@app.route('/api/monitors/<monitor_id>/run', methods=['POST'])
+def run_monitor_now(monitor_id):
+    """Ask the bot to run a monitor right away (over its control socket)."""
+    _, monitor = rs_config.find_cached_monitor(monitor_id)
+    if monitor is None:
         return jsonify({'error': 'Monitor not found'}), 404
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    try:
+        return jsonify(rs_control.send_command('run_monitor', monitor_id=monitor_id))
+    except rs_control.ControlError as e:
+        return jsonify({'error': str(e)}), 503
+
+
+@app.route('/api/bot/stats', methods=['GET'])
+def bot_stats():
+    """Live stats from the running bot (loop, schedule and source state)."""
+    try:
+        return jsonify(rs_control.send_command('dump_stats'))
+    except rs_control.ControlError as e:
+        return jsonify({'error': str(e)}), 503
 
 
 # Credentials file path
@@ -282,8 +408,9 @@ def load_credentials():
 
 
 def save_credentials(credentials):
-    """Save credentials to credentials.json file."""
+    """Save credentials to credentials.json file and tell the bot to reload them."""
     rs_credentials.save_credentials_file(credentials)
+    rs_control.notify('credentials_changed')
 
 
 def is_configured():
@@ -298,15 +425,17 @@ def get_credentials_status():
     """Check if credentials are configured (without exposing them)."""
     creds = load_credentials()
     notification_urls = creds.get('notification_urls', [])
-    return jsonify(
-        {
-            'configured': is_configured(),
-            'has_reddit': bool(creds.get('reddit_client_id') and creds.get('reddit_client_secret')),
-            'has_notifications': len(notification_urls) > 0,
-            'notification_count': len(notification_urls),
-            'has_reddit_username': bool(creds.get('reddit_username')),
-            'has_sylvia': bool(creds.get('sylvia_api_key')),
-        }
+    return conditional(
+        jsonify(
+            {
+                'configured': is_configured(),
+                'has_reddit': bool(creds.get('reddit_client_id') and creds.get('reddit_client_secret')),
+                'has_notifications': len(notification_urls) > 0,
+                'notification_count': len(notification_urls),
+                'has_reddit_username': bool(creds.get('reddit_username')),
+                'has_sylvia': bool(creds.get('sylvia_api_key')),
+            }
+        )
     )
 
 
@@ -412,6 +541,30 @@ def validate_reddit_credentials(client_id, client_secret, username, password, us
         return False, f"Connection error: {str(e)}"
 
 
+def apply_credential_updates(creds, data):
+    """Apply a PUT /api/credentials payload onto `creds` (in place) and return it."""
+    # Only update fields that are provided and not masked
+    fields = [
+        'reddit_client_id',
+        'reddit_client_secret',
+        'reddit_username',
+        'reddit_password',
+        'reddit_user_agent',
+        'sylvia_api_key',
+    ]
+
+    for field in fields:
+        if field in data and not is_masked(data[field]):
+            creds[field] = data[field]
+
+    # Handle notification_urls array
+    if 'notification_urls' in data:
+        # Filter out empty strings
+        urls = [url.strip() for url in data['notification_urls'] if url and url.strip()]
+        creds['notification_urls'] = urls
+    return creds
+
+
 @app.route('/api/credentials', methods=['PUT'])
 def update_credentials():
     """Update credentials."""
@@ -420,29 +573,10 @@ def update_credentials():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
-        creds = load_credentials()
+        creds = apply_credential_updates(load_credentials(), data)
 
-        # Only update fields that are provided and not masked
-        fields = [
-            'reddit_client_id',
-            'reddit_client_secret',
-            'reddit_username',
-            'reddit_password',
-            'reddit_user_agent',
-            'sylvia_api_key',
-        ]
-
-        for field in fields:
-            if field in data and not is_masked(data[field]):
-                creds[field] = data[field]
-
-        # Handle notification_urls array
-        if 'notification_urls' in data:
-            # Filter out empty strings
-            urls = [url.strip() for url in data['notification_urls'] if url and url.strip()]
-            creds['notification_urls'] = urls
-
-        # Validate Reddit credentials if requested or if they changed
+        # Validate Reddit credentials if requested or if they changed. This talks to Reddit,
+        # so it runs outside the file lock; the update is re-applied under the lock below.
         validate = data.get('validate', False)
         if validate:
             valid, error = validate_reddit_credentials(
@@ -455,7 +589,9 @@ def update_credentials():
             if not valid:
                 return jsonify({'success': False, 'error': error, 'validation_failed': True}), 400
 
-        save_credentials(creds)
+        with rs_credentials.credentials_lock():
+            creds = apply_credential_updates(load_credentials(), data)
+            save_credentials(creds)
 
         return jsonify(
             {
@@ -491,9 +627,10 @@ def update_source_order():
         if active not in presets:
             return jsonify({'error': f"active_source must be one of {list(presets)}"}), 400
 
-        config = load_config() or {}
-        config['source_order'] = presets[active]
-        save_config(config)
+        with rs_config.config_lock():
+            config = load_config() or {}
+            config['source_order'] = presets[active]
+            save_config(config)
         return jsonify({'success': True, 'active_source': active, 'source_order': presets[active]})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -533,6 +670,8 @@ def test_notification():
         if not notification_urls:
             return jsonify({'success': False, 'error': 'No notification services configured'}), 400
 
+        import apprise  # deferred: only this route needs it
+
         # Create Apprise instance and add all URLs
         apobj = apprise.Apprise()
         for url in notification_urls:
@@ -555,13 +694,70 @@ def test_notification():
         return jsonify({'error': str(e)}), 500
 
 
+# --- Serving ---
+# The Flask dev server is fine for local hacking, but in a container the API should run
+# under gunicorn: several worker processes (search.json access is cached per process and
+# writes are atomic + locked, see reddit_scraper.filestore) each with a thread pool, so a
+# slow reddit.com lookup (search/validate) doesn't stall every other UI call. Send the
+# master SIGHUP (e.g. `docker kill -s HUP reddit-api`) for a graceful reload: new workers
+# start and old ones finish their in-flight requests before exiting.
+API_PORT = int(os.environ.get('API_PORT', '5001'))
+
+
+def server_options(workers=None, threads=None, port=None):
+    """gunicorn settings for serve(); explicit args override API_WORKERS/API_THREADS/API_PORT.
+
+    Each open /api/events stream occupies a thread of its worker for as long as the page is
+    open, so up to API_EVENT_STREAMS of every worker's `threads` go to live feeds; keep
+    `threads` above that or the other endpoints queue behind them."""
+    return {
+        'bind': f"0.0.0.0:{port or API_PORT}",
+        'workers': workers or int(os.environ.get('API_WORKERS', '2')),
+        'threads': threads or int(os.environ.get('API_THREADS', '8')),
+        'worker_class': 'gthread',
+        'timeout': int(os.environ.get('API_WORKER_TIMEOUT_SECONDS', '60')),
+        'graceful_timeout': 30,
+        'accesslog': None,
+        'errorlog': '-',
+    }
+
+
+def serve(options):
+    """Run `app` under gunicorn with the given settings (blocks until shutdown)."""
+    from gunicorn.app.base import BaseApplication
+
+    class _Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    _Server().run()
+
+
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reddit Monitor web API")
+    parser.add_argument('--serve', action='store_true', help="run under the production WSGI server (gunicorn)")
+    parser.add_argument('--workers', type=int, help="worker processes (default API_WORKERS or 2)")
+    parser.add_argument('--threads', type=int, help="threads per worker (default API_THREADS or 8)")
+    parser.add_argument('--port', type=int, help="port to bind (default API_PORT or 5001)")
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO, format='%(message)s')
     logging.info("📡 Reddit Monitor API starting...")
     logging.info(f"📁 Config file: {CONFIG_FILE_PATH}")
     logging.info(f"🔐 Credentials file: {CREDENTIALS_FILE_PATH}")
-    logging.info("🌐 API available at: http://0.0.0.0:5001")
+    logging.info(f"🌐 API available at: http://0.0.0.0:{args.port or API_PORT}")
     logging.info("📱 Access from other devices using your local IP")
-    # Use debug=False in production for better performance
-    debug_mode = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
-    app.run(host='0.0.0.0', port=5001, debug=debug_mode)
+    if args.serve:
+        options = server_options(args.workers, args.threads, args.port)
+        logging.info(f"🚀 Serving with gunicorn: {options['workers']} worker(s) x {options['threads']} thread(s)")
+        serve(options)
+    else:
+        # Use debug=False in production for better performance
+        debug_mode = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
+        app.run(host='0.0.0.0', port=args.port or API_PORT, debug=debug_mode)
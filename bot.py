@@ -3,19 +3,44 @@
 Wiring + main loop only; the implementation lives in the reddit_scraper package.
 """
 
+import argparse
+import atexit
 import logging
+import os
+import signal
+import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
 
 from colorama import Fore, Style, init
 from dotenv import load_dotenv
 
-from reddit_scraper import config, credentials, health
-from reddit_scraper.monitor import RedditMonitor
+from reddit_scraper import (
+    config,
+    control,
+    credentials,
+    events,
+    health,
+    lanes,
+    latency,
+    metrics,
+    notifications,
+    scheduler,
+    shards,
+    sources,
+    status,
+    watcher,
+)
 
 # Re-exported for the test suite / external callers.
+from reddit_scraper.monitor import RedditMonitor  # noqa: F401
 from reddit_scraper.sources import fetch_posts_json, fetch_thread_comments_json  # noqa: F401
 
+MIN_CYCLE_SECONDS = 15  # shortest sleep between cycles, even when a monitor is due sooner
+STOP_CHECK_SECONDS = 1  # how soon the sleeping loop notices a SIGTERM (see BotSignals.request_stop)
+COORDINATOR_CYCLE_SECONDS = 5  # how often a sharded bot's coordinator checks on its workers
+COORDINATOR_HEARTBEAT_SECONDS = 60  # how often it pushes the workers' combined health to Kuma
+
 # Initialize colorama and logging
 init(autoreset=True)
 
@@ -46,98 +71,374 @@ logging.basicConfig(level=logging.INFO, handlers=[_handler])
 load_dotenv()
 
 
-def main():
+class BotSignals:
+    """Requests reaching the main loop from other threads (the control socket): what to
+    reload and which monitors to run right away. The loop sleeps in `wait`, so a request
+    wakes it immediately instead of after the 2-minute cycle."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.reload = set()  # 'config' / 'credentials'
+        self.run_now = set()  # monitor ids to run on the next pass regardless of schedule
+        self.stats = {}  # loop stats published by the main loop, read by dump_stats
+        self.stopping = False  # set by the SIGTERM handler
+
+    def request_reload(self, what):
+        with self._lock:
+            self.reload.add(what)
+        self._wake.set()
+
+    def request_run(self, monitor_id):
+        with self._lock:
+            self.run_now.add(monitor_id)
+        self._wake.set()
+
+    def take(self):
+        """Pop pending requests: (reload set, run-now id set)."""
+        with self._lock:
+            reload, run_now = self.reload, self.run_now
+            self.reload, self.run_now = set(), set()
+            self._wake.clear()
+        return reload, run_now
+
+    def request_stop(self):
+        """For the SIGTERM handler, which runs on the main thread between any two bytecodes
+        (possibly inside a lock the loop holds), so it only sets a flag: no locks, no I/O.
+        The loop saves and exits on its own thread once it sees the flag."""
+        self.stopping = True
+
+    def wait(self, timeout):
+        """Sleep up to `timeout` seconds; True if woken by a request or a stop."""
+        deadline = time.monotonic() + timeout
+        while not self.stopping:
+            if self._wake.wait(max(0.0, min(deadline - time.monotonic(), STOP_CHECK_SECONDS))):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+        return True
+
+    def publish_stats(self, **stats):
+        with self._lock:
+            self.stats = {**self.stats, **stats}
+
+    def dump_stats(self):
+        """Loop stats plus live source state, for the control socket's dump_stats."""
+        now = time.time()
+        with self._lock:
+            stats = dict(self.stats)
+        last_ok = sources.get_last_fetch_success_ts()
+        cooldowns = {s: int(until - now) for s, until in sources._state.source_cooldown_until.items() if until > now}
+        return {
+            **stats,
+            'active_source': sources.get_active_source(),
+            'last_fetch_success_age': None if last_ok is None else round(now - last_ok, 1),
+            'source_cooldowns': cooldowns,
+            'proxies': sources.get_proxy_health(),
+        }
+
+
+def control_handlers(signals):
+    """Command handlers for the bot's control socket (see reddit_scraper.control)."""
+
+    def config_changed():
+        signals.request_reload('config')
+        return {'queued': 'config'}
+
+    def credentials_changed():
+        signals.request_reload('credentials')
+        return {'queued': 'credentials'}
+
+    def run_monitor_now(monitor_id):
+        signals.request_run(monitor_id)
+        return {'queued': monitor_id}
+
+    return {
+        'config_changed': config_changed,
+        'credentials_changed': credentials_changed,
+        'run_monitor': run_monitor_now,
+        'dump_stats': signals.dump_stats,
+    }
+
+
+def run_monitor(monitor, deadline=None):
+    """Run one monitor and put its outcome on the live event feed (served by /api/events).
+    Its fetches must finish within `deadline` seconds (see sources.run_deadline); a run that
+    runs out of time is abandoned, counted and reported like any other failed run."""
+    started = time.time()
+    outcome = {'monitor_id': monitor.monitor_id, 'monitor': monitor.name}
+    try:
+        with sources.run_deadline(deadline):
+            monitor.run()
+    except sources.DeadlineExceeded as e:
+        metrics.RUNS_ABANDONED.inc()
+        error = f"run abandoned after {deadline:.0f}s deadline ({e})"
+        events.publish('run', **outcome, ok=False, error=error, duration=round(time.time() - started, 3))
+        raise sources.DeadlineExceeded(error) from e
+    except Exception as e:
+        events.publish('run', **outcome, ok=False, error=str(e), duration=round(time.time() - started, 3))
+        raise
+    events.publish('run', **outcome, ok=True, duration=round(time.time() - started, 3))
+
+
+def housekeeping(sections, shard=None):
+    """Per-cycle upkeep, run in its own lane so a slow webhook or Kuma push can't stall the loop."""
+    # Send the aggregated error summary once its rate-limit window has elapsed
+    notifications.flush_errors()
+    if shard is None:
+        status.update_bot_status(**sections)
+    else:
+        # The coordinator sends the Kuma heartbeats for every worker from these
+        status.update_shard_status(shard.index, **sections, fetch_health=sources.get_fetch_health())
+    sources.save_source_state()
+    # Report health to Uptime Kuma (up only if a Reddit fetch succeeded recently)
+    if shard is None:
+        health.send_kuma_heartbeat()
+
+
+def reap(runner):
+    """Report what the lanes finished (or overran) since the last pass; returns the
+    schedule entries whose monitor run completed."""
+    finished = []
+    for done in runner.reap():
+        if done.overrun:
+            notifications.notify_error(f"{done.key} still running after its {done.lane}-lane timeout")
+        elif done.error is not None:
+            what = 'housekeeping' if done.lane == lanes.HOUSEKEEPING else 'subreddit search'
+            notifications.notify_error(f"Error during {what}: {done.error}")
+        elif done.lane != lanes.HOUSEKEEPING:
+            finished.append(done.payload)
+    return finished
+
+
+def main(shard=None):
+    """The bot loop. With `shard` (see shards) this process is one worker of a sharded bot:
+    it runs only its share of the monitors and leaves the control socket, file watcher and
+    notification sending to the coordinator."""
+    if shard is not None:
+        shard.join()
     credentials.detect_auth_capability()
-    reddit = credentials.authenticate_reddit()  # Authenticate Reddit once (None if no creds)
+    # One client per Reddit app, built (and PRAW imported) on first use; None if no creds
+    reddit_apps = credentials.reddit_accounts(credentials.CREDENTIALS)
+    reddit = credentials.authenticate_reddit_pool()
 
     # Initial config load
     cfg = config.read_config()
     if cfg is None:
         exit(1)
 
-    subreddits_to_search = cfg.get('subreddits_to_search', [])
+    # Today's paid-request spend survives a restart (see sources.SYLVIA_DAILY_BUDGET)
+    saved_status = status.read_bot_status()
+    sources.restore_source_usage((shard.saved_status(saved_status) if shard else saved_status).get('source_usage'))
+    # Cooldowns/backoff from before the restart, saved each cycle and on shutdown
+    sources.restore_source_state()
+    atexit.register(sources.save_source_state)  # backstop; the loop saves when it stops
+    # Post monitors, thread scans and housekeeping each get their own pool (see lanes)
+    runner = lanes.Lanes()
+    signals = BotSignals()
+    signal.signal(signal.SIGTERM, lambda *_: signals.request_stop())  # `docker stop`
+    # Listings fetched just before a restart are reused instead of re-fetched (opt-in)
+    warm = sources.open_response_cache()
+    if warm:
+        logging.info(f"Response cache: {warm} listing(s) fresh enough to reuse")
+
+    def own_monitors(cfg):
+        monitors = cfg.get('subreddits_to_search', [])
+        return shard.select(monitors) if shard else monitors
+
+    schedule = scheduler.Scheduler()
+    schedule.apply(own_monitors(cfg))
     config.apply_source_order_from_config(cfg)
-    last_config_mtime = config.get_config_mtime()
-    last_creds_mtime = config.get_credentials_mtime()
+    last_config_sig = config.get_config_signature()
+    last_creds_sig = config.get_credentials_signature()
 
-    # Track last run time for each monitor by ID
-    last_run_times = {}
+    if shard is None:
+        # The API pushes config/credential changes and run-now requests over this socket.
+        control.ControlServer(control_handlers(signals)).start()
+        # Edits made outside the API (by hand, by another tool) wake the loop via inotify.
+        watcher.FileWatcher(
+            config.get_data_dir(),
+            {'search.json': 'config', 'credentials.json': 'credentials'},
+            signals.request_reload,
+        ).start()
+        metrics.start_http_server()  # /metrics for Prometheus, only if METRICS_PORT is set
+    else:
+        shard.listen(signals.request_reload, signals.request_run)  # forwarded by the coordinator
+        metrics.start_http_server(shard.metrics_port())
+    sources.start_proxy_prober()  # re-tests cooled-down proxies, only if a pool is configured
 
     loop_time = 0
-    while True:
-        # Check if config file has been modified
-        current_mtime = config.get_config_mtime()
-        if current_mtime and last_config_mtime and current_mtime > last_config_mtime:
+    while not signals.stopping:
+        _, run_now = signals.take()
+
+        # Reload when search.json's (inode, mtime_ns, size) signature moved since the last
+        # successful load. The watcher / control socket only wake the loop; comparing
+        # signatures here also de-duplicates a change reported by both.
+        current_sig = config.get_config_signature()
+        if current_sig != last_config_sig:
             logging.info("Configuration file changed, reloading...")
             new_config = config.read_config()
             if new_config is not None:
                 cfg = new_config
-                subreddits_to_search = cfg.get('subreddits_to_search', [])
+                schedule.apply(own_monitors(cfg))  # only touches changed monitors
                 config.apply_source_order_from_config(cfg)
-                last_config_mtime = current_mtime
+                last_config_sig = current_sig
                 logging.info("Configuration reloaded successfully.")
             else:
                 logging.warning("Failed to reload configuration, using previous settings.")
 
         # Reload credentials when credentials.json changes (e.g. a Sylvia key or Reddit
         # app entered via the UI) so new keys take effect without restarting the bot.
-        current_creds_mtime = config.get_credentials_mtime()
-        if current_creds_mtime != last_creds_mtime:
+        current_creds_sig = config.get_credentials_signature()
+        if current_creds_sig != last_creds_sig:
             logging.info("Credentials changed, reloading...")
             credentials.detect_auth_capability()  # re-bridges the Sylvia key into sources
-            reddit = credentials.authenticate_reddit()  # pick up new/changed Reddit app creds
-            last_creds_mtime = current_creds_mtime
-
-        # Filter to only enabled monitors
-        enabled_monitors = [m for m in subreddits_to_search if m.get('enabled', True)]
-
-        # Determine which monitors are due to run based on their refresh interval
-        current_time = time.time()
-        monitors_to_run = []
+            # Only a change to the Reddit apps themselves needs new clients (and tokens);
+            # a new notification URL or Sylvia key keeps the current pool.
+            if credentials.reddit_accounts(credentials.CREDENTIALS) != reddit_apps:
+                reddit_apps = credentials.reddit_accounts(credentials.CREDENTIALS)
+                reddit = credentials.authenticate_reddit_pool()
+            last_creds_sig = current_creds_sig
 
-        for monitor in enabled_monitors:
-            monitor_id = monitor.get('id', monitor.get('subreddit', 'unknown'))
-            # Use cooldown_minutes as the per-monitor refresh interval (default 10 min)
-            refresh_interval = monitor.get('cooldown_minutes', 10) * 60  # seconds
+        # Post rate per subreddit from the runs that finished since the last pass, for
+        # monitors polled adaptively
+        schedule.observe(reap(runner), time.time())
 
-            last_run = last_run_times.get(monitor_id, 0)
-            time_since_last_run = current_time - last_run
-
-            if time_since_last_run >= refresh_interval:
-                monitors_to_run.append(monitor)
-                last_run_times[monitor_id] = current_time
+        # Monitors due by their own refresh interval (cooldown_minutes), plus run-now requests,
+        # handed to their lane without waiting; one whose last run is still going is skipped
+        enabled_monitors = schedule.enabled()
+        monitors_to_run = schedule.due(time.time(), run_now)
+        for entry in monitors_to_run:
+            name = entry.params.get('name', entry.params.get('subreddit'))
+            lane = lanes.lane_for(entry.params)
+            # A run gets its lane's timeout, or its own interval if shorter, to finish fetching
+            deadline = min(runner[lane].timeout, schedule.interval(entry))
+            if runner[lane].submit(
+                scheduler.monitor_key(entry.params), run_monitor, entry.monitor_for(reddit), deadline, payload=entry
+            ):
                 logging.info(
-                    f"Running monitor: {monitor.get('name', monitor.get('subreddit'))} "
-                    f"(interval: {monitor.get('cooldown_minutes', 10)} min)"
+                    f"Running monitor: {name} (interval: {schedule.interval(entry) / 60:.1f} min, lane: {lane})"
                 )
             else:
-                time_remaining = int((refresh_interval - time_since_last_run) / 60)
-                logging.debug(
-                    f"Skipping {monitor.get('name', monitor.get('subreddit'))} - {time_remaining} min until next run"
-                )
-
-        if monitors_to_run:
-            with ThreadPoolExecutor() as executor:
-                futures = [executor.submit(RedditMonitor(reddit, **params).run) for params in monitors_to_run]
-
-                for future in futures:
-                    try:
-                        future.result()
-                    except Exception as e:
-                        error_message = f"Error during subreddit search: {e}"
-                        logging.error(error_message)
-                        RedditMonitor(reddit, subreddit='error', keywords=[]).send_error_notification(error_message)
-        else:
+                logging.info(f"Skipping monitor {name}: its previous run is still going")
+        if not monitors_to_run:
             logging.debug("No monitors due to run this cycle")
 
-        # Report health to Uptime Kuma (up only if a Reddit fetch succeeded recently)
-        health.send_kuma_heartbeat()
+        # Post-to-alert latency per monitor/source, schedule, accounts, paid-request budget and lanes, for /api/status
+        runner[lanes.HOUSEKEEPING].submit(
+            lanes.HOUSEKEEPING,
+            housekeeping,
+            dict(
+                detection_latency=latency.snapshot(),
+                schedule=schedule.snapshot(time.time()),
+                reddit_accounts=reddit.snapshot() if reddit else {},
+                source_usage=sources.get_source_usage(),
+                lanes=runner.snapshot(),
+            ),
+            shard,
+        )
+
+        signals.publish_stats(
+            cycle=loop_time,
+            monitors_enabled=len(enabled_monitors),
+            monitors_run_last_cycle=len(monitors_to_run),
+            last_run_times=schedule.last_run_times(),
+        )
 
-        # Base cycle interval - check every 2 minutes (monitors have their own schedules)
-        logging.info(f"Cycle {loop_time} complete. Sleeping for 2 minutes before next check...")
+        # Base cycle interval - check every 2 minutes (monitors have their own schedules),
+        # sooner when an adaptively-polled monitor is due first or a control command arrives.
+        next_due = schedule.next_due_in(time.time())
+        sleep_for = 120 if next_due is None else min(120, max(MIN_CYCLE_SECONDS, next_due))
+        logging.info(f"Cycle {loop_time} complete. Sleeping for {sleep_for:.0f}s before next check...")
         loop_time += 1
-        time.sleep(120)  # Check every 2 minutes for lower CPU usage
+        signals.wait(sleep_for)
+
+    # Save now, on this thread: the interpreter joins still-running lane tasks (a 600s thread
+    # scan, a throttled RSS wait) before atexit runs, which can outlast `docker stop`'s grace period.
+    logging.info("Stopping: saving source state")
+    sources.save_source_state()
+    runner.shutdown()  # drop queued tasks; running ones finish before the interpreter exits
+    sys.exit(0)
+
+
+def coordinator_handlers(coordinator):
+    """Control-socket handlers for a sharded bot's coordinator: requests go to every worker."""
+
+    def config_changed():
+        coordinator.request_reload('config')
+        return {'queued': 'config'}
+
+    def credentials_changed():
+        coordinator.request_reload('credentials')
+        return {'queued': 'credentials'}
+
+    def run_monitor_now(monitor_id):
+        coordinator.broadcast('run', monitor_id)  # only the worker that owns it has it scheduled
+        return {'queued': monitor_id}
+
+    return {
+        'config_changed': config_changed,
+        'credentials_changed': credentials_changed,
+        'run_monitor': run_monitor_now,
+        'dump_stats': coordinator.snapshot,
+    }
+
+
+def coordinate(count):
+    """Run a sharded bot: `count` worker processes, each running main() on its share of the
+    monitors, with this process as their coordinator (see shards)."""
+    credentials.detect_auth_capability()  # notification URLs, for the outbox
+    if config.read_config() is None:
+        exit(1)
+    coordinator = shards.Coordinator(count, main)
+    atexit.register(coordinator.stop)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # `docker stop`: stop workers through atexit
+    coordinator.start()
+
+    control.ControlServer(coordinator_handlers(coordinator)).start()
+    watcher.FileWatcher(
+        config.get_data_dir(),
+        {'search.json': 'config', 'credentials.json': 'credentials'},
+        coordinator.request_reload,
+    ).start()
+    metrics.start_http_server()  # notification metrics; workers serve theirs on the next ports
+
+    last_creds_sig = config.get_credentials_signature()
+    last_heartbeat, active_source = 0.0, None
+    while True:
+        coordinator.supervise()
+        current_creds_sig = config.get_credentials_signature()
+        if current_creds_sig != last_creds_sig:
+            credentials.detect_auth_capability()  # new notification URLs
+            last_creds_sig = current_creds_sig
+        # The error digest covers every worker, since their reports come through the outbox
+        notifications.flush_errors()
+        status.update_bot_status(workers=coordinator.snapshot())
+        # Health for Kuma and the UI's source banner, from what the workers last reported
+        fetch_health = coordinator.fetch_health(status.read_bot_status())
+        if fetch_health['active_source'] and fetch_health['active_source'] != active_source:
+            active_source = fetch_health['active_source']
+            status.save_bot_status(
+                not config.supports_rich_filters(active_source),
+                f"Active data source: {active_source}",
+                active_source=active_source,
+            )
+        if time.time() - last_heartbeat >= COORDINATOR_HEARTBEAT_SECONDS:
+            health.send_kuma_heartbeat(fetch_health)
+            last_heartbeat = time.time()
+        time.sleep(COORDINATOR_CYCLE_SECONDS)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Reddit monitor bot")
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=int(os.getenv('BOT_WORKERS', '1')),
+        help="worker processes to shard monitors across (by subreddit); 1 runs everything in this process",
+    )
+    args = parser.parse_args()
+    if args.workers > 1:
+        coordinate(args.workers)
+    else:
+        main()
@@ -6,7 +6,7 @@ import MonitorModal from '@/components/MonitorModal';
 import SettingsModal from '@/components/SettingsModal';
 import SetupRequired from '@/components/SetupRequired';
 import { Monitor } from '@/types/monitor';
-import { getApiUrl } from '@/lib/api';
+import { fetchJsonCached, getApiUrl } from '@/lib/api';
 
 export default function Home() {
   const [monitors, setMonitors] = useState<Monitor[]>([]);
@@ -26,8 +26,7 @@ export default function Home() {
 
   const checkCredentials = async () => {
     try {
-      const response = await fetch(`${getApiUrl()}/api/credentials/status`);
-      const data = await response.json();
+      const data = await fetchJsonCached<{ configured: boolean }>('/api/credentials/status');
       setIsConfigured(data.configured);
     } catch (err) {
       // If API is down, assume configured (use env vars)
@@ -37,8 +36,12 @@ export default function Home() {
 
   const checkBotStatus = async () => {
     try {
-      const response = await fetch(`${getApiUrl()}/api/status`);
-      const data = await response.json();
+      const data = await fetchJsonCached<{
+        active_source?: string | null;
+        rich_filters_supported?: boolean;
+        using_json_fallback?: boolean;
+        message?: string | null;
+      }>('/api/status');
       setActiveSource(data.active_source ?? null);
       setRichFiltersSupported(data.rich_filters_supported !== false);
       const degraded = !!data.using_json_fallback;
@@ -52,9 +55,7 @@ export default function Home() {
   const fetchMonitors = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${getApiUrl()}/api/monitors`);
-      if (!response.ok) throw new Error('Failed to fetch monitors');
-      const data = await response.json();
+      const data = await fetchJsonCached<{ monitors?: Monitor[] }>('/api/monitors');
       setMonitors(data.monitors || []);
       setError(null);
     } catch (err) {
@@ -70,6 +71,14 @@ export default function Home() {
     checkBotStatus();
   }, []);
 
+  // Live feed from the bot (Server-Sent Events): refresh the source banner the moment the
+  // active source changes instead of waiting for the next manual refresh.
+  useEffect(() => {
+    const events = new EventSource(`${getApiUrl()}/api/events`);
+    events.addEventListener('status', () => checkBotStatus());
+    return () => events.close();
+  }, []);
+
   const handleToggle = async (id: string, enabled: boolean) => {
     try {
       const response = await fetch(`${getApiUrl()}/api/monitors/${id}`, {
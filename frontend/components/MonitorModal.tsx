@@ -663,6 +663,16 @@ export default function MonitorModal({
 
                             {activeTab === 'settings' && (
                                 <div className="space-y-2">
+                                    <div className="settings-row">
+                                        <span className="text-white/90" title="Allowed to use paid Sylvia requests first when a daily budget is set">Urgent</span>
+                                        <div
+                                            className={`toggle-switch ${formData.urgent ? 'active' : ''}`}
+                                            onClick={() => handleInputChange('urgent', !formData.urgent)}
+                                            role="switch"
+                                            aria-checked={!!formData.urgent}
+                                        />
+                                    </div>
+
                                     <div className="settings-row">
                                         <span className="text-white/90">Refresh Interval</span>
                                         <select
@@ -680,6 +690,36 @@ export default function MonitorModal({
                                         </select>
                                     </div>
 
+                                    <div className="settings-row">
+                                        <span className="text-white/90">Adaptive Polling</span>
+                                        <div className="flex items-center gap-2">
+                                            <select
+                                                value={formData.poll_floor_minutes ?? ''}
+                                                onChange={(e) => handleInputChange('poll_floor_minutes', e.target.value ? parseInt(e.target.value) : null)}
+                                                className="input-field w-auto bg-white/10"
+                                                title="Fastest interval when the subreddit is busy"
+                                            >
+                                                <option value="">Off</option>
+                                                <option value={1}>1 Minute</option>
+                                                <option value={2}>2 Minutes</option>
+                                                <option value={5}>5 Minutes</option>
+                                            </select>
+                                            <span className="text-white/50">to</span>
+                                            <select
+                                                value={formData.poll_ceiling_minutes ?? ''}
+                                                onChange={(e) => handleInputChange('poll_ceiling_minutes', e.target.value ? parseInt(e.target.value) : null)}
+                                                className="input-field w-auto bg-white/10"
+                                                title="Slowest interval when the subreddit is quiet"
+                                            >
+                                                <option value="">Off</option>
+                                                <option value={15}>15 Minutes</option>
+                                                <option value={30}>30 Minutes</option>
+                                                <option value={60}>1 Hour</option>
+                                                <option value={120}>2 Hours</option>
+                                            </select>
+                                        </div>
+                                    </div>
+
                                     <div className="settings-row">
                                         <span className="text-white/90">Max Post Age</span>
                                         <select
@@ -33,3 +33,35 @@ export function setApiPort(port: number): void {
         console.log(`API port set to ${port}. Refresh the page.`);
     }
 }
+
+// Last ETag + parsed body per URL, for conditional GETs of the endpoints the UI polls.
+const etagCache = new Map<string, { etag: string; data: unknown }>();
+
+// GET `path` as JSON, revalidating with If-None-Match. The API answers 304 (no body) when
+// nothing changed, so a phone polling over Wi-Fi doesn't re-download the whole monitor
+// list; the cached body is returned instead. Throws on any other non-OK status.
+export async function fetchJsonCached<T = unknown>(path: string): Promise<T> {
+    const url = `${getApiUrl()}${path}`;
+    const cached = etagCache.get(url);
+    const response = await fetch(url, {
+        // Bypass the browser's own HTTP cache so the 304 reaches us (we hold the body).
+        cache: 'no-store',
+        headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+    });
+
+    if (response.status === 304 && cached) {
+        return cached.data as T;
+    }
+    if (!response.ok) {
+        throw new Error(`Request to ${path} failed (${response.status})`);
+    }
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        etagCache.set(url, { etag, data });
+    } else {
+        etagCache.delete(url);
+    }
+    return data as T;
+}
@@ -14,7 +14,10 @@ export interface Monitor {
   subreddit: string;
   color: string;
   enabled?: boolean;
+  urgent?: boolean;
   cooldown_minutes?: number;
+  poll_floor_minutes?: number | null;
+  poll_ceiling_minutes?: number | null;
   max_post_age_hours?: number;
   min_upvotes?: number | null;
   keywords?: string[];
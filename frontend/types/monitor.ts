@@ -26,6 +26,7 @@ export const DEFAULT_MONITOR: Partial<Monitor> = {
     min_upvotes: null,
     color: DEFAULT_COLORS[0],
     enabled: true,
+    urgent: false,
     cooldown_minutes: 10,
     max_post_age_hours: 12,
     domain_contains: [],
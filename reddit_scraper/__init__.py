@@ -1,13 +1,23 @@
 """Shared package for the Reddit scraper bot and its web API.
 
 Modules are layered so imports never cycle:
-    config      -> (no internal deps)
-    credentials -> config
-    status      -> config, credentials
-    notifications -> credentials
-    sources     -> config, status, notifications
+    filestore   -> (no internal deps)
+    diskcache   -> (no internal deps)
+    metrics     -> (no internal deps)
+    latency     -> metrics
+    config      -> filestore
+    credentials -> config, filestore
+    status      -> config, credentials, filestore
+    watcher     -> config
+    events      -> config, watcher
+    control     -> config
+    notifications -> credentials, metrics
+    sources     -> config, credentials, diskcache, events, filestore, metrics, status, notifications
     health      -> config, credentials, sources
-    monitor     -> config, credentials, notifications, sources
+    monitor     -> config, credentials, events, filestore, latency, metrics, notifications, sources
+    scheduler   -> metrics, monitor, sources
+    lanes       -> metrics
+    shards      -> config, notifications, sources, status
 
 bot.py and api.py are thin entrypoints over these modules.
 """
@@ -4,12 +4,14 @@ Paths are resolved from the DATA_DIR env var at call time (not captured at impor
 so tests can repoint DATA_DIR and reload entrypoints without stale paths.
 """
 
+import hashlib
 import json
 import logging
 import os
+import threading
 import uuid
 
-from . import models
+from . import filestore, models
 
 # Monitor color palette (used to auto-assign a color on create). MUST stay in sync with the
 # frontend picker in frontend/types/monitor.ts — keep the two lists identical.
@@ -46,6 +48,8 @@ DEFAULT_SOURCE_ORDER = ['oauth', 'json', 'rss']
 # new rich source here and all three stay in agreement. `json` returns score/domain too but
 # is an unofficial, frequently-blocked fallback, so it is deliberately not counted rich.
 RICH_SOURCES = ('oauth', 'sylvia')
+# Sources billed per successful request; the source planner (sources._plan) rations them.
+PAID_SOURCES = ('sylvia',)
 
 
 def supports_rich_filters(source):
@@ -84,6 +88,33 @@ def get_processed_submissions_path():
     return os.path.join(get_data_dir(), 'processed_submissions.pkl')
 
 
+def get_events_path():
+    return os.path.join(get_data_dir(), 'events.log')
+
+
+def _per_shard(name, ext):
+    """A file only the bot writes: each worker of a sharded bot (BOT_SHARD, see shards)
+    keeps its own."""
+    shard = os.environ.get('BOT_SHARD')
+    return os.path.join(get_data_dir(), f"{name}.{shard}{ext}" if shard else f"{name}{ext}")
+
+
+def get_response_cache_path():
+    return _per_shard('response_cache', '.bin')
+
+
+def get_source_state_path():
+    return _per_shard('source_state', '.json')
+
+
+def get_token_cache_path():
+    return os.path.join(get_data_dir(), 'oauth_tokens.json')
+
+
+def get_control_socket_path():
+    return os.environ.get('CONTROL_SOCKET_PATH') or os.path.join(get_data_dir(), 'bot.sock')
+
+
 # --- search.json access ---
 def read_config():
     """Simple read used by the bot loop; returns None on missing/invalid file."""
@@ -100,23 +131,33 @@ def read_config():
         return None
 
 
-def get_config_mtime():
+def file_signature(path):
+    """(inode, mtime_ns, size) of path, or None if missing. Unlike a bare mtime this also
+    changes on same-second edits and when the file is replaced by rename."""
     try:
-        return os.path.getmtime(get_config_path())
+        st = os.stat(path)
     except OSError:
         return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
 
 
-def get_credentials_mtime():
-    try:
-        return os.path.getmtime(get_credentials_path())
-    except OSError:
-        return None
+def get_config_signature():
+    return file_signature(get_config_path())
+
+
+def get_credentials_signature():
+    return file_signature(get_credentials_path())
+
+
+def config_lock():
+    """Cross-process lock for a search.json read-modify-write cycle (see filestore)."""
+    return filestore.locked(get_config_path())
 
 
 def save_config(config):
-    with open(get_config_path(), 'w') as f:
-        json.dump(config, f, indent=4)
+    """Atomically replace search.json (readers never see a partial file)."""
+    with config_lock():
+        filestore.write_json_atomic(get_config_path(), config, indent=4)
 
 
 def normalize_monitor(monitor, index=0):
@@ -138,22 +179,133 @@ def load_managed_config():
     """Normalizing read used by the API: fills in ids/defaults via the Monitor model, creates
     a default file when missing, and persists any normalization it had to apply."""
     path = get_config_path()
-    try:
-        with open(path, 'r') as f:
-            config = json.load(f)
-
-        monitors = config.get('subreddits_to_search', [])
-        normalized = [normalize_monitor(m, i) for i, m in enumerate(monitors)]
-        if normalized != monitors:
-            config['subreddits_to_search'] = normalized
-            save_config(config)
-        return config
-    except FileNotFoundError:
-        default_config = {'subreddits_to_search': []}
-        save_config(default_config)
-        return default_config
-    except json.JSONDecodeError as e:
-        raise Exception(f"Invalid JSON in config file: {e}")
+    # Locked so the normalizing write-back can't clobber a concurrent update from another
+    # API worker that landed between our read and write.
+    with config_lock():
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+
+            monitors = config.get('subreddits_to_search', [])
+            normalized = [normalize_monitor(m, i) for i, m in enumerate(monitors)]
+            if normalized != monitors:
+                config['subreddits_to_search'] = normalized
+                save_config(config)
+            return config
+        except FileNotFoundError:
+            default_config = {'subreddits_to_search': []}
+            save_config(default_config)
+            return default_config
+        except json.JSONDecodeError as e:
+            raise Exception(f"Invalid JSON in config file: {e}")
+
+
+class _ManagedConfigCache:
+    """Validated search.json held in memory for the API process, plus an id -> position
+    index over its monitors.
+
+    Every API request used to re-read, re-validate (and possibly rewrite) the whole file;
+    now that only happens when the file's stat signature changes (an edit by the other API
+    worker, by hand, or a save from this process, which re-primes the cache directly).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.path = None
+        self.signature = None
+        self.config = None
+        self.etag = None  # content hash of the cached config (HTTP ETag for the API)
+        self.index = {}  # monitor id -> position in subreddits_to_search
+
+    def _store(self, path, config, signature):
+        self.path = path
+        self.signature = signature
+        self.config = config
+        self.etag = hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()
+        self.index = {m.get('id'): i for i, m in enumerate(config.get('subreddits_to_search', [])) if m.get('id')}
+
+    def _current(self):
+        """(config, index, etag) as one consistent snapshot, reloaded through
+        load_managed_config if the file changed.
+
+        Lock order is config_lock (the search.json flock) before _lock, as in the API's
+        locked write handlers and save_managed_config. So the reload, which takes the flock,
+        runs outside _lock, and _lock is held only to check and swap. Two threads reloading
+        at once may store in either order; each result carries the signature taken before
+        its read, so an older one just looks stale to the next call."""
+        path = get_config_path()
+        signature = file_signature(path)
+        with self._lock:
+            if self.config is not None and self.path == path and self.signature == signature:
+                return self.config, self.index, self.etag
+        loaded = self._load(path, signature)
+        with self._lock:
+            self._store(path, *loaded)
+            return self.config, self.index, self.etag
+
+    def get(self):
+        """The cached config, reloaded through load_managed_config if the file changed."""
+        return self._current()[0]
+
+    @staticmethod
+    def _load(path, signature):
+        """load_managed_config plus the signature of the content it returned. The signature
+        is taken before the read, so a write landing in between makes the cache look stale
+        (one extra reload) instead of keeping old content under the new signature. If the
+        file changed during the load (normally its own normalizing write-back), the newer
+        signature is used only once a re-read shows the file holds exactly what was loaded."""
+        loaded = load_managed_config()
+        after = file_signature(path)
+        if after != signature and filestore.read_json(path) == loaded:
+            signature = after
+        return loaded, signature
+
+    def prime(self, config):
+        """Adopt a just-saved config as the cached one (no re-read of our own write). Call
+        with config_lock held since the save, so no other writer lands before the stat
+        (and so the flock is taken before _lock, see _current)."""
+        path = get_config_path()
+        with self._lock:
+            self._store(path, config, file_signature(path))
+
+    def find_monitor(self, monitor_id):
+        """(position, monitor) for monitor_id in the current config, or (None, None)."""
+        config, index, _ = self._current()
+        i = index.get(monitor_id)
+        if i is None:
+            return None, None
+        return i, config['subreddits_to_search'][i]
+
+
+_config_cache = _ManagedConfigCache()
+
+
+def get_cached_config():
+    """Cached load_managed_config for the API. Returns a shallow copy (own top-level dict and
+    monitor list) so callers can add/replace/remove monitors without touching the cache;
+    monitor dicts themselves are shared and must be replaced rather than mutated."""
+    config = _config_cache.get()
+    return {**config, 'subreddits_to_search': list(config.get('subreddits_to_search', []))}
+
+
+def get_cached_config_etag():
+    """Stable content hash of the cached config; changes whenever search.json's content does."""
+    return _config_cache._current()[2]
+
+
+def find_cached_monitor(monitor_id):
+    """O(1) lookup of a monitor by id in the cached config: (position, monitor) or (None, None)."""
+    return _config_cache.find_monitor(monitor_id)
+
+
+def save_managed_config(config):
+    """save_config for the API: writes search.json and primes the cache with the result."""
+    with config_lock():
+        save_config(config)
+        _config_cache.prime(config)
 
 
 # --- data-source ordering ---
@@ -0,0 +1,136 @@
+"""Local control channel between the API (client) and the bot (server).
+
+The bot listens on a Unix-domain socket in DATA_DIR (shared by both containers through the
+data volume). The API sends a command the moment something changes, so edits apply in
+milliseconds instead of after the file watcher's debounce. One request per connection,
+newline-delimited JSON both ways:
+
+    -> {"cmd": "run_monitor", "args": {"monitor_id": "..."}}
+    <- {"ok": true, "result": ...}      or      {"ok": false, "error": "..."}
+
+Commands: config_changed, credentials_changed, run_monitor, dump_stats. Everything on the
+client side is best-effort: if the bot isn't listening (not started yet, different host,
+socket disabled) `notify` just returns False and the bot's own file watching applies the
+change a little later.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import socket
+import threading
+
+from . import config
+
+COMMANDS = ('config_changed', 'credentials_changed', 'run_monitor', 'dump_stats')
+CLIENT_TIMEOUT_SECONDS = float(os.getenv('CONTROL_TIMEOUT_SECONDS', '2'))
+_MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+class ControlError(Exception):
+    """The bot rejected a command or couldn't be reached."""
+
+
+def _read_line(sock):
+    buf = b''
+    while not buf.endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        buf += chunk
+        if len(buf) > _MAX_MESSAGE_BYTES:
+            raise ControlError("control message too large")
+    return buf
+
+
+def _send_json(sock, payload):
+    sock.sendall(json.dumps(payload).encode() + b'\n')
+
+
+class ControlServer:
+    """Bot-side listener. `handlers` maps a command name to a callable taking the command's
+    args as keyword arguments; its (JSON-serializable) return value is the reply."""
+
+    def __init__(self, handlers, path=None):
+        self.handlers = dict(handlers)
+        self.path = path or config.get_control_socket_path()
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        """Bind the socket (replacing a stale one from a previous run) and serve in a daemon
+        thread. Returns False (and logs) if the socket can't be created."""
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(self.path)
+            sock.listen(16)
+        except OSError as e:
+            logging.warning(f"Control socket unavailable at {self.path}: {e}")
+            return False
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, name='control-socket', daemon=True)
+        self._thread.start()
+        logging.info(f"🎛️  Control socket listening at {self.path}")
+        return True
+
+    def stop(self):
+        if self._sock is not None:
+            with contextlib.suppress(OSError):
+                self._sock.close()
+            self._sock = None
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    def _serve(self):
+        while self._sock is not None:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return  # socket closed by stop()
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            conn.settimeout(CLIENT_TIMEOUT_SECONDS)
+            try:
+                request = json.loads(_read_line(conn) or b'null')
+                reply = {'ok': True, 'result': self.dispatch(request)}
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            with contextlib.suppress(OSError):
+                _send_json(conn, reply)
+
+    def dispatch(self, request):
+        if not isinstance(request, dict) or request.get('cmd') not in self.handlers:
+            raise ControlError(f"unknown command: {request.get('cmd') if isinstance(request, dict) else request!r}")
+        return self.handlers[request['cmd']](**(request.get('args') or {}))
+
+
+def send_command(cmd, path=None, timeout=None, **args):
+    """Send one command to the bot and return its result. Raises ControlError if the bot
+    can't be reached or reports an error."""
+    path = path or config.get_control_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout or CLIENT_TIMEOUT_SECONDS)
+            sock.connect(path)
+            _send_json(sock, {'cmd': cmd, 'args': args})
+            reply = json.loads(_read_line(sock) or b'null')
+    except (OSError, ValueError) as e:
+        raise ControlError(f"bot control socket unavailable: {e}")
+    if not isinstance(reply, dict) or not reply.get('ok'):
+        raise ControlError((reply or {}).get('error', 'no reply from bot'))
+    return reply.get('result')
+
+
+def notify(cmd, **args):
+    """Best-effort send: True if the bot acknowledged, False otherwise (never raises)."""
+    try:
+        send_command(cmd, **args)
+        return True
+    except ControlError as e:
+        logging.debug(f"Control command {cmd} not delivered: {e}")
+        return False
@@ -1,12 +1,24 @@
-"""Credential loading, sanitization, encoding checks, and PRAW authentication."""
+"""Credential loading, sanitization, encoding checks, and PRAW authentication.
 
+Besides the top-level reddit_* keys, credentials.json may list more Reddit apps under
+`reddit_accounts` (each an object with the same reddit_* keys). Every app has its own
+API rate limit, so the bot builds a RedditPool over all of them and spreads OAuth
+requests across the accounts by remaining budget.
+
+PRAW is imported, and each account's client built, only when an OAuth request first needs
+it, so neither entry point pays for the import at startup. Access tokens are cached in
+DATA_DIR/oauth_tokens.json (keyed by a hash of client id + username), so a restart or a
+credentials reload reuses a still-valid token instead of doing a fresh token exchange.
+"""
+
+import hashlib
 import json
 import logging
 import os
+import threading
+import time
 
-import praw
-
-from . import config
+from . import config, filestore
 
 # Runtime credentials (file + env fallback), populated by detect_auth_capability().
 CREDENTIALS = None
@@ -15,6 +27,10 @@ CREDENTIALS = None
 # can't be used for auth (e.g. a pasted Cyrillic lookalike).
 CREDENTIAL_WARNING = None
 
+REDDIT_KEYS = ('reddit_client_id', 'reddit_client_secret', 'reddit_user_agent', 'reddit_username', 'reddit_password')
+# How long an account that failed auth (401 / invalid_grant) sits out before it is retried.
+ACCOUNT_AUTH_COOLDOWN = int(os.getenv('REDDIT_ACCOUNT_COOLDOWN_SECONDS', '1800'))
+
 
 def read_credentials_file():
     """Raw read of credentials.json (used by the API for masking/editing)."""
@@ -27,9 +43,15 @@ def read_credentials_file():
         return {}
 
 
+def credentials_lock():
+    """Cross-process lock for a credentials.json read-modify-write cycle (see filestore)."""
+    return filestore.locked(config.get_credentials_path())
+
+
 def save_credentials_file(creds):
-    with open(config.get_credentials_path(), 'w') as f:
-        json.dump(creds, f, indent=4)
+    """Atomically replace credentials.json (readers never see a partial file)."""
+    with credentials_lock():
+        filestore.write_json_atomic(config.get_credentials_path(), creds, indent=4)
 
 
 def load_credentials():
@@ -62,10 +84,22 @@ def load_credentials():
         'reddit_user_agent': creds.get('reddit_user_agent') or os.getenv('REDDIT_USER_AGENT'),
         'reddit_username': creds.get('reddit_username') or os.getenv('REDDIT_USERNAME'),
         'reddit_password': creds.get('reddit_password') or os.getenv('REDDIT_PASSWORD'),
+        'reddit_accounts': [
+            {key: account.get(key) for key in REDDIT_KEYS}
+            for account in creds.get('reddit_accounts') or []
+            if isinstance(account, dict)
+        ],
         'sylvia_api_key': creds.get('sylvia_api_key') or os.getenv('SYLVIA_API_KEY'),
     }
 
 
+def reddit_accounts(creds):
+    """Every Reddit app in `creds` with client id+secret: the top-level one first, then
+    the `reddit_accounts` list."""
+    accounts = [{key: creds.get(key) for key in REDDIT_KEYS}, *(creds.get('reddit_accounts') or [])]
+    return [a for a in accounts if a.get('reddit_client_id') and a.get('reddit_client_secret')]
+
+
 def find_non_ascii(value):
     """Return [(index, char), ...] for every non-ASCII character in value (empty if clean).
 
@@ -96,10 +130,12 @@ def check_credential_encoding(creds):
     """
     global CREDENTIAL_WARNING
     offenders = []
-    for key in ('reddit_client_id', 'reddit_client_secret', 'reddit_user_agent', 'reddit_username', 'reddit_password'):
-        bad = [i for i, _ in find_non_ascii(creds.get(key))]
-        if bad:
-            offenders.append(f"{key} (positions {bad})")
+    accounts = [('', creds), *((f"reddit_accounts[{n}].", a) for n, a in enumerate(creds.get('reddit_accounts') or []))]
+    for prefix, account in accounts:
+        for key in REDDIT_KEYS:
+            bad = [i for i, _ in find_non_ascii(account.get(key))]
+            if bad:
+                offenders.append(f"{prefix}{key} (positions {bad})")
 
     if offenders:
         CREDENTIAL_WARNING = (
@@ -138,6 +174,10 @@ def detect_auth_capability():
     has_app = bool(CREDENTIALS.get('reddit_client_id') and CREDENTIALS.get('reddit_client_secret'))
     has_login = has_app and bool(CREDENTIALS.get('reddit_username') and CREDENTIALS.get('reddit_password'))
 
+    extra = len(reddit_accounts(CREDENTIALS)) - (1 if has_app else 0)
+    if extra:
+        logging.info(f"👥 {extra} additional Reddit app(s) configured; OAuth requests are spread across them.")
+
     if has_login:
         logging.info("🔐 Reddit auth: full OAuth (logged-in).")
     elif has_app:
@@ -155,13 +195,78 @@ def detect_auth_capability():
 
 
 def authenticate_reddit():
-    """Build a PRAW client for the 'oauth' pathway.
+    """Build a PRAW client for the 'oauth' pathway from the top-level credentials.
 
     Returns a logged-in client if username+password are set, a read-only (app-only)
     client if only client id+secret are set, or None if no app credentials exist
     (the bot then relies on the RSS/JSON pathways).
     """
-    creds = CREDENTIALS or {}
+    return _build_client(CREDENTIALS or {})
+
+
+def authenticate_reddit_pool():
+    """A RedditPool over every configured Reddit app, or None if there are none. Clients
+    are built on first use (see RedditAccount.client)."""
+    accounts = [
+        RedditAccount(
+            _account_label(creds), build=lambda creds=creds: _build_client(creds), token_key=_token_key(creds)
+        )
+        for creds in reddit_accounts(CREDENTIALS or {})
+    ]
+    return RedditPool(accounts) if accounts else None
+
+
+def _token_key(creds):
+    """Token-cache key for an account: identifies the app + user without storing either."""
+    raw = f"{creds.get('reddit_client_id') or ''}\0{creds.get('reddit_username') or ''}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _authorizer(client):
+    """The prawcore authorizer behind a PRAW client's active session (None if not PRAW)."""
+    return getattr(getattr(client, '_core', None), '_authorizer', None)
+
+
+def restore_token(client, key):
+    """Seed a fresh client with a cached, unexpired access token. Returns True if one was
+    used. A token revoked server-side just gets a 401, on which prawcore clears and
+    refreshes it, so a stale cache entry costs one retry, not an outage."""
+    entry = filestore.read_json(config.get_token_cache_path(), {}).get(key)
+    authorizer = _authorizer(client)
+    if not entry or authorizer is None or entry.get('expires_at', 0) <= time.time() + 60:
+        return False
+    authorizer.access_token = entry['access_token']
+    authorizer._expiration_timestamp = entry['expires_at']
+    authorizer.scopes = set(entry.get('scopes') or [])
+    return True
+
+
+def save_token(client, key):
+    """Persist the client's current access token if it changed since the last save."""
+    authorizer = _authorizer(client)
+    token = getattr(authorizer, 'access_token', None)
+    if not token:
+        return
+    path = config.get_token_cache_path()
+    if filestore.read_json(path, {}).get(key, {}).get('access_token') == token:
+        return
+    try:
+        with filestore.update_json(path) as cache:
+            cache[key] = {
+                'access_token': token,
+                'expires_at': authorizer._expiration_timestamp,
+                'scopes': sorted(authorizer.scopes or []),
+            }
+    except OSError as e:
+        logging.warning(f"Could not save the OAuth token cache: {e}")
+
+
+def _account_label(creds):
+    """A log/status-safe name for an account: the username, or the app id's first chars."""
+    return creds.get('reddit_username') or f"app {(creds.get('reddit_client_id') or '')[:6]}"
+
+
+def _build_client(creds):
     client_id = sanitize_credential(creds.get('reddit_client_id'), 'client_id')
     client_secret = sanitize_credential(creds.get('reddit_client_secret'), 'client_secret')
     user_agent = sanitize_credential(creds.get('reddit_user_agent'), 'user_agent') or 'reddit-scraper/1.0'
@@ -172,17 +277,149 @@ def authenticate_reddit():
         logging.info("No Reddit app credentials - skipping OAuth pathway.")
         return None
 
+    import praw  # ~0.25s to import; only paid once OAuth is actually used
+
     if username and password:
         logging.info("Authenticating Reddit (full OAuth)...")
-        return praw.Reddit(
+        reddit = praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
             user_agent=user_agent,
             username=username,
             password=password,
         )
-
-    logging.info("Authenticating Reddit (read-only, app-only)...")
-    reddit = praw.Reddit(client_id=client_id, client_secret=client_secret, user_agent=user_agent)
-    reddit.read_only = True
+    else:
+        logging.info("Authenticating Reddit (read-only, app-only)...")
+        reddit = praw.Reddit(client_id=client_id, client_secret=client_secret, user_agent=user_agent)
+        reddit.read_only = True
+    if restore_token(reddit, _token_key(creds)):
+        logging.info("Reusing cached Reddit access token")
     return reddit
+
+
+def is_auth_error(error):
+    """True for errors meaning the account's credentials were rejected."""
+    text = str(error).lower()
+    return '401' in text or 'unauthorized' in text or 'invalid_grant' in text
+
+
+class RedditAccount:
+    """One Reddit app's PRAW client (given, or built by `build` on first use) plus what the
+    pool knows about its rate-limit budget and health."""
+
+    __slots__ = (
+        'name',
+        '_client',
+        '_build',
+        '_build_lock',
+        'token_key',
+        'saved_token',
+        'remaining',
+        'reset_at',
+        'in_flight',
+        'disabled_until',
+        'failures',
+    )
+
+    def __init__(self, name, client=None, build=None, token_key=None):
+        self.name = name
+        self._client = client
+        self._build = build
+        self._build_lock = threading.Lock()
+        self.token_key = token_key  # set -> the access token is persisted (see save_token)
+        self.saved_token = None
+        self.remaining = None  # requests left in Reddit's window; None until a response says
+        self.reset_at = None  # epoch the window resets
+        self.in_flight = 0
+        self.disabled_until = 0.0  # benched after an auth failure
+        self.failures = 0
+
+    @property
+    def client(self):
+        # The pool can hand one account to several lane threads at startup; only the first
+        # builds the client (and does the token exchange), the others wait for it.
+        if self._client is None and self._build is not None:
+            with self._build_lock:
+                if self._client is None:
+                    self._client = self._build()
+        return self._client
+
+    def persist_token(self):
+        """Save the client's access token to the cache when it has changed (about hourly)."""
+        token = getattr(_authorizer(self._client), 'access_token', None)
+        if self.token_key and token and token != self.saved_token:
+            save_token(self._client, self.token_key)
+            self.saved_token = token
+
+    def budget(self, now):
+        """Estimated requests left right now (infinite when unknown or the window reset)."""
+        if self.remaining is None or (self.reset_at is not None and self.reset_at <= now):
+            return float('inf')
+        return self.remaining - self.in_flight
+
+    def refresh_limits(self):
+        """Read the budget PRAW tracked from the last response's X-Ratelimit headers."""
+        limits = getattr(getattr(self._client, 'auth', None), 'limits', None) or {}
+        if limits.get('remaining') is not None:
+            self.remaining = limits['remaining']
+            self.reset_at = limits.get('reset_timestamp')
+
+
+class RedditPool:
+    """Several Reddit apps behind the 'oauth' source. Each request goes to the healthy
+    account with the most rate-limit budget left; an account whose credentials are
+    rejected sits out for ACCOUNT_AUTH_COOLDOWN without affecting the others."""
+
+    def __init__(self, accounts):
+        self.accounts = list(accounts)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def acquire(self):
+        """The healthy account with the most budget left (counted as in use), or None."""
+        now = time.time()
+        with self._lock:
+            healthy = [a for a in self.accounts if a.disabled_until <= now]
+            if not healthy:
+                return None
+            account = max(healthy, key=lambda a: a.budget(now))
+            account.in_flight += 1
+            return account
+
+    def release(self, account, error=None):
+        """Return an account after a request. Returns True if `error` benched it."""
+        benched = error is not None and is_auth_error(error)
+        with self._lock:
+            account.in_flight = max(0, account.in_flight - 1)
+            account.refresh_limits()
+            if error is None:
+                account.failures = 0
+            elif benched:
+                account.failures += 1
+                account.disabled_until = time.time() + ACCOUNT_AUTH_COOLDOWN
+        if error is None:
+            account.persist_token()  # file I/O, kept outside the lock
+        if not benched:
+            return False
+        logging.warning(f"Reddit account '{account.name}' failed auth ({error}); benched for {ACCOUNT_AUTH_COOLDOWN}s")
+        return True
+
+    def healthy_count(self):
+        now = time.time()
+        with self._lock:
+            return sum(a.disabled_until <= now for a in self.accounts)
+
+    def snapshot(self):
+        """Per-account budget/health for bot_status.json."""
+        now = time.time()
+        with self._lock:
+            return {
+                a.name: {
+                    'remaining': a.remaining,
+                    'resets_in_seconds': None if a.reset_at is None else max(0, int(a.reset_at - now)),
+                    'benched': a.disabled_until > now,
+                }
+                for a in self.accounts
+            }
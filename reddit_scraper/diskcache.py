@@ -0,0 +1,120 @@
+"""Append-only on-disk response cache, so a restart doesn't re-fetch every listing.
+
+Records are length-prefixed and written back to back:
+
+    header (_HEADER): written_at (float64), flags (uint8), key length (uint16),
+                      value length (uint32), crc32 of key+value (uint32)
+    key:   JSON of the cache key (a tuple, stored as a list)
+    value: zlib-compressed JSON of the cached value
+
+Appends never rewrite the file, so a crash can at worst leave a torn final record, which
+the length/crc check drops on load. A key's newest record wins. Once the file grows past
+`max_bytes` it is compacted: only each key's newest record that is still within `max_age`
+is kept, newest first, up to half of `max_bytes`. The compacted file is written to a temp
+file and renamed over the old one, like filestore does for the JSON files.
+
+Only the bot process writes the cache, so a thread lock is enough (no cross-process flock).
+"""
+
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+_HEADER = struct.Struct('>dBHII')
+_TUPLE = 0x01  # value was a tuple (JSON would hand it back as a list)
+
+
+def _pack(key, written_at, value):
+    flags = _TUPLE if isinstance(value, tuple) else 0
+    key_bytes = json.dumps(list(key), separators=(',', ':')).encode()
+    value_bytes = zlib.compress(json.dumps(value, separators=(',', ':')).encode())
+    crc = zlib.crc32(key_bytes + value_bytes)
+    return _HEADER.pack(written_at, flags, len(key_bytes), len(value_bytes), crc) + key_bytes + value_bytes
+
+
+def _unpack(data):
+    """Yield (key, written_at, value, record bytes) for each intact record; stops at the
+    first torn or corrupt one (anything after it can't be framed reliably)."""
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        written_at, flags, key_len, value_len, crc = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        end = start + key_len + value_len
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            logging.warning(f"Response cache: dropping damaged data after byte {offset}")
+            return
+        key = tuple(json.loads(data[start : start + key_len]))
+        value = json.loads(zlib.decompress(data[start + key_len : end]))
+        yield key, written_at, tuple(value) if flags & _TUPLE else value, data[offset:end]
+        offset = end
+
+
+class DiskCache:
+    def __init__(self, path, max_bytes, max_age):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return b''
+
+    def _newest(self, data, now):
+        """key -> (written_at, value, record bytes) for each key's newest record within max_age."""
+        newest = {}
+        for key, written_at, value, record in _unpack(data):
+            if now - written_at < self.max_age and written_at >= newest.get(key, (0,))[0]:
+                newest[key] = (written_at, value, record)
+        return newest
+
+    def load(self):
+        """{key: (written_at, value)} for every key with a record younger than max_age."""
+        with self._lock:
+            try:
+                newest = self._newest(self._read(), time.time())
+            except (OSError, ValueError, zlib.error) as e:
+                logging.warning(f"Response cache unreadable, starting cold: {e}")
+                return {}
+        return {key: (written_at, value) for key, (written_at, value, _) in newest.items()}
+
+    def put(self, key, value, written_at=None):
+        record = _pack(key, time.time() if written_at is None else written_at, value)
+        with self._lock:
+            try:
+                with open(self.path, 'ab') as f:
+                    f.write(record)
+                    size = f.tell()
+                if size > self.max_bytes:
+                    self._compact()
+            except OSError as e:
+                logging.warning(f"Response cache write failed: {e}")
+
+    def _compact(self):
+        """Rewrite the file with each key's newest fresh record, newest first, up to half of
+        max_bytes (so compaction doesn't run again on the very next append)."""
+        newest = self._newest(self._read(), time.time())
+        kept, size = [], 0
+        for _, _, record in sorted(newest.values(), key=lambda entry: entry[0], reverse=True):
+            if size + len(record) > self.max_bytes // 2:
+                break
+            kept.append(record)
+            size += len(record)
+        directory = os.path.dirname(self.path) or '.'
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.response_cache.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b''.join(reversed(kept)))  # oldest first, so "newest record wins" still holds
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        logging.debug(f"Response cache compacted: {len(newest)} fresh keys, kept {len(kept)} ({size} bytes)")
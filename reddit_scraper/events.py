@@ -0,0 +1,167 @@
+"""Append-only event log: the bot's live feed to the API (served as SSE by /api/events).
+
+The bot appends one JSON line per event (source status transitions, per-monitor run
+results, matches) to DATA_DIR/events.log; the API tails the file from the offset a client
+has seen. Appends are a single O_APPEND write, so concurrent writers never interleave
+lines, and a reader only ever looks at the new bytes since its last offset instead of
+re-reading a status file. The log rotates to events.log.1 at EVENT_LOG_MAX_BYTES; readers
+notice the inode change and start over on the new file.
+
+Waiting tails don't poll the log: one watcher per process (inotify, see watcher) wakes them
+all when it changes. Where inotify isn't available, that watcher polls the file's stat and
+the tails re-check at least every poll_interval.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from . import config, watcher
+
+EVENT_LOG_MAX_BYTES = int(os.getenv('EVENT_LOG_MAX_BYTES', str(1024 * 1024)))
+
+_lock = threading.Lock()
+
+
+def publish(kind, /, **data):
+    """Append an event of type `kind` with a JSON-serializable payload. Never raises: the
+    feed is best-effort and must not break the bot."""
+    line = json.dumps({'type': kind, 'ts': datetime.now(timezone.utc).isoformat(), 'data': data}) + '\n'
+    path = config.get_events_path()
+    try:
+        with _lock:
+            try:
+                if os.path.getsize(path) > EVENT_LOG_MAX_BYTES:
+                    os.replace(path, f"{path}.1")
+            except OSError:
+                pass
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode())
+            finally:
+                os.close(fd)
+    except Exception as e:
+        logging.debug(f"Failed to publish {kind} event: {e}")
+
+
+class _LogChanges:
+    """Wakes waiting tails when the event log changes, from a single FileWatcher started on
+    first use (and restarted if DATA_DIR moves)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._watcher = None
+
+    def _bump(self, _token):
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def generation(self):
+        """The change counter to pass to wait(); also makes sure the watcher is running."""
+        directory = config.get_data_dir()
+        with self._cond:
+            if self._watcher is None or self._watcher.directory != directory:
+                if self._watcher is not None:
+                    self._watcher.stop()
+                name = os.path.basename(config.get_events_path())
+                self._watcher = watcher.FileWatcher(directory, {name: 'events'}, self._bump, debounce=0).start()
+            return self._generation
+
+    def polling(self):
+        return self._watcher is None or self._watcher.mode != 'inotify'
+
+    def wait(self, generation, timeout):
+        """Block until the log changes after `generation` was taken, or `timeout` passes."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._generation != generation, timeout)
+
+
+_changes = _LogChanges()
+
+
+def _cursor(inode, offset):
+    return f"{inode}:{offset}"
+
+
+def _parse_cursor(cursor):
+    try:
+        inode, offset = str(cursor).split(':')
+        return int(inode), int(offset)
+    except (TypeError, ValueError):
+        return None, None
+
+
+class EventTail:
+    """Follows the event log from a cursor ('<inode>:<offset>', as sent in SSE ids).
+
+    With no cursor (or one for a rotated-away file) a tail starts at the current end of the
+    log, so a new client sees only events from now on; a client reconnecting with its last
+    cursor resumes exactly where it left off.
+    """
+
+    def __init__(self, cursor=None):
+        self.path = config.get_events_path()
+        inode, offset = _parse_cursor(cursor)
+        current = self._stat()
+        if current and inode == current[0] and offset <= current[1]:
+            self.inode, self.offset = inode, offset
+        elif current:
+            self.inode, self.offset = current
+        else:
+            self.inode, self.offset = None, 0
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size
+
+    def read(self):
+        """New events since the last read, as [(cursor, event_dict), ...]."""
+        current = self._stat()
+        if current is None:
+            return []
+        inode, size = current
+        if inode != self.inode or size < self.offset:  # rotated or truncated: start over
+            self.inode, self.offset = inode, 0
+        if size == self.offset:
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+
+        events = []
+        consumed = 0
+        for raw in chunk.splitlines(keepends=True):
+            if not raw.endswith(b'\n'):
+                break  # partial line still being written; pick it up next time
+            consumed += len(raw)
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                continue
+            events.append((_cursor(self.inode, self.offset + consumed), event))
+        self.offset += consumed
+        return events
+
+    def wait(self, timeout, poll_interval=0.5):
+        """Block up to `timeout` seconds for new events; returns them (possibly empty)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            generation = _changes.generation()  # taken before the read, so no write is missed
+            events = self.read()
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events
+            _changes.wait(generation, min(remaining, poll_interval) if _changes.polling() else remaining)
+
+    @property
+    def cursor(self):
+        return _cursor(self.inode, self.offset) if self.inode is not None else None
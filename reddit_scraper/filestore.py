@@ -0,0 +1,124 @@
+"""Crash-safe JSON files shared between the bot and API processes.
+
+search.json, credentials.json and bot_status.json are written by one process while the
+other reads them (and processed_submissions.pkl by every worker of a sharded bot). Writing in place ('w' + dump) lets a reader see a truncated file, and
+two writers doing read-modify-write lose each other's updates. Everything here avoids both:
+- writes go to a temp file in the same directory, are fsync'd, then os.replace'd over the
+  target, so readers only ever see the old or the new complete file;
+- read-modify-write cycles hold an advisory flock on a sidecar '<file>.lock', which works
+  across processes (API workers, bot) and across threads of one process.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: atomic writes still apply, locking degrades to a no-op
+    fcntl = None
+
+# Mode for files created fresh (an existing file keeps its own mode across rewrites).
+DEFAULT_FILE_MODE = 0o644
+
+# Per-thread lock depth by path, so a holder can re-enter (e.g. a locked API update that
+# calls a loader which itself locks to persist normalization) instead of self-deadlocking.
+_held = threading.local()
+
+
+def lock_path(path):
+    return f"{path}.lock"
+
+
+@contextlib.contextmanager
+def locked(path):
+    """Hold an exclusive cross-process lock for `path` for the duration of the block.
+    Re-entrant within a thread."""
+    depth = getattr(_held, 'depth', None)
+    if depth is None:
+        depth = _held.depth = {}
+    if fcntl is None or depth.get(path):
+        depth[path] = depth.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            depth[path] -= 1
+        return
+
+    fd = os.open(lock_path(path), os.O_RDWR | os.O_CREAT, DEFAULT_FILE_MODE)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        depth[path] = 1
+        try:
+            yield
+        finally:
+            depth[path] = 0
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory):
+    """Persist the rename itself (best effort; not every platform/filesystem allows it)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path, data, indent=None):
+    """Serialize `data` to `path` via temp file + fsync + rename. If serialization fails the
+    original file is left untouched."""
+    write_atomic(path, lambda f: json.dump(data, f, indent=indent))
+
+
+def write_atomic(path, write, binary=False):
+    """write_json_atomic for any format: `write(f)` fills the temp file before the rename."""
+    directory = os.path.dirname(path) or '.'
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = DEFAULT_FILE_MODE
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+    _fsync_dir(directory)
+
+
+def read_json(path, default=None):
+    """Parsed JSON at `path`, or `default` if the file is missing or invalid."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+@contextlib.contextmanager
+def update_json(path, default=None, indent=None):
+    """Locked read-modify-write: yields the current contents (or a copy of `default`) for the
+    block to mutate in place, then writes it back atomically."""
+    with locked(path):
+        data = read_json(path, None)
+        if data is None:
+            data = json.loads(json.dumps(default if default is not None else {}))
+        yield data
+        write_json_atomic(path, data, indent=indent)
@@ -5,6 +5,9 @@ is busy failing. These push heartbeats report real health instead:
 - the primary heartbeat reports UP only while Reddit fetches are succeeding;
 - the optional fallback heartbeat reports DOWN when OAuth is expected but the bot
   is on an RSS/JSON fallback, so degradation is alerted while the primary stays UP.
+
+Both push from one place only: the bot, or a sharded bot's coordinator on behalf of all
+its workers (shards.Coordinator.fetch_health).
 """
 
 import logging
@@ -16,17 +19,19 @@ import requests
 from . import config, credentials, sources
 
 
-def send_kuma_heartbeat():
+def send_kuma_heartbeat(fetch_health=None):
     """Report bot health to the primary Uptime Kuma Push monitor.
 
     Reports UP only if a Reddit fetch has succeeded within KUMA_FETCH_STALE_SECONDS;
-    otherwise DOWN. No-op unless KUMA_PUSH_URL is set.
+    otherwise DOWN. No-op unless KUMA_PUSH_URL is set. `fetch_health` (as from
+    sources.get_fetch_health) defaults to this process's own.
     """
+    fetch_health = fetch_health or sources.get_fetch_health()
     push_url = os.getenv('KUMA_PUSH_URL')
     if push_url:
         stale_after = int(os.getenv('KUMA_FETCH_STALE_SECONDS', '1500'))  # 25 min
         now = time.time()
-        last = sources.get_last_fetch_success_ts()
+        last = fetch_health['last_fetch_success_ts']
 
         if last is not None and (now - last) < stale_after:
             status, msg = 'up', f"ok (last good fetch {int(now - last)}s ago)"
@@ -40,7 +45,7 @@ def send_kuma_heartbeat():
         except requests.RequestException as e:
             logging.warning(f"Failed to send Uptime Kuma heartbeat: {e}")
 
-    send_kuma_fallback_heartbeat()
+    send_kuma_fallback_heartbeat(fetch_health['active_source'])
 
 
 def _oauth_expected():
@@ -51,15 +56,15 @@ def _oauth_expected():
     return has_app and 'oauth' in config.get_source_order()
 
 
-def send_kuma_fallback_heartbeat():
+def send_kuma_fallback_heartbeat(active=None):
     """Report to a SECOND Uptime Kuma Push monitor that tracks API vs fallback usage.
-    Reports DOWN when OAuth is expected but the bot is currently on RSS/JSON. No-op
-    unless KUMA_FALLBACK_PUSH_URL is set."""
+    Reports DOWN when OAuth is expected but the bot is currently on RSS/JSON (`active`,
+    default this process's active source). No-op unless KUMA_FALLBACK_PUSH_URL is set."""
     url = os.getenv('KUMA_FALLBACK_PUSH_URL')
     if not url:
         return
 
-    active = sources.get_active_source()
+    active = active or sources.get_active_source()
     if not _oauth_expected():
         status, msg = 'up', f"using {active or 'rss/json'} (by configuration)"
     elif active == 'oauth':
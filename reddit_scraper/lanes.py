@@ -0,0 +1,130 @@
+"""Execution lanes for the bot loop, so one slow task can't hold up the rest.
+
+Each lane is its own thread pool with its own concurrency limit and per-task timeout:
+post monitors (many, quick), thread-comment scans (few, slow: hundreds of comments per
+megathread) and housekeeping (status file, Kuma heartbeat, error digests). The loop only
+submits work and later reaps whatever has finished; it never waits on a task, so a
+500-comment scan stuck behind a throttled RSS fetch no longer delays the next cycle of
+1-minute keyword monitors.
+
+A task is keyed (monitor id, 'housekeeping'), and a key that's still running isn't
+submitted again - the next due run of a monitor is skipped rather than stacked. Python
+threads can't be killed, so a task past its lane's timeout is reported once (log, metric,
+error digest) and keeps its slot until it returns.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+
+POSTS, THREADS, HOUSEKEEPING = 'posts', 'threads', 'housekeeping'
+
+# name -> (max concurrent tasks, seconds before a task is reported as overrunning)
+LANE_LIMITS = {
+    POSTS: (
+        int(os.getenv('LANE_POSTS_WORKERS', '8')),
+        float(os.getenv('LANE_POSTS_TIMEOUT_SECONDS', '120')),
+    ),
+    THREADS: (
+        int(os.getenv('LANE_THREADS_WORKERS', '2')),
+        float(os.getenv('LANE_THREADS_TIMEOUT_SECONDS', '600')),
+    ),
+    HOUSEKEEPING: (1, 60.0),
+}
+
+
+def lane_for(params):
+    """The lane a monitor's runs go to."""
+    return THREADS if params.get('monitor_type') == 'thread_comments' else POSTS
+
+
+class Done:
+    """A reaped task: its key, what was submitted with it, and the exception it raised
+    (None on success). `overrun` marks a still-running task that just passed its timeout."""
+
+    __slots__ = ('lane', 'key', 'payload', 'error', 'overrun')
+
+    def __init__(self, lane, key, payload, error=None, overrun=False):
+        self.lane, self.key, self.payload, self.error, self.overrun = lane, key, payload, error, overrun
+
+
+class Lane:
+    def __init__(self, name, workers, timeout):
+        self.name = name
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'lane-{name}')
+        self._running = {}  # key -> [future, started (monotonic), payload, overrun reported]
+        self._lock = threading.Lock()
+
+    def busy(self, key):
+        with self._lock:
+            return key in self._running
+
+    def submit(self, key, fn, *args, payload=None):
+        """Queue fn(*args) under `key`; False (and nothing queued) if key is still running."""
+        with self._lock:
+            if key in self._running:
+                return False
+            self._running[key] = [self._executor.submit(fn, *args), time.monotonic(), payload, False]
+        metrics.LANE_TASKS.inc(lane=self.name)
+        return True
+
+    def reap(self):
+        """Finished tasks (removed from the lane) plus tasks that just passed the timeout."""
+        now = time.monotonic()
+        done = []
+        with self._lock:
+            for key, task in list(self._running.items()):
+                future, started, payload, reported = task
+                if future.done():
+                    del self._running[key]
+                    metrics.LANE_SECONDS.observe(now - started, lane=self.name)
+                    done.append(Done(self.name, key, payload, future.exception()))
+                elif not reported and now - started > self.timeout:
+                    task[3] = True
+                    metrics.LANE_OVERRUNS.inc(lane=self.name)
+                    done.append(Done(self.name, key, payload, overrun=True))
+        return done
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - task[1] for task in self._running.values()]
+        return {
+            'workers': self.workers,
+            'running': len(ages),
+            'queued': max(0, len(ages) - self.workers),
+            'oldest_seconds': round(max(ages), 1) if ages else None,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Lanes:
+    """The bot's lanes by name (see LANE_LIMITS)."""
+
+    def __init__(self, limits=None):
+        self.lanes = {name: Lane(name, *limit) for name, limit in (limits or LANE_LIMITS).items()}
+
+    def __getitem__(self, name):
+        return self.lanes[name]
+
+    def reap(self):
+        done = [d for lane in self.lanes.values() for d in lane.reap()]
+        for d in done:
+            if d.overrun:
+                logging.warning(f"Lane '{d.lane}': {d.key} still running after {self.lanes[d.lane].timeout:.0f}s")
+        return done
+
+    def snapshot(self):
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
+
+    def shutdown(self):
+        for lane in self.lanes.values():
+            lane.shutdown()
@@ -0,0 +1,94 @@
+"""Detection latency: how long after a post/comment was created the bot alerted on it.
+
+For every match three lags are measured from the item's created_utc:
+    fetch  - the fetch that returned it completed
+    match  - it passed the monitor's filters
+    notify - the notification dispatch returned
+Each is observed in the reddit_detection_lag_seconds histogram (per stage, monitor and
+source) and kept in a short rolling window per monitor and per source, summarized into
+bot_status.json's `detection_latency` section for /api/status.
+"""
+
+import os
+import threading
+from collections import deque
+
+from . import metrics
+
+STAGES = ('fetch', 'match', 'notify')
+LATENCY_WINDOW = int(os.getenv('LATENCY_WINDOW', '100'))  # matches kept per monitor/source
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'p50': round(_percentile(ordered, 0.5), 1),
+        'p90': round(_percentile(ordered, 0.9), 1),
+        'max': round(ordered[-1], 1),
+    }
+
+
+class _LatencyTracker:
+    """Rolling per-monitor / per-source lag samples. A single module-level instance
+    (`_tracker`) owns them, behind record/snapshot."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.samples = {}  # ('monitor' | 'source', name) -> {stage: deque of seconds}
+        self.last = {}  # monitor -> {stage: seconds} for its most recent match
+
+    def _window(self, group, name, stage):
+        stages = self.samples.setdefault((group, name), {})
+        return stages.setdefault(stage, deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, monitor, source, created_utc, **stage_times):
+        """Record one match. `stage_times` maps a stage in STAGES to the epoch time it
+        happened; items without a creation timestamp are ignored."""
+        if not created_utc:
+            return
+        lags = {stage: max(0.0, t - created_utc) for stage, t in stage_times.items() if t and stage in STAGES}
+        for stage, lag in lags.items():
+            metrics.DETECTION_LAG.observe(lag, stage=stage, monitor=monitor, source=source or 'unknown')
+        with self._lock:
+            for stage, lag in lags.items():
+                self._window('monitor', monitor, stage).append(lag)
+                self._window('source', source or 'unknown', stage).append(lag)
+            self.last[monitor] = {stage: round(lag, 1) for stage, lag in lags.items()}
+
+    def snapshot(self):
+        """{'by_monitor': {...}, 'by_source': {...}} with count/p50/p90/max per stage."""
+        with self._lock:
+            samples = {
+                key: {stage: list(window) for stage, window in stages.items()} for key, stages in self.samples.items()
+            }
+            last = dict(self.last)
+        result = {'by_monitor': {}, 'by_source': {}}
+        for (group, name), stages in samples.items():
+            summary = {stage: _summarize(values) for stage, values in stages.items() if values}
+            if group == 'monitor':
+                summary['last'] = last.get(name, {})
+            result[f"by_{group}"][name] = summary
+        return result
+
+
+_tracker = _LatencyTracker()
+
+
+def record(monitor, source, created_utc, **stage_times):
+    _tracker.record(monitor, source, created_utc, **stage_times)
+
+
+def snapshot():
+    return _tracker.snapshot()
+
+
+def reset():
+    _tracker.reset()
@@ -0,0 +1,260 @@
+"""In-process metrics (counters, gauges, histograms) rendered in the Prometheus text format.
+
+Both processes expose their own registry: the API at GET /metrics, the bot through a tiny
+built-in HTTP listener on METRICS_PORT (off unless set). Point Prometheus at both. The
+metrics all live here so the surface is in one place; a metric a process never touches
+just renders as zero / no samples. Under gunicorn each API worker has its own registry,
+so API request counts are per worker.
+
+No dependency on prometheus_client: the format is a few lines of text and the bot only
+needs inc/set/observe.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple((name, str(labels[name])) for name in self.label_names)
+
+    def value(self, **labels):
+        """Current value for a label set (mainly for tests)."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.label_names:
+            items = [((), 0)]
+        return [(self.name, key, value) for key, value in items]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines += [f"{name}{_format_labels(key)} {_format_value(value)}" for name, key, value in self.samples()]
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(float(b) for b in sorted(buckets)) + (math.inf,)
+        super().__init__(name, help, labels)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started, **labels)
+
+    def value(self, **labels):
+        """(count, sum) for a label set."""
+        counts, total = self._values.get(self._key(labels), ((), 0.0))
+        return sum(counts), total
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        samples = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key + (('le', _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"duplicate metric {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def reset(self):
+        """Zero every metric (between tests)."""
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def render(self):
+        return '\n'.join(metric.render() for metric in self.metrics.values()) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def render():
+    return REGISTRY.render()
+
+
+# --- data sources (sources.py) ---
+SOURCE_REQUESTS = REGISTRY.register(
+    Counter('reddit_source_requests_total', 'Fetch attempts per data source', ('source', 'kind'))
+)
+SOURCE_ERRORS = REGISTRY.register(
+    Counter('reddit_source_errors_total', 'Fetch attempts that failed or returned nothing', ('source', 'kind'))
+)
+SOURCE_LATENCY = REGISTRY.register(
+    Histogram('reddit_source_request_seconds', 'Fetch latency per data source', ('source', 'kind'))
+)
+FETCH_CACHE = REGISTRY.register(
+    Counter('reddit_fetch_cache_total', 'Coalescing cache lookups (hit ratio = hit / total)', ('result',))
+)
+
+# --- monitors / scheduler / lanes (monitor.py, scheduler.py, lanes.py) ---
+PROCESSED_SUBMISSIONS = REGISTRY.register(
+    Gauge('reddit_processed_submissions', 'Entries in the processed-submissions dedup store')
+)
+SCHEDULER_LAG = REGISTRY.register(
+    Histogram(
+        'reddit_scheduler_lag_seconds',
+        'How late a due monitor started relative to its interval',
+        buckets=(1, 5, 15, 30, 60, 120, 300, 600),
+    )
+)
+LANE_TASKS = REGISTRY.register(Counter('reddit_lane_tasks_total', 'Tasks submitted per execution lane', ('lane',)))
+LANE_OVERRUNS = REGISTRY.register(
+    Counter('reddit_lane_overruns_total', 'Tasks still running past their lane timeout', ('lane',))
+)
+RUNS_ABANDONED = REGISTRY.register(
+    Counter('reddit_runs_abandoned_total', 'Monitor runs whose fetches ran past their deadline')
+)
+LANE_SECONDS = REGISTRY.register(
+    Histogram(
+        'reddit_lane_task_seconds',
+        'Task run time (queueing included) per execution lane',
+        ('lane',),
+        buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+    )
+)
+MATCHES = REGISTRY.register(Counter('reddit_matches_total', 'Posts/comments that matched a monitor', ('item',)))
+DETECTION_LAG = REGISTRY.register(
+    Histogram(
+        'reddit_detection_lag_seconds',
+        'Seconds from a matched item being created to it being fetched/matched/notified',
+        ('stage', 'monitor', 'source'),
+        buckets=(5, 15, 30, 60, 120, 300, 600, 1800, 3600, 14400),
+    )
+)
+
+# --- notifications (notifications.py) ---
+NOTIFICATIONS = REGISTRY.register(Counter('reddit_notifications_total', 'Apprise dispatches', ('result',)))
+NOTIFY_LATENCY = REGISTRY.register(Histogram('reddit_notification_seconds', 'Apprise dispatch latency'))
+
+# --- web API (api.py) ---
+API_REQUESTS = REGISTRY.register(
+    Counter('reddit_api_requests_total', 'HTTP requests served by the API', ('method', 'endpoint', 'status'))
+)
+API_LATENCY = REGISTRY.register(Histogram('reddit_api_request_seconds', 'API request latency', ('endpoint',)))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would drown the bot's log
+
+
+def start_http_server(port=None, host='0.0.0.0'):
+    """Serve /metrics from a daemon thread. `port` defaults to METRICS_PORT; returns the
+    server, or None if no port is configured or it can't be bound."""
+    port = port if port is not None else os.getenv('METRICS_PORT')
+    if port in (None, ''):
+        return None
+    try:
+        server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    except OSError as e:
+        logging.warning(f"Metrics listener unavailable on port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    logging.info(f"📈 Metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -20,6 +20,8 @@ OPTIONAL_LIST_FIELDS = (
     'author_includes',
     'author_excludes',
 )
+# Optional scalar fields dropped from the stored form when null.
+OPTIONAL_NULL_FIELDS = ('min_upvotes', 'poll_floor_minutes', 'poll_ceiling_minutes')
 
 
 class Monitor(BaseModel):
@@ -37,7 +39,13 @@ class Monitor(BaseModel):
     subreddit: str
     color: str
     enabled: bool = True
+    # May spend paid (Sylvia) requests ahead of free sources when a daily budget is set.
+    urgent: bool = False
     cooldown_minutes: int = 10
+    # Adaptive polling bounds: when either is set the bot picks the interval within them
+    # from the subreddit's observed post rate; unset -> poll every cooldown_minutes.
+    poll_floor_minutes: Optional[int] = None
+    poll_ceiling_minutes: Optional[int] = None
     max_post_age_hours: int = 12
     min_upvotes: Optional[int] = None
     keywords: list[str] = Field(default_factory=list)
@@ -60,12 +68,14 @@ class Monitor(BaseModel):
         return self
 
     def to_stored_dict(self) -> dict:
-        """Dict for search.json: drops empty optional lists and a null min_upvotes to keep the
-        file tidy (matches the old config.clean_monitor). Bot-only/legacy fields pass through."""
+        """Dict for search.json: drops empty optional lists and null optional scalars (e.g.
+        min_upvotes) to keep the file tidy (matches the old config.clean_monitor).
+        Bot-only/legacy fields pass through."""
         data = self.model_dump()
         for field in OPTIONAL_LIST_FIELDS:
             if not data.get(field):
                 data.pop(field, None)
-        if data.get('min_upvotes') is None:
-            data.pop('min_upvotes', None)
+        for field in OPTIONAL_NULL_FIELDS:
+            if data.get(field) is None:
+                data.pop(field, None)
         return data
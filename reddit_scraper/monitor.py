@@ -4,8 +4,24 @@ import logging
 import os
 import pickle
 import time
+from functools import cached_property
+from typing import NamedTuple
 
-from . import config, credentials, notifications, sources
+from . import config, credentials, events, filestore, latency, metrics, models, notifications, sources
+
+DEFAULT_MAX_POST_AGE_HOURS = models.Monitor.model_fields['max_post_age_hours'].default
+# Near-miss posts (failed only min_upvotes) re-checked per monitor; one /api/info call's worth.
+WATCHLIST_MAX = int(os.getenv('WATCHLIST_MAX', '100'))
+
+
+class _Rules(NamedTuple):
+    """A monitor's filter lists, lowercased once instead of per post/comment."""
+
+    keywords: tuple
+    exclude_keywords: tuple
+    flair_contains: tuple
+    author_includes: frozenset
+    author_excludes: frozenset
 
 
 class RedditMonitor:
@@ -43,10 +59,40 @@ class RedditMonitor:
         self.monitor_type = kwargs.get('monitor_type', 'posts')
         self.thread_title_pattern = kwargs.get('thread_title_pattern', 'Buy/Sell/Trade')
         self.keyword_logic = kwargs.get('keyword_logic', 'any')
-        self.load_processed_submissions()
+        self.max_post_age_hours = kwargs.get('max_post_age_hours', DEFAULT_MAX_POST_AGE_HOURS)
+        self.monitor_id = kwargs.get('id')
+        self.urgent = kwargs.get('urgent', False)
+        self.name = kwargs.get('name') or f"r/{subreddit}"
+
+    @cached_property
+    def _rules(self):
+        def lowered(attr):  # getattr: tests build monitors via __new__ with only some lists
+            return [value.lower() for value in getattr(self, attr, None) or ()]
+
+        return _Rules(
+            keywords=tuple(lowered('keywords')),
+            exclude_keywords=tuple(lowered('exclude_keywords')),
+            flair_contains=tuple(lowered('flair_contains')),
+            author_includes=frozenset(lowered('author_includes')),
+            author_excludes=frozenset(lowered('author_excludes')),
+        )
+
+    @cached_property
+    def watchlist(self):
+        """post_id -> {'created_utc', 'added_at'} for posts that missed only on min_upvotes."""
+        return {}
+
+    @classmethod
+    def forget_threads(cls, subreddit):
+        """Drop cached megathread ids for a subreddit (its monitors were removed/changed)."""
+        for key in [k for k in cls._thread_cache if k.startswith(f"{subreddit}-")]:
+            cls._thread_cache.pop(key, None)
 
     def run(self):
         """Dispatch to the correct monitor method based on monitor_type."""
+        # Loaded per run, not per instance: instances outlive a cycle (see scheduler) and
+        # other monitors may have added to the shared file since.
+        self.load_processed_submissions()
         if self.monitor_type == 'thread_comments':
             self.search_thread_comments()
         else:
@@ -70,26 +116,59 @@ class RedditMonitor:
         """Send error notification via Apprise to all configured services."""
         notifications.notify_error(error_message)
 
+    def _publish_match(self, **match):
+        """Put a match on the live event feed (see events / the API's /api/events)."""
+        metrics.MATCHES.inc(item=match.get('item'))
+        events.publish(
+            'match',
+            monitor_id=getattr(self, 'monitor_id', None),
+            monitor=getattr(self, 'name', None) or f"r/{self.subreddit}",
+            subreddit=self.subreddit,
+            **match,
+        )
+
+    def _record_latency(self, item, matched_at):
+        """Detection latency for a match that has just been notified (see latency)."""
+        latency.record(
+            getattr(self, 'monitor_id', None) or self.subreddit,
+            item.get('source'),
+            item.get('created_utc'),
+            fetch=item.get('fetched_at'),
+            match=matched_at,
+            notify=time.time(),
+        )
+
     @property
     def processed_submissions_file(self):
         return config.get_processed_submissions_path()
 
-    def load_processed_submissions(self):
+    def _read_processed_submissions(self):
         try:
             with open(self.processed_submissions_file, 'rb') as file:
-                self.processed_submissions = pickle.load(file)
+                return pickle.load(file)
         except FileNotFoundError:
-            self.processed_submissions = set()
+            return set()
+        except Exception as e:  # truncated/corrupt: EOFError, UnpicklingError, ...
+            logging.warning(f"Unreadable processed submissions file, starting empty: {e}")
+            return set()
+
+    def load_processed_submissions(self):
+        self.processed_submissions = self._read_processed_submissions()
+        metrics.PROCESSED_SUBMISSIONS.set(len(self.processed_submissions))
 
     def save_processed_submissions(self):
+        """Merge with what's on disk and write it back atomically, under the file's lock: every
+        monitor (and every worker of a sharded bot) saves to the same file."""
         path = self.processed_submissions_file
-        if os.path.exists(path) and os.path.getsize(path) > self.max_file_size:
-            logging.info("Processed submissions file exceeded max size. Deleting and creating a new one.")
-            os.remove(path)
-            self.processed_submissions = set()
-
-        with open(path, 'wb') as file:
-            pickle.dump(self.processed_submissions, file)
+        with filestore.locked(path):
+            if os.path.exists(path) and os.path.getsize(path) > self.max_file_size:
+                logging.info("Processed submissions file exceeded max size. Deleting and creating a new one.")
+                os.remove(path)
+                self.processed_submissions = set()
+            else:
+                self.processed_submissions |= self._read_processed_submissions()
+            filestore.write_atomic(path, lambda file: pickle.dump(self.processed_submissions, file), binary=True)
+        metrics.PROCESSED_SUBMISSIONS.set(len(self.processed_submissions))
 
     def find_current_thread(self):
         """Find the thread ID of the current weekly megathread, with 1-hour caching."""
@@ -103,22 +182,26 @@ class RedditMonitor:
 
         # Stickied posts are the most reliable signal, but only PRAW exposes them.
         if self.reddit and sources._source_available('oauth'):
-            try:
-                sub = self.reddit.subreddit(self.subreddit)
+
+            def find_sticky(reddit):
+                sub = reddit.subreddit(self.subreddit)
                 for slot in [1, 2]:
                     try:
                         sticky = sub.sticky(number=slot)
                         if pattern in sticky.title.lower():
-                            thread_id = sticky.id
-                            break
+                            return sticky.id
                     except Exception:
                         pass
+                return None
+
+            try:
+                thread_id = sources._call_oauth(self.reddit, find_sticky)
             except Exception as e:
                 logging.warning(f"PRAW error finding sticky BST thread: {e}")
 
         # Otherwise scan recent posts via the configured source chain.
         if not thread_id:
-            posts, _ = sources.fetch_posts(self.subreddit, 25, self.reddit)
+            posts, _ = sources.fetch_posts(self.subreddit, 25, self.reddit, self.urgent)
             for post in posts or []:
                 if pattern in (post['title'] or '').lower():
                     if post.get('id'):
@@ -144,7 +227,7 @@ class RedditMonitor:
             return
 
         logging.info(f"Scanning thread {thread_id} comments in r/{self.subreddit}...")
-        comments = sources.fetch_thread_comments(self.subreddit, thread_id, self.reddit)
+        comments = sources.fetch_thread_comments(self.subreddit, thread_id, self.reddit, self.urgent)
         if comments is None:
             return
 
@@ -154,28 +237,32 @@ class RedditMonitor:
                 body=comment['body'],
                 author=comment['author'],
                 permalink=comment['permalink'],
+                fetched=comment,
             )
         logging.info(f"Finished scanning thread comments in r/{self.subreddit}.")
 
-    def _process_comment(self, comment_id, body, author, permalink):
-        """Check a BST comment against keyword filters and notify on match."""
+    def _process_comment(self, comment_id, body, author, permalink, fetched=None):
+        """Check a BST comment against keyword filters and notify on match. `fetched` is
+        the source's comment dict, for its created/fetched timestamps."""
         submission_id = f"{self.subreddit}-comment-{comment_id}"
         if submission_id in self.processed_submissions:
             return False
 
         body_lower = body.lower()
+        rules = self._rules
 
         if self.keyword_logic == 'any':
-            has_keywords = any(kw.lower() in body_lower for kw in self.keywords)
+            has_keywords = any(kw in body_lower for kw in rules.keywords)
         else:
-            has_keywords = all(kw.lower() in body_lower for kw in self.keywords)
+            has_keywords = all(kw in body_lower for kw in rules.keywords)
 
-        has_excluded = any(kw.lower() in body_lower for kw in self.exclude_keywords)
+        has_excluded = any(kw in body_lower for kw in rules.exclude_keywords)
         author_lower = author.lower()
-        meets_author_includes = not self.author_includes or author_lower in [a.lower() for a in self.author_includes]
-        meets_author_excludes = author_lower not in [a.lower() for a in self.author_excludes]
+        meets_author_includes = not rules.author_includes or author_lower in rules.author_includes
+        meets_author_excludes = author_lower not in rules.author_excludes
 
         if has_keywords and not has_excluded and meets_author_includes and meets_author_excludes:
+            matched_at = time.time()
             excerpt = body[:300] + '...' if len(body) > 300 else body
             message = (
                 f"BST listing match in r/{self.subreddit}!\n"
@@ -183,7 +270,9 @@ class RedditMonitor:
                 f"Link: https://www.reddit.com{permalink}"
             )
             self.send_push_notification(message, title="FMF BST Match")
+            self._record_latency(fetched or {}, matched_at)
             logging.info(f"BST match: u/{author} | {body[:80]}...")
+            self._publish_match(item='comment', id=comment_id, title=body[:120], author=author, permalink=permalink)
             self.processed_submissions.add(submission_id)
             self.save_processed_submissions()
             return True
@@ -193,11 +282,13 @@ class RedditMonitor:
     def search_reddit_for_keywords(self):
         """Search a subreddit for keywords, fetching posts through the configured source chain."""
         logging.info(f"Searching '{self.subreddit}' subreddit for keywords...")
-        posts, source = sources.fetch_posts(self.subreddit, 10, self.reddit)
+        self.last_listing_times = None  # a run that fetches nothing is no post-rate sample
+        posts, source = sources.fetch_posts(self.subreddit, 10, self.reddit, self.urgent)
 
         if posts is None:
             logging.error(f"Failed to fetch posts for '{self.subreddit}' from all sources")
             return
+        self.last_listing_times = [post.get('created_utc') for post in posts]  # scheduler's post-rate input
 
         for post in posts:
             self._process_post(
@@ -209,17 +300,71 @@ class RedditMonitor:
                 domain=post['domain'],
                 flair=post['link_flair_text'] or '',
                 author=post['author'],
+                fetched=post,
             )
+        self.refresh_watchlist(skip={post['id'] for post in posts})
 
         logging.info(f"Finished searching '{self.subreddit}' subreddit (source: {source}).")
 
-    def _process_post(self, post_id, title, url, score, permalink, domain, flair, author):
-        """Process a single post and send notification if it matches filters."""
+    def _watch(self, post_id, fetched):
+        self.watchlist.pop(post_id, None)  # re-insert as newest
+        self.watchlist[post_id] = {'created_utc': fetched.get('created_utc'), 'added_at': time.time()}
+        while len(self.watchlist) > WATCHLIST_MAX:
+            self.watchlist.pop(next(iter(self.watchlist)))
+
+    def refresh_watchlist(self, skip=()):
+        """Re-check near-miss posts that have left the listing window: their current scores
+        come from one batched info lookup, then each goes through _process_post again
+        (which notifies on a match and re-watches a post that still only misses on score).
+        Posts past the monitor's age window, or deleted, are dropped; posts whose lookup
+        failed stay watched for the next cycle."""
+        now = time.time()
+        max_age = (getattr(self, 'max_post_age_hours', None) or DEFAULT_MAX_POST_AGE_HOURS) * 3600
+        for post_id, entry in list(self.watchlist.items()):
+            if now - (entry['created_utc'] or entry['added_at']) > max_age:
+                del self.watchlist[post_id]
+        due = [post_id for post_id in self.watchlist if post_id not in skip]
+        if not due:
+            return
+
+        refreshed = sources.fetch_info(due, self.reddit)
+        for post_id in due:
+            if post_id in refreshed and refreshed[post_id] is None:
+                continue  # lookup failed: keep it for the next cycle
+            self.watchlist.pop(post_id, None)
+            post = refreshed.get(post_id)
+            if post is not None:
+                self._process_post(
+                    post_id=post['id'],
+                    title=post['title'],
+                    url=post['url'],
+                    score=post['score'],
+                    permalink=post['permalink'],
+                    domain=post['domain'],
+                    flair=post['link_flair_text'] or '',
+                    author=post['author'],
+                    fetched=post,
+                )
+        logging.debug(
+            f"Re-checked {len(due)} near-miss post(s) in r/{self.subreddit}; {len(self.watchlist)} still watched"
+        )
+
+    def _process_post(self, post_id, title, url, score, permalink, domain, flair, author, fetched=None):
+        """Process a single post and send notification if it matches filters. `fetched` is
+        the source's post dict, for its created/fetched timestamps."""
         submission_id = f"{self.subreddit}-{post_id}"
         if submission_id in self.processed_submissions:
             logging.debug(f"Skipping duplicate post: {title}")
             return False
 
+        # The fetcher already stopped at the widest window of all monitors on this
+        # subreddit; this applies the monitor's own (possibly narrower) one.
+        max_age_hours = getattr(self, 'max_post_age_hours', None)
+        created = (fetched or {}).get('created_utc')
+        if max_age_hours and created and time.time() - created > max_age_hours * 3600:
+            logging.debug(f"Skipping post older than {max_age_hours}h: {title}")
+            return False
+
         message = (
             f"Match found in '{self.subreddit}' subreddit:\n"
             f"Title: {title}\n"
@@ -239,31 +384,40 @@ class RedditMonitor:
         meets_domain_contains = not self.domain_contains or any(d in submission_domain for d in self.domain_contains)
         meets_domain_excludes = not any(d in submission_domain for d in self.domain_excludes)
 
+        rules = self._rules
+
         # Flair filter
         submission_flair = flair.lower()
-        meets_flair = not self.flair_contains or any(f.lower() in submission_flair for f in self.flair_contains)
+        meets_flair = not rules.flair_contains or any(f in submission_flair for f in rules.flair_contains)
 
         # Author filters
         author_name = author.lower()
-        meets_author_includes = not self.author_includes or author_name in [a.lower() for a in self.author_includes]
-        meets_author_excludes = author_name not in [a.lower() for a in self.author_excludes]
+        meets_author_includes = not rules.author_includes or author_name in rules.author_includes
+        meets_author_excludes = author_name not in rules.author_excludes
 
-        if (
+        meets_rules = (
             has_all_keywords
             and not has_excluded
-            and meets_upvotes
             and meets_domain_contains
             and meets_domain_excludes
             and meets_flair
             and meets_author_includes
             and meets_author_excludes
-        ):
+        )
+
+        if meets_rules and meets_upvotes:
+            matched_at = time.time()
             logging.info(message)
             self.send_push_notification(message)
+            self._record_latency(fetched or {}, matched_at)
             logging.info('-' * 40)
+            self._publish_match(item='post', id=post_id, title=title, author=author, permalink=permalink)
 
             self.processed_submissions.add(submission_id)
             self.save_processed_submissions()
             return True
 
+        if meets_rules:
+            self._watch(post_id, fetched or {})  # may still gain upvotes after leaving the listing
+
         return False
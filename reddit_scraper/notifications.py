@@ -1,10 +1,25 @@
-"""Apprise-based notification dispatch."""
+"""Apprise-based notification dispatch, plus error-notification aggregation."""
 
 import logging
+import os
+import re
+import threading
+import time
 
-import apprise
+from . import credentials, metrics
 
-from . import credentials
+# Error notifications are collapsed into one summary per window (seconds), so a 403-storm
+# across many monitors produces a single alert with counts instead of one per failure.
+ERROR_NOTIFY_WINDOW_SECONDS = int(os.getenv('ERROR_NOTIFY_WINDOW_SECONDS', '900'))
+
+# In a worker of a sharded bot, the queue to the coordinator, which sends everything (see shards).
+_outbox = None
+
+
+def use_outbox(queue):
+    """Hand notifications and error reports to `queue` instead of sending them here."""
+    global _outbox
+    _outbox = queue
 
 
 def _notification_urls():
@@ -19,24 +34,118 @@ def dispatch(body, title):
     urls = _notification_urls()
     if not urls:
         return None
+    if _outbox is not None:
+        _outbox.put(('dispatch', body, title))
+        return True  # queued; the coordinator's send is what the metrics count
+    import apprise  # ~0.2s to import; deferred until there is something to send
+
+    started = time.monotonic()
     try:
         apobj = apprise.Apprise()
         for url in urls:
             apobj.add(url)
-        return apobj.notify(body=body, title=title)
+        result = apobj.notify(body=body, title=title)
     except Exception as e:
         logging.error(f"Error sending notification: {e}")
-        return False
+        result = False
+    metrics.NOTIFY_LATENCY.observe(time.monotonic() - started)
+    metrics.NOTIFICATIONS.inc(result='ok' if result else 'failed')
+    return result
 
 
-def notify_error(message):
-    """Send an error notification (used by the source dispatcher and main loop)."""
+def error_fingerprint(message):
+    """Collapse an error message to a stable key so the same failure with different
+    numbers (status codes, counts, timings) dedups together."""
+    return re.sub(r'\s+', ' ', re.sub(r'\d+', '#', str(message))).strip().lower()
+
+
+class _ErrorAggregator:
+    """Dedups error notifications by fingerprint and rate-limits them to one per window.
+
+    The first error after a quiet window is sent straight away (so a real outage is
+    alerted promptly); anything reported within the window after that is counted and
+    sent as a single summary once the window has passed (see flush). A single
+    module-level instance (`_errors`) owns it, behind notify_error/flush_errors.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop pending errors and the rate-limit clock (called at import and between tests)."""
+        self.pending = {}  # fingerprint -> {'message', 'count', 'first_seen', 'last_seen'}
+        self.last_sent = 0.0
+
+    def report(self, message):
+        """Record an error; send immediately if no error notification went out this window."""
+        now = time.time()
+        key = error_fingerprint(message)
+        with self._lock:
+            entry = self.pending.get(key)
+            if entry:
+                entry['count'] += 1
+                entry['last_seen'] = now
+            else:
+                self.pending[key] = {'message': str(message), 'count': 1, 'first_seen': now, 'last_seen': now}
+        logging.error(f"Error recorded for notification: {message}")
+        self.flush()
+
+    def flush(self, force=False):
+        """Send one summary of everything pending, if the window has elapsed (or force).
+        Returns True if a notification was attempted."""
+        now = time.time()
+        with self._lock:
+            if not self.pending:
+                return False
+            if not force and now - self.last_sent < ERROR_NOTIFY_WINDOW_SECONDS:
+                return False
+            pending = list(self.pending.values())
+            self.pending = {}
+            self.last_sent = now
+        _send_error_summary(pending)
+        return True
+
+
+def _format_error_summary(entries):
+    """Body for an error notification: the message itself for one occurrence, otherwise
+    a count line per distinct error (most frequent first)."""
+    if len(entries) == 1 and entries[0]['count'] == 1:
+        return f"Error in Reddit Scraper: {entries[0]['message']}"
+    total = sum(e['count'] for e in entries)
+    lines = [f"{total} errors ({len(entries)} distinct) in Reddit Scraper:"]
+    for e in sorted(entries, key=lambda e: e['count'], reverse=True):
+        lines.append(f"- {e['count']}x {e['message']}")
+    return "\n".join(lines)
+
+
+def _send_error_summary(entries):
     if not _notification_urls():
         logging.warning("No notification services configured, cannot send error notification")
         return
     logging.error("Error occurred. Sending error notification...")
-    result = dispatch(f"Error in Reddit Scraper: {message}", "⚠️ Reddit Monitor Error")
+    result = dispatch(_format_error_summary(entries), "⚠️ Reddit Monitor Error")
     if result:
         logging.info("Error notification sent successfully")
     else:
         logging.warning("Error notification may have failed")
+
+
+_errors = _ErrorAggregator()
+
+
+def notify_error(message):
+    """Report an error notification (used by the source dispatcher and main loop).
+
+    Errors are aggregated: the first in a quiet window is sent immediately, repeats and
+    others within ERROR_NOTIFY_WINDOW_SECONDS are held for the next flush_errors summary.
+    """
+    if _outbox is not None:
+        _outbox.put(('error', str(message)))
+        return
+    _errors.report(message)
+
+
+def flush_errors(force=False):
+    """Send the pending error summary if its window has elapsed (called once per bot cycle)."""
+    return _errors.flush(force)
@@ -0,0 +1,261 @@
+"""Per-monitor schedule for the bot loop, updated incrementally when search.json changes.
+
+On reload the new monitor list is diffed against the current one by id, and each monitor is
+classified as added, removed, rule-changed (anything that affects matching or fetching) or
+schedule-changed (only cooldown_minutes / enabled). Only those entries are touched:
+unchanged monitors keep their RedditMonitor instance (and its compiled rules) and
+their last-run time, a schedule change keeps the instance, and cached fetches / megathread
+ids are dropped only for subreddits no monitor watches anymore.
+
+A monitor with poll_floor_minutes / poll_ceiling_minutes set is polled adaptively: the
+scheduler keeps an exponentially-weighted posts-per-minute estimate per subreddit from the
+created_utc of the listings its monitors fetch, and picks the interval that should see
+about VELOCITY_TARGET_POSTS new posts per poll, clamped to those bounds. Busy subreddits
+get polled at the floor, dead ones drift to the ceiling.
+"""
+
+import logging
+import os
+from typing import NamedTuple
+
+from . import metrics, sources
+from .monitor import DEFAULT_MAX_POST_AGE_HOURS, RedditMonitor
+
+SCHEDULE_FIELDS = ('cooldown_minutes', 'enabled', 'poll_floor_minutes', 'poll_ceiling_minutes')
+DEFAULT_COOLDOWN_MINUTES = 10
+VELOCITY_ALPHA = float(os.getenv('VELOCITY_ALPHA', '0.3'))  # weight of the newest rate sample
+VELOCITY_TARGET_POSTS = float(os.getenv('VELOCITY_TARGET_POSTS', '3'))  # new posts wanted per poll
+_MIN_SAMPLE_MINUTES = 0.5  # monitors sharing a subreddit see the same listing within a cycle
+
+
+def monitor_key(params):
+    return params.get('id', params.get('subreddit', 'unknown'))
+
+
+def _rule_fields(params):
+    return {k: v for k, v in params.items() if k not in SCHEDULE_FIELDS}
+
+
+def _max_age_hours(params):
+    """A monitor's post-age window, or None when it must see the whole listing: thread
+    monitors look their (possibly days-old) megathread up in the same new listing."""
+    if params.get('monitor_type') == 'thread_comments':
+        return None
+    return params.get('max_post_age_hours', DEFAULT_MAX_POST_AGE_HOURS)
+
+
+class ConfigDiff(NamedTuple):
+    added: list
+    removed: list
+    rule_changed: list
+    schedule_changed: list
+
+    def __bool__(self):
+        return any(self)
+
+    def summary(self):
+        return ', '.join(f"{len(ids)} {name.replace('_', ' ')}" for name, ids in self._asdict().items() if ids)
+
+
+def diff_monitors(old, new):
+    """Classify monitors between two {id: params} maps (see module docstring)."""
+    added = [k for k in new if k not in old]
+    removed = [k for k in old if k not in new]
+    rule_changed, schedule_changed = [], []
+    for k, params in new.items():
+        previous = old.get(k)
+        if previous is None or previous == params:
+            continue
+        if _rule_fields(previous) != _rule_fields(params):
+            rule_changed.append(k)
+        else:
+            schedule_changed.append(k)
+    return ConfigDiff(added, removed, rule_changed, schedule_changed)
+
+
+class _Velocity:
+    """Exponentially-weighted new-posts-per-minute estimate for one subreddit."""
+
+    __slots__ = ('rate', 'newest', 'observed_at')
+
+    def __init__(self):
+        self.rate = None  # posts/minute; None until the first listing is seen
+        self.newest = None  # newest created_utc seen so far
+        self.observed_at = None
+
+    def observe(self, created_times, now):
+        """Fold in one fetched listing. An empty one (a quiet subreddit, everything past the
+        age cutoff) is a sample of zero new posts, so the rate decays instead of freezing."""
+        times = [t for t in created_times if t]
+        if self.rate is None:
+            # First look: the listing's own spread of timestamps is the best estimate.
+            span = (max(times) - min(times)) / 60 if times else 0
+            self.rate = (len(times) - 1) / span if span > 0 else 0.0
+        else:
+            elapsed = (now - self.observed_at) / 60
+            if elapsed < _MIN_SAMPLE_MINUTES:
+                return
+            sample = sum(self.newest is None or t > self.newest for t in times) / elapsed
+            self.rate = VELOCITY_ALPHA * sample + (1 - VELOCITY_ALPHA) * self.rate
+        if times:
+            self.newest = max(times + [self.newest or 0])
+        self.observed_at = now
+
+
+class _Entry:
+    __slots__ = ('params', 'monitor', 'last_run')
+
+    def __init__(self, params, last_run=0):
+        self.params = params
+        self.monitor = None  # RedditMonitor, built on first run
+        self.last_run = last_run
+
+    @property
+    def enabled(self):
+        return self.params.get('enabled', True)
+
+    @property
+    def interval(self):
+        """Refresh interval in seconds (cooldown_minutes doubles as the per-monitor interval)."""
+        return self.params.get('cooldown_minutes', DEFAULT_COOLDOWN_MINUTES) * 60
+
+    @property
+    def bounds(self):
+        """(floor, ceiling) in seconds for adaptive polling, or None for a fixed interval."""
+        floor, ceiling = self.params.get('poll_floor_minutes'), self.params.get('poll_ceiling_minutes')
+        if floor is None and ceiling is None:
+            return None
+        base = self.params.get('cooldown_minutes', DEFAULT_COOLDOWN_MINUTES)
+        floor = floor if floor is not None else min(base, ceiling)
+        ceiling = ceiling if ceiling is not None else max(base, floor)
+        return floor * 60, max(floor, ceiling) * 60
+
+    def monitor_for(self, reddit):
+        if self.monitor is None:
+            self.monitor = RedditMonitor(reddit, **self.params)
+        self.monitor.reddit = reddit  # the client is replaced when credentials reload
+        return self.monitor
+
+
+class Scheduler:
+    def __init__(self):
+        self.entries = {}  # monitor id -> _Entry
+        self._subscribers = {}  # subreddit -> ids of the monitors watching it
+        self.velocity = {}  # subreddit -> _Velocity
+
+    def _subscribe(self, k, params):
+        self._subscribers.setdefault(params.get('subreddit'), set()).add(k)
+
+    def _unsubscribe(self, k, params):
+        sub = params.get('subreddit')
+        ids = self._subscribers.get(sub, set())
+        ids.discard(k)
+        if not ids:
+            self._subscribers.pop(sub, None)
+            self.velocity.pop(sub, None)
+            sources.forget_subreddit(sub)
+            RedditMonitor.forget_threads(sub)
+
+    def _update_profiles(self, subreddits):
+        """Tell the source layer the widest post-age window among each subreddit's monitors,
+        so fetchers can stop parsing a new-sorted listing once past it."""
+        for sub in subreddits:
+            ids = self._subscribers.get(sub)
+            if ids:
+                hours = [_max_age_hours(self.entries[k].params) for k in ids]
+                # A monitor with no window needs everything, so no cutoff at all.
+                sources.set_subreddit_profile(sub, max_age_hours=None if not all(hours) else max(hours))
+
+    def apply(self, monitors):
+        """Bring the schedule in line with a monitor list; returns the ConfigDiff applied."""
+        new = {monitor_key(m): m for m in monitors}
+        diff = diff_monitors({k: e.params for k, e in self.entries.items()}, new)
+
+        touched = set()
+        # Additions are counted before removals so a subreddit that merely moves between
+        # monitors keeps its cached fetches.
+        for k in diff.added:
+            self.entries[k] = _Entry(new[k])
+            self._subscribe(k, new[k])
+            touched.add(new[k].get('subreddit'))
+        for k in diff.removed:
+            params = self.entries.pop(k).params
+            self._unsubscribe(k, params)
+            touched.add(params.get('subreddit'))
+        for k in diff.rule_changed:
+            entry = self.entries[k]
+            if entry.params.get('subreddit') != new[k].get('subreddit'):
+                self._subscribe(k, new[k])
+                self._unsubscribe(k, entry.params)
+            touched.update((entry.params.get('subreddit'), new[k].get('subreddit')))
+            entry.params, entry.monitor = new[k], None
+        for k in diff.schedule_changed:
+            self.entries[k].params = new[k]  # RedditMonitor doesn't use schedule fields
+
+        self._update_profiles(touched)
+        if diff:
+            logging.info(f"Monitors updated: {diff.summary()}")
+        return diff
+
+    def enabled(self):
+        return [e for e in self.entries.values() if e.enabled]
+
+    def interval(self, entry):
+        """Seconds between runs: cooldown_minutes, or adapted to the subreddit's post rate
+        within the entry's bounds (the floor until a rate is known)."""
+        bounds = entry.bounds
+        if bounds is None:
+            return entry.interval
+        floor, ceiling = bounds
+        velocity = self.velocity.get(entry.params.get('subreddit'))
+        if velocity is None or velocity.rate is None:
+            return floor
+        if velocity.rate <= 0:
+            return ceiling
+        return min(ceiling, max(floor, VELOCITY_TARGET_POSTS / velocity.rate * 60))
+
+    def due(self, now, run_now=()):
+        """Enabled entries whose interval has elapsed (or that were asked to run now), each
+        marked as run at `now`."""
+        due = []
+        for k, entry in self.entries.items():
+            if not entry.enabled:
+                continue
+            interval = self.interval(entry)
+            if now - entry.last_run >= interval or k in run_now:
+                if entry.last_run:  # lag only means something once it has a schedule
+                    metrics.SCHEDULER_LAG.observe(max(0.0, now - entry.last_run - interval))
+                entry.last_run = now
+                due.append(entry)
+        return due
+
+    def observe(self, entries, now):
+        """Feed the post timestamps the just-run monitors saw into their subreddits' rates.
+        A run that fetched nothing (every source failed) leaves none and is skipped: an
+        outage is not a quiet subreddit."""
+        for entry in entries:
+            times = getattr(entry.monitor, 'last_listing_times', None)
+            if times is not None:
+                self.velocity.setdefault(entry.params.get('subreddit'), _Velocity()).observe(times, now)
+
+    def next_due_in(self, now):
+        """Seconds until the next enabled monitor is due (0 if one is overdue), or None."""
+        waits = [e.last_run + self.interval(e) - now for e in self.entries.values() if e.enabled]
+        return max(0.0, min(waits)) if waits else None
+
+    def snapshot(self, now):
+        """Per-monitor schedule for bot_status.json: the interval in use and why."""
+        result = {}
+        for k, entry in self.entries.items():
+            velocity = self.velocity.get(entry.params.get('subreddit'))
+            interval = self.interval(entry)
+            result[k] = {
+                'interval_minutes': round(interval / 60, 1),
+                'adaptive': entry.bounds is not None,
+                'posts_per_minute': None if velocity is None or velocity.rate is None else round(velocity.rate, 3),
+                'next_run_in_seconds': int(max(0, entry.last_run + interval - now)) if entry.enabled else None,
+            }
+        return result
+
+    def last_run_times(self):
+        return {k: e.last_run for k, e in self.entries.items() if e.last_run}
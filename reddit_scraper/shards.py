@@ -0,0 +1,236 @@
+"""Sharded bot mode (`bot.py --workers N`): monitors spread over N worker processes.
+
+One CPython process tops out on the GIL once parsing and matching dominate, so with
+--workers the bot runs a coordinator plus N workers (spawned, not forked: the workers
+start with no threads or locks copied mid-use). Monitors are assigned by a stable hash of
+their subreddit, so everything per-subreddit - coalesced fetches, post-rate estimates,
+source affinity, megathread ids - stays inside one worker.
+
+The coordinator owns what must exist once:
+- the control socket and the file watcher; config/credential changes and run-now
+  requests are forwarded to every worker, which re-reads search.json and keeps its share;
+- the notification outbox: workers queue alerts and error reports, and the coordinator
+  sends them, so the error digest dedups across workers and Apprise runs in one place;
+- the rate budgets shared by all workers (SharedBudgets): the per-egress-IP RSS clocks,
+  since every worker goes out through the same IPs, and today's paid-request counts;
+- supervision: a worker that dies is restarted (at most once per RESTART_BACKOFF_SECONDS);
+- health reporting: the Uptime Kuma heartbeats and the top-level active-source fields of
+  bot_status.json, from what every worker reports (fetch_health).
+
+Each worker keeps its own source_state / response_cache files (BOT_SHARD, see config)
+and writes its status sections under `shards.<index>` in bot_status.json. The notified-post
+store (processed_submissions.pkl) is shared: saves merge with the file under its lock.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+
+from . import config, notifications, sources, status
+
+RESTART_BACKOFF_SECONDS = 30
+
+
+def shard_of(subreddit, count):
+    """Stable worker index for a subreddit (same answer in every process and across runs)."""
+    return zlib.crc32((subreddit or '').lower().encode()) % count
+
+
+class _Clocks:
+    """Dict-like view of the shared per-egress-IP RSS clocks, so it can stand in for
+    _SourceState.rss_next_free (callers hold SharedBudgets.lock)."""
+
+    def __init__(self, array, keys):
+        self._array = array
+        self._index = {key: i for i, key in enumerate(keys)}
+
+    def get(self, proxy, default=0):
+        i = self._index.get(proxy)
+        return (self._array[i] or default) if i is not None else default
+
+    def __setitem__(self, proxy, value):
+        self._array[self._index[proxy]] = value
+
+
+class SharedBudgets:
+    """Rate budgets shared by every worker through shared memory, under one lock."""
+
+    def __init__(self, ctx, proxies, paid_sources):
+        self.lock = ctx.Lock()
+        self.rss_clocks = _Clocks(ctx.Array('d', len(proxies) + 1, lock=False), [None, *proxies])
+        self._paid_sources = list(paid_sources)
+        self._paid = ctx.Array('i', len(self._paid_sources), lock=False)
+        self._day = ctx.Value('i', 0, lock=False)  # days since the epoch (UTC) the counts are for
+
+    def _roll_day(self):
+        today = int(time.time() // 86400)
+        if self._day.value != today:
+            self._day.value = today
+            for i in range(len(self._paid)):
+                self._paid[i] = 0
+
+    def add_paid(self, source):
+        with self.lock:
+            self._roll_day()
+            self._paid[self._paid_sources.index(source)] += 1
+
+    def paid_spent(self, source):
+        with self.lock:
+            self._roll_day()
+            return self._paid[self._paid_sources.index(source)]
+
+    def seed_paid(self, saved_status):
+        """Start today's paid counts from bot_status.json: the single-process section plus
+        every worker's, each counting only its own requests."""
+        sections = [saved_status, *(saved_status.get('shards') or {}).values()]
+        today = time.strftime('%Y-%m-%d', time.gmtime())
+        with self.lock:
+            self._roll_day()
+            for section in sections:
+                usage = section.get('source_usage') or {}
+                if usage.get('date') != today:
+                    continue
+                for i, source in enumerate(self._paid_sources):
+                    self._paid[i] += (usage.get('sources') or {}).get(source, {}).get('successes', 0)
+
+
+class Shard:
+    """What a worker process gets from the coordinator (picklable at spawn)."""
+
+    def __init__(self, index, count, inbox, outbox, budgets):
+        self.index = index
+        self.count = count
+        self.inbox = inbox  # coordinator -> worker: ('reload', what) / ('run', monitor_id)
+        self.outbox = outbox  # worker -> coordinator: ('dispatch', body, title) / ('error', message)
+        self.budgets = budgets
+
+    def join(self):
+        """Set this process up as the worker: its own state files, the shared budgets and
+        the coordinator's outbox for notifications."""
+        os.environ['BOT_SHARD'] = str(self.index)
+        sources.use_shared_budgets(self.budgets)
+        notifications.use_outbox(self.outbox)
+
+    def select(self, monitors):
+        """This worker's share of the monitor list."""
+        return [m for m in monitors if shard_of(m.get('subreddit'), self.count) == self.index]
+
+    def listen(self, request_reload, request_run):
+        """Feed the coordinator's forwarded requests into the worker's loop (daemon thread)."""
+
+        def run():
+            while True:
+                kind, arg = self.inbox.get()
+                (request_reload if kind == 'reload' else request_run)(arg)
+
+        threading.Thread(target=run, name='shard-inbox', daemon=True).start()
+
+    def metrics_port(self):
+        """METRICS_PORT + 1 + index, so each worker has its own /metrics (None if unset)."""
+        port = os.getenv('METRICS_PORT')
+        return int(port) + 1 + self.index if port else None
+
+    def saved_status(self, saved):
+        """This worker's sections of a bot_status.json dict."""
+        return (saved.get('shards') or {}).get(str(self.index)) or {}
+
+
+class Coordinator:
+    """Spawns and supervises the workers, and relays between them and the outside (see module docstring)."""
+
+    def __init__(self, count, target):
+        self.ctx = multiprocessing.get_context('spawn')
+        self.count = count
+        self.target = target  # target(shard): the worker's main loop
+        self.outbox = self.ctx.Queue()
+        self.budgets = SharedBudgets(self.ctx, sources._PROXIES, config.PAID_SOURCES)
+        self.shards = [Shard(i, count, self.ctx.Queue(), self.outbox, self.budgets) for i in range(count)]
+        self.processes = [None] * count
+        self.restarts = [0] * count
+        self.started_at = [0.0] * count
+
+    def _spawn(self, i):
+        process = self.ctx.Process(target=self.target, args=(self.shards[i],), name=f'bot-shard-{i}', daemon=False)
+        process.start()
+        self.processes[i], self.started_at[i] = process, time.time()
+        logging.info(f"Started worker {i}/{self.count} (pid {process.pid})")
+
+    def start(self):
+        saved = status.read_bot_status()
+        self.budgets.seed_paid(saved)
+        if (saved.get('workers') or {}).get('count') != self.count:
+            status.update_bot_status(shards={})  # sections from a different split are stale
+        for i in range(self.count):
+            self._spawn(i)
+        threading.Thread(target=self._relay_outbox, name='shard-outbox', daemon=True).start()
+
+    def _relay_outbox(self):
+        while True:
+            kind, *args = self.outbox.get()
+            try:
+                if kind == 'dispatch':
+                    notifications.dispatch(*args)
+                else:
+                    notifications.notify_error(*args)
+            except Exception as e:
+                logging.error(f"Failed to relay a worker notification: {e}")
+
+    def broadcast(self, kind, arg):
+        for shard in self.shards:
+            shard.inbox.put((kind, arg))
+
+    def request_reload(self, what):
+        self.broadcast('reload', what)
+
+    def supervise(self):
+        """Restart workers that exited, no sooner than RESTART_BACKOFF_SECONDS after their last start."""
+        for i, process in enumerate(self.processes):
+            if process is None or process.is_alive():
+                continue
+            if time.time() - self.started_at[i] < RESTART_BACKOFF_SECONDS:
+                continue
+            notifications.notify_error(f"Bot worker {i} exited (code {process.exitcode}); restarting it")
+            self.restarts[i] += 1
+            self._spawn(i)
+
+    def fetch_health(self, saved_status):
+        """The workers' fetch health (see sources.get_fetch_health) as one bot's: the most
+        recent success of any worker, and a degraded active source if any worker is on one.
+        A worker with no fetches yet (or no monitors) doesn't count against the others."""
+        reports = [
+            (saved_status.get('shards') or {}).get(str(i), {}).get('fetch_health') or {} for i in range(self.count)
+        ]
+        successes = [r['last_fetch_success_ts'] for r in reports if r.get('last_fetch_success_ts')]
+        actives = [r['active_source'] for r in reports if r.get('active_source')]
+        degraded = [a for a in actives if a != 'oauth']
+        return {
+            'last_fetch_success_ts': max(successes) if successes else None,
+            'active_source': (degraded or actives or [None])[0],
+        }
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'workers': [
+                {
+                    'index': i,
+                    'pid': process.pid if process else None,
+                    'alive': bool(process and process.is_alive()),
+                    'restarts': self.restarts[i],
+                }
+                for i, process in enumerate(self.processes)
+            ],
+        }
+
+    def stop(self, timeout=10):
+        """SIGTERM every worker (each saves its state on the way out), then wait for them."""
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            if process is not None:
+                process.join(max(0.0, deadline - time.monotonic()))
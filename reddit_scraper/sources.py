@@ -3,8 +3,18 @@
 Posts/comments are fetched through several pathways, tried in the configured order
 (see config.get_source_order). A source that errors or returns nothing is put on a
 short cooldown so we don't keep hammering a blocked endpoint.
+
+Outcomes are also tracked per (source, subreddit). The source that last served a
+subreddit is tried first for it (for up to SOURCE_AFFINITY_SECONDS, after which the
+configured order gets another chance). A failure that is about the subreddit rather
+than the source - Reddit's 403/404 with a `reason` of private, quarantined, banned... -
+raises SubredditUnavailable and never cools the source down for everyone: a subreddit
+that is gone (banned / doesn't exist) is negatively cached for every source, one that is
+merely closed to this source (private, quarantined) is skipped on that source only.
 """
 
+import contextlib
+import contextvars
 import html
 import logging
 import os
@@ -12,11 +22,12 @@ import re
 import threading
 import time
 import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
 from urllib.parse import urlparse
 
 import requests
 
-from . import config, notifications, status
+from . import config, credentials, diskcache, events, filestore, metrics, notifications, status
 
 ATOM_NS = {'a': 'http://www.w3.org/2005/Atom'}
 RSS_USER_AGENT = os.getenv(
@@ -31,7 +42,7 @@ JSON_USER_AGENT = (
 # --- Tuning knobs (config; read from env once, overridable in tests) ---
 SOURCE_COOLDOWN_SECONDS = int(os.getenv('SOURCE_COOLDOWN_SECONDS', '300'))  # base cooldown
 SOURCE_COOLDOWN_MAX = int(os.getenv('SOURCE_COOLDOWN_MAX_SECONDS', '3600'))  # cap on backoff
-RSS_MIN_INTERVAL = float(os.getenv('RSS_MIN_INTERVAL_SECONDS', '4'))  # min gap between RSS reqs
+RSS_MIN_INTERVAL = float(os.getenv('RSS_MIN_INTERVAL_SECONDS', '4'))  # min gap between RSS reqs, per egress IP
 
 
 # Optional proxying so the anonymous RSS/JSON endpoints aren't all hit from one IP
@@ -51,6 +62,19 @@ def _parse_proxies():
 _PROXIES = _parse_proxies()
 PROXY_COOLDOWN_SECONDS = int(os.getenv('PROXY_COOLDOWN_SECONDS', '120'))
 
+# Proxies are picked by health, not in strict rotation: each keeps an EWMA of its request
+# latency and of how often it gets blocked (403/429), and gets a share of traffic
+# proportional to (1 - block rate) / latency. A proxy blocked PROXY_BLOCKS_BEFORE_COOLDOWN
+# times in a row is cooled down like one that can't connect. A background prober tries each
+# cooled-down proxy against PROXY_PROBE_URL (a one-post listing, judged like a real fetch)
+# shortly before its cooldown ends: a proxy still blocked or unreachable is cooled down
+# again instead of being handed real fetches to find that out.
+PROXY_EWMA_ALPHA = float(os.getenv('PROXY_EWMA_ALPHA', '0.3'))
+PROXY_BLOCKS_BEFORE_COOLDOWN = int(os.getenv('PROXY_BLOCKS_BEFORE_COOLDOWN', '3'))
+PROXY_PROBE_INTERVAL = float(os.getenv('PROXY_PROBE_INTERVAL_SECONDS', '30'))
+PROXY_PROBE_URL = os.getenv('PROXY_PROBE_URL', 'https://www.reddit.com/r/popular/new.json?limit=1')
+_MIN_PROXY_WEIGHT = 0.02  # share floor relative to the best proxy, so a bad one can recover
+
 # Sylvia (api.sylvia-api.com) is a third-party Reddit gateway that returns native-Reddit-
 # shaped JSON from Sylvia's own IP (so it doubles as IP hiding) and, unlike RSS, carries
 # full post data (score/domain/flair). It's authenticated with an API key and is billed
@@ -60,21 +84,163 @@ SYLVIA_API_KEY = os.getenv('SYLVIA_API_KEY')
 SYLVIA_BASE_URL = os.getenv('SYLVIA_BASE_URL', 'https://api.sylvia-api.com/v1/reddit').rstrip('/')
 SYLVIA_TIMEOUT = float(os.getenv('SYLVIA_TIMEOUT_SECONDS', '15'))
 
+# Cost planner. With a daily budget set, paid sources (config.PAID_SOURCES) go last for
+# ordinary monitors, so they're only billed when every free source has failed, and stay
+# where the order puts them for monitors flagged `urgent`. Ordinary monitors may spend
+# only the part of the budget not held back by SYLVIA_URGENT_RESERVE; once the day's
+# successful paid requests reach the budget, paid sources are skipped until UTC midnight.
+# Unset/0 -> no budget and no reordering.
+SYLVIA_DAILY_BUDGET = int(os.getenv('SYLVIA_DAILY_BUDGET', '0') or 0)
+SYLVIA_URGENT_RESERVE = float(os.getenv('SYLVIA_URGENT_RESERVE', '0.2'))  # share kept for urgent monitors
+
 # Short-lived response cache so concurrent monitors covering the same subreddit/thread
 # share a single network request instead of each issuing its own (which both wastes
 # requests and trips rate limits). TTL only needs to span one scheduling burst.
 FETCH_CACHE_TTL = float(os.getenv('FETCH_CACHE_TTL_SECONDS', '90'))
+# Optional on-disk copy of that cache (see diskcache), read once at startup so a restarted
+# bot reuses listings fetched within the last RESPONSE_CACHE_TTL seconds instead of
+# re-fetching every subreddit (paid Sylvia and throttled RSS included). 0 -> off.
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '0'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+
+SOURCE_AFFINITY_SECONDS = float(os.getenv('SOURCE_AFFINITY_SECONDS', '1800'))  # how long a sub sticks to a source
+UNAVAILABLE_SUBREDDIT_SECONDS = float(os.getenv('UNAVAILABLE_SUBREDDIT_SECONDS', '21600'))  # negative-cache TTL
+# Reddit `reason`s meaning no source will ever get the listing; anything else is per source.
+GONE_REASONS = frozenset({'banned', 'not_found'})
+
+
+class SubredditUnavailable(RuntimeError):
+    """A fetch failed because of the subreddit itself (private, banned, missing...), not
+    because the source is blocked or down."""
+
+    def __init__(self, subreddit, reason):
+        super().__init__(f"r/{subreddit} is unavailable ({reason})")
+        self.subreddit = subreddit
+        self.reason = reason
+
+
+class DeadlineExceeded(TimeoutError):
+    """The current run's deadline (see run_deadline) passed before its fetch finished.
+    Never held against a source: the run was out of time, not the source out of order."""
+
+
+# time.monotonic() the current monitor run must be done fetching by (None = unbounded).
+# A ContextVar, so each lane worker thread carries its own run's deadline.
+_deadline = contextvars.ContextVar('fetch_deadline', default=None)
+
+
+@contextlib.contextmanager
+def run_deadline(seconds):
+    """Bound every fetch made inside the block to `seconds` in total (None/0 -> unbounded).
+    Each HTTP request's timeout shrinks to the time left, RSS throttle waits and waits on
+    another caller's coalesced fetch give up once it would pass, and a source chain that
+    runs out of time raises DeadlineExceeded instead of trying the next source. PRAW
+    (oauth) keeps its own timeout, so it's only checked before the attempt."""
+    token = _deadline.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _time_left():
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _check_deadline():
+    left = _time_left()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("run deadline passed")
+
+
+def _fit_timeout(timeout):
+    """`timeout` shrunk to the current run's time left; raises once none is left."""
+    _check_deadline()
+    left = _time_left()
+    return timeout if left is None else min(timeout, left)
+
+
+def _timed_get(url, timeout, **kwargs):
+    """requests.get with `timeout` fitted to the run deadline. A timeout that only fired
+    because it was shrunk is the run running out of time, not the source or proxy failing,
+    so it surfaces as DeadlineExceeded (which nothing penalises)."""
+    fitted = _fit_timeout(timeout)
+    try:
+        return requests.get(url, timeout=fitted, **kwargs)
+    except requests.exceptions.Timeout as e:
+        if fitted < timeout:
+            raise DeadlineExceeded(f"request timed out at the run deadline ({fitted:.1f}s left)") from e
+        raise
+
+
+def _subreddit_reason(response):
+    """Reddit's reason a subreddit listing was refused, or None when a 403/404 looks like
+    the source being blocked. Reddit answers e.g. 403 {"reason": "private"} or
+    404 {"reason": "banned"}; a bare 404 on a listing means the subreddit doesn't exist."""
+    if response.status_code not in (403, 404):
+        return None
+    try:
+        reason = response.json().get('reason')
+    except (ValueError, AttributeError):
+        reason = None
+    if reason:
+        return str(reason)
+    return 'not_found' if response.status_code == 404 else None
+
+
+def _raise_if_subreddit_unavailable(response, subreddit):
+    reason = _subreddit_reason(response)
+    if reason:
+        raise SubredditUnavailable(subreddit, reason)
+
+
+class _ProxyHealth:
+    """EWMA latency / block rate for one proxy, plus its smooth-weighted-round-robin credit."""
+
+    __slots__ = ('latency', 'block_rate', 'blocks_in_row', 'credit')
+
+    def __init__(self):
+        self.latency = None  # seconds; None until the first response
+        self.block_rate = 0.0
+        self.blocks_in_row = 0
+        self.credit = 0.0
+
+    def record(self, latency, blocked):
+        if latency is not None:
+            self.latency = latency if self.latency is None else _ewma(self.latency, latency)
+        self.block_rate = _ewma(self.block_rate, 1.0 if blocked else 0.0)
+        self.blocks_in_row = self.blocks_in_row + 1 if blocked else 0
+
+    def weight(self, default_latency):
+        return (1.0 - self.block_rate) / max(self.latency or default_latency, 0.05)
+
+
+def _ewma(current, sample):
+    return PROXY_EWMA_ALPHA * sample + (1 - PROXY_EWMA_ALPHA) * current
+
+
+def _found(value):
+    """Whether a fetch result is worth persisting: not a failure (None, or (None, None)
+    from fetch_posts when every source failed)."""
+    return value is not None and not (isinstance(value, tuple) and value[0] is None)
+
+
+def _utc_day(ts=None):
+    return datetime.fromtimestamp(time.time() if ts is None else ts, timezone.utc).strftime('%Y-%m-%d')
 
 
 class _SourceState:
     """Mutable runtime state behind the fetch dispatcher: the fetch-success heartbeat,
-    the active source, source cooldowns + exponential backoff, the coalescing cache,
-    proxy rotation, the RSS throttle clock, and one-time-notification flags.
+    the active source, source cooldowns + exponential backoff, per-subreddit source
+    affinity and negative cache, the coalescing cache, proxy rotation, the per-egress-IP
+    RSS throttle clocks, and one-time-notification flags.
 
     A single module-level instance (`_state`) owns it; the module-level functions below
     are a thin facade over it, so callers and tests don't reach into individual fields.
-    Tuning knobs (SOURCE_COOLDOWN_*, RSS_MIN_INTERVAL, FETCH_CACHE_TTL,
-    PROXY_COOLDOWN_SECONDS, _PROXIES, SYLVIA_API_KEY) stay module-level config, read here
+    Tuning knobs (SOURCE_COOLDOWN_*, RSS_MIN_INTERVAL, FETCH_CACHE_TTL, RESPONSE_CACHE_TTL,
+    PROXY_COOLDOWN_SECONDS, SOURCE_AFFINITY_SECONDS, UNAVAILABLE_SUBREDDIT_SECONDS,
+    _PROXIES, SYLVIA_API_KEY) stay module-level config, read here
     by name so tests can still override them.
     """
 
@@ -91,19 +257,31 @@ class _SourceState:
         self.source_failures = {}  # source -> consecutive failure count (for backoff)
         self._lock = threading.Lock()
 
-        self.rss_last_request = 0.0  # RSS is per-IP rate-limited; serialize with a gap
-        self._rss_lock = threading.Lock()
+        self.rss_next_free = {}  # egress proxy (None = direct) -> epoch its next RSS request may go out
+        self.shared = None  # shards.SharedBudgets when this is one worker of a sharded bot
 
-        self.proxy_index = 0  # round-robin cursor over _PROXIES
+        self.proxy_health = {}  # proxy -> _ProxyHealth
         self.proxy_cooldown_until = {}  # proxy -> epoch until which it is skipped
         self._proxy_lock = threading.Lock()
 
+        self.subreddit_profiles = {}  # subreddit -> what its monitors need (max_age_hours)
+        self.subreddit_affinity = {}  # subreddit -> (source that last served it, since epoch)
+        self.subreddit_blocked = {}  # (source | None, subreddit) -> (reason, until epoch); None = all
+
         self.fetch_cache = {}  # coalesce key -> (timestamp, value)
         self.key_locks = {}  # coalesce key -> Lock (callers share, not stampede)
         self._cache_lock = threading.Lock()
+        self.disk_cache = None  # diskcache.DiskCache once opened (bot only)
+        self.warm = {}  # coalesce key -> (timestamp, value) loaded from disk, each used at most once
 
         self.sylvia_key_warned = False  # so the "no Sylvia key" skip logs once
 
+        self.usage_date = _utc_day()  # UTC day the counts below belong to
+        self.usage = {}  # source -> {'requests': n, 'successes': n} today
+        self.budget_warned = None  # (day, urgent) the "budget spent" warning last logged for
+
+        self.last_persisted = None  # persisted_snapshot() last written to source_state.json
+
     # --- fetch-success heartbeat / active source ---
     def record_fetch_success(self):
         self.last_fetch_success_ts = time.time()
@@ -116,7 +294,9 @@ class _SourceState:
             # "Fallback" = a degraded source (no score/domain), not merely "not oauth" — so
             # the Sylvia gateway isn't wrongly flagged as a fallback. See config.RICH_SOURCES.
             using_fallback = not config.supports_rich_filters(source)
-            status.save_bot_status(using_fallback, f"Active data source: {source}", active_source=source)
+            if self.shared is None:  # a sharded bot's workers leave this to the coordinator
+                status.save_bot_status(using_fallback, f"Active data source: {source}", active_source=source)
+            events.publish('status', active_source=source, using_fallback=using_fallback)
 
     # --- one-time OAuth-failure notification guard ---
     def claim_auth_error_notification(self):
@@ -162,59 +342,333 @@ class _SourceState:
         with self._lock:
             self.source_failures[name] = 0
 
+    # --- per-subreddit affinity + negative cache ---
+    def sources_for(self, subreddit, order):
+        """`order` for one subreddit: its affinity source first, minus sources that can't
+        serve it. Empty if the subreddit is negatively cached as gone."""
+        now = time.time()
+        with self._lock:
+            if self._blocked(None, subreddit, now):
+                return []
+            order = [s for s in order if not self._blocked(s, subreddit, now)]
+            source, since = self.subreddit_affinity.get(subreddit, (None, 0))
+            if source in order and now - since < SOURCE_AFFINITY_SECONDS:
+                order.remove(source)
+                order.insert(0, source)
+        return order
+
+    def _blocked(self, source, subreddit, now):
+        entry = self.subreddit_blocked.get((source, subreddit))
+        if entry and entry[1] <= now:
+            del self.subreddit_blocked[(source, subreddit)]
+            return False
+        return entry is not None
+
+    def unavailable_reason(self, subreddit):
+        """Why a subreddit is negatively cached as gone, or None."""
+        with self._lock:
+            return self.subreddit_blocked[(None, subreddit)][0] if self._blocked(None, subreddit, time.time()) else None
+
+    def note_subreddit_source(self, subreddit, source):
+        """A source just served subreddit: prefer it for that subreddit from now on."""
+        with self._lock:
+            if self.subreddit_affinity.get(subreddit, (None,))[0] != source:
+                self.subreddit_affinity[subreddit] = (source, time.time())
+            self.subreddit_blocked.pop((source, subreddit), None)
+
+    def mark_subreddit_unavailable(self, source, subreddit, reason):
+        """Negatively cache a subreddit-specific failure: for every source when the
+        subreddit is gone, otherwise for `source` only. Returns True the first time."""
+        key = (None if reason in GONE_REASONS else source, subreddit)
+        with self._lock:
+            first = key not in self.subreddit_blocked
+            self.subreddit_blocked[key] = (reason, time.time() + UNAVAILABLE_SUBREDDIT_SECONDS)
+            if self.subreddit_affinity.get(subreddit, (None,))[0] == source:
+                self.subreddit_affinity.pop(subreddit, None)
+        return first
+
+    # --- budgets shared between the workers of a sharded bot (see shards) ---
+    def attach_shared(self, shared):
+        """Take the RSS clocks (and the lock guarding them) and the paid-request counts
+        from shared memory, since every worker goes out through the same IPs and spends
+        the same budget."""
+        self.shared = shared
+        self.rss_next_free = shared.rss_clocks
+        self._proxy_lock = shared.lock
+
+    # --- persistence across restarts (see save_source_state) ---
+    def persisted_snapshot(self):
+        """What a restart should remember: source cooldowns and backoff, the active source,
+        the subreddit negative cache and proxy cooldowns. Deadlines are wall-clock epochs."""
+        with self._lock:
+            snapshot = {
+                'active_source': self.active_source,
+                'source_cooldown_until': dict(self.source_cooldown_until),
+                'source_failures': {s: n for s, n in self.source_failures.items() if n},
+                'subreddit_blocked': [
+                    [source, sub, reason, until] for (source, sub), (reason, until) in self.subreddit_blocked.items()
+                ],
+            }
+        with self._proxy_lock:
+            snapshot['proxy_cooldown_until'] = dict(self.proxy_cooldown_until)
+        return snapshot
+
+    def restore_persisted(self, saved):
+        """Load a persisted_snapshot() taken at `saved['saved_at']`. Deadlines already past
+        are dropped and the rest are capped at their knob's maximum (so a clock that jumped,
+        or a knob lowered since, can't pin a source down). Failure counts older than one
+        maximum backoff are dropped, since a source idle that long gets a clean slate."""
+        now = time.time()
+
+        def pending(deadlines, longest):
+            return {k: min(until, now + longest) for k, until in deadlines.items() if until > now}
+
+        with self._lock:
+            self.active_source = saved.get('active_source')
+            self.source_cooldown_until = pending(saved.get('source_cooldown_until') or {}, SOURCE_COOLDOWN_MAX)
+            if now - saved.get('saved_at', 0) < SOURCE_COOLDOWN_MAX:
+                self.source_failures = dict(saved.get('source_failures') or {})
+            for source, sub, reason, until in saved.get('subreddit_blocked') or []:
+                if until > now:
+                    self.subreddit_blocked[(source, sub)] = (reason, min(until, now + UNAVAILABLE_SUBREDDIT_SECONDS))
+        with self._proxy_lock:
+            cooling = pending(saved.get('proxy_cooldown_until') or {}, PROXY_COOLDOWN_SECONDS)
+            self.proxy_cooldown_until = {p: until for p, until in cooling.items() if p in _PROXIES}
+
+    # --- per-source daily usage (the planner's budget input) ---
+    def _roll_day(self):
+        today = _utc_day()
+        if today != self.usage_date:
+            self.usage_date, self.usage = today, {}
+
+    def count_request(self, source, ok):
+        with self._lock:
+            self._roll_day()
+            counts = self.usage.setdefault(source, {'requests': 0, 'successes': 0})
+            counts['requests'] += 1
+            counts['successes'] += bool(ok)
+        if ok and self.shared is not None and source in config.PAID_SOURCES:
+            self.shared.add_paid(source)
+
+    def spent(self, source):
+        """Successful (billed) requests to `source` today, across all workers when sharded."""
+        if self.shared is not None and source in config.PAID_SOURCES:
+            return self.shared.paid_spent(source)
+        with self._lock:
+            self._roll_day()
+            return self.usage.get(source, {}).get('successes', 0)
+
+    def restore_usage(self, saved):
+        """Seed today's counts from a saved usage snapshot, so a restart doesn't reset the
+        budget. Snapshots from another day are ignored."""
+        if not saved or saved.get('date') != _utc_day():
+            return
+        with self._lock:
+            self.usage_date = saved['date']
+            self.usage = {source: dict(counts) for source, counts in (saved.get('sources') or {}).items()}
+
+    def usage_snapshot(self):
+        with self._lock:
+            self._roll_day()
+            return {'date': self.usage_date, 'sources': {s: dict(c) for s, c in self.usage.items()}}
+
     # --- coalescing cache ---
+    def open_disk_cache(self, cache):
+        """Persist produced values to `cache` and keep what it already holds for warm start."""
+        warm = cache.load()
+        with self._cache_lock:
+            self.disk_cache, self.warm = cache, warm
+        return len(warm)
+
+    def _take_warm(self, key, now):
+        """The value read from disk for key if still fresh, at most once: after that, the
+        in-memory TTL alone decides, so a running bot never serves older data than before."""
+        with self._cache_lock:
+            entry = self.warm.pop(key, None)
+            if entry is None or now - entry[0] >= RESPONSE_CACHE_TTL:
+                return None
+            self.fetch_cache[key] = entry
+            return entry
+
     def coalesce(self, key, producer):
         """Return a cached fresh value for key, or produce + cache it. Concurrent callers
-        for the same key wait on a per-key lock and share the single result."""
+        for the same key wait on a per-key lock and share the single result. A value that
+        found something is also appended to the disk cache, if one is open."""
         now = time.time()
         with self._cache_lock:
             entry = self.fetch_cache.get(key)
             if entry and now - entry[0] < FETCH_CACHE_TTL:
+                metrics.FETCH_CACHE.inc(result='hit')
                 return entry[1]
             key_lock = self.key_locks.setdefault(key, threading.Lock())
 
-        with key_lock:
+        left = _time_left()
+        if not key_lock.acquire(timeout=-1 if left is None else max(0.0, left)):
+            raise DeadlineExceeded("run deadline passed waiting for a shared fetch")
+        try:
             # Re-check inside the per-key lock: another thread may have just produced it.
             now = time.time()
             with self._cache_lock:
                 entry = self.fetch_cache.get(key)
                 if entry and now - entry[0] < FETCH_CACHE_TTL:
+                    metrics.FETCH_CACHE.inc(result='hit')
                     return entry[1]
+            entry = self._take_warm(key, now)
+            if entry:
+                metrics.FETCH_CACHE.inc(result='disk')
+                return entry[1]
+            metrics.FETCH_CACHE.inc(result='miss')
             value = producer()
+            produced_at = time.time()
             with self._cache_lock:
-                self.fetch_cache[key] = (time.time(), value)
+                self.fetch_cache[key] = (produced_at, value)
+                disk_cache = self.disk_cache
+            if disk_cache is not None and _found(value):
+                disk_cache.put(key, value, produced_at)
             return value
+        finally:
+            key_lock.release()
 
-    # --- RSS throttle ---
-    def rss_throttle(self):
-        """Block until at least RSS_MIN_INTERVAL seconds have passed since the last RSS request."""
-        with self._rss_lock:
-            wait = RSS_MIN_INTERVAL - (time.time() - self.rss_last_request)
-            if wait > 0:
-                time.sleep(wait)
-            self.rss_last_request = time.time()
+    def forget_subreddit(self, subreddit):
+        """Drop cached fetches, per-key locks, the profile, source affinity and negative
+        cache entries for a subreddit no monitor watches anymore."""
+        with self._cache_lock:
+            for key in [k for k in self.key_locks if k[1] == subreddit]:
+                self.fetch_cache.pop(key, None)
+                self.key_locks.pop(key, None)
+            for key in [k for k in self.warm if k[1] == subreddit]:
+                del self.warm[key]
+            self.subreddit_profiles.pop(subreddit, None)
+        with self._lock:
+            self.subreddit_affinity.pop(subreddit, None)
+            for key in [k for k in self.subreddit_blocked if k[1] == subreddit]:
+                del self.subreddit_blocked[key]
+
+    # --- per-subreddit profile (set by the scheduler from the monitors watching it) ---
+    def set_subreddit_profile(self, subreddit, **fields):
+        with self._cache_lock:
+            self.subreddit_profiles[subreddit] = {**self.subreddit_profiles.get(subreddit, {}), **fields}
+
+    def age_cutoff(self, subreddit):
+        """Epoch before which posts in subreddit are too old for every monitor watching it,
+        or None when no window is known (unsubscribed subreddit: keep everything)."""
+        hours = self.subreddit_profiles.get(subreddit, {}).get('max_age_hours')
+        return time.time() - hours * 3600 if hours else None
+
+    # --- RSS throttle (one bucket per egress IP) ---
+    def reserve_rss_slot(self):
+        """Reserve the earliest RSS slot across egress IPs: (proxy, epoch it may go out).
+
+        RSS is rate-limited per IP, so each proxy (or the direct connection when none is
+        configured) has its own RSS_MIN_INTERVAL bucket. The proxy whose bucket frees up
+        first wins, ties going to the healthiest (see _weighted_pick). Returns (None, None) if every proxy is cooling
+        down. The caller sleeps until the slot outside any lock, so requests through
+        different proxies run in parallel."""
+        now = time.time()
+        with self._proxy_lock:
+            if not _PROXIES:
+                at = max(now, self.rss_next_free.get(None, 0))
+                self.rss_next_free[None] = at + RSS_MIN_INTERVAL
+                return None, at
+            free_at = {p: max(now, self.rss_next_free.get(p, 0)) for p in self._live_proxies(now)}
+            if not free_at:
+                return None, None
+            at = min(free_at.values())
+            proxy = self._weighted_pick([p for p, t in free_at.items() if t == at])
+            self.rss_next_free[proxy] = at + RSS_MIN_INTERVAL
+            return proxy, at
+
+    def release_rss_slot(self, proxy, at):
+        """Give back a reserve_rss_slot slot that won't be used, unless a later reservation
+        on the same egress IP is already queued behind it."""
+        with self._proxy_lock:
+            if self.rss_next_free.get(proxy, 0) == at + RSS_MIN_INTERVAL:
+                self.rss_next_free[proxy] = at
+
+    # --- health-weighted proxy selection ---
+    def _live_proxies(self, now):
+        return [p for p in _PROXIES if self.proxy_cooldown_until.get(p, 0) <= now]
+
+    def _health(self, proxy):
+        health = self.proxy_health.get(proxy)
+        if health is None:
+            health = self.proxy_health[proxy] = _ProxyHealth()
+        return health
+
+    def _weighted_pick(self, candidates):
+        """Smooth weighted round-robin (as in nginx) over candidates: deterministic, spreads
+        picks evenly, and equal weights reduce to plain rotation. Call under _proxy_lock."""
+        healths = [self._health(p) for p in candidates]
+        known = sorted(h.latency for h in healths if h.latency is not None)
+        default_latency = known[len(known) // 2] if known else 1.0  # unknown proxies count as typical
+        weights = [h.weight(default_latency) for h in healths]
+        floor = max(weights) * _MIN_PROXY_WEIGHT
+        weights = [max(w, floor, 1e-9) for w in weights]
+        for h, w in zip(healths, weights):
+            h.credit += w
+        best = max(range(len(candidates)), key=lambda i: healths[i].credit)
+        healths[best].credit -= sum(weights)
+        return candidates[best]
 
-    # --- proxy rotation ---
     def next_proxy(self):
-        """Round-robin the next proxy that isn't cooling down, or None if all are (or none set)."""
+        """Health-weighted pick of a proxy that isn't cooling down, or None if all are (or none set)."""
         if not _PROXIES:
             return None
-        now = time.time()
         with self._proxy_lock:
-            n = len(_PROXIES)
-            for _ in range(n):
-                i = self.proxy_index % n
-                self.proxy_index = (i + 1) % n
-                proxy = _PROXIES[i]
-                if self.proxy_cooldown_until.get(proxy, 0) <= now:
-                    return proxy
-            return None
+            live = self._live_proxies(time.time())
+            return self._weighted_pick(live) if live else None
+
+    def record_proxy_result(self, proxy, latency, blocked):
+        """Fold one response through `proxy` into its health; a proxy blocked too many times
+        in a row is cooled down (the prober checks it before it comes back)."""
+        with self._proxy_lock:
+            health = self._health(proxy)
+            health.record(latency, blocked)
+            cool = blocked and health.blocks_in_row >= PROXY_BLOCKS_BEFORE_COOLDOWN
+            if cool:
+                self.proxy_cooldown_until[proxy] = time.time() + PROXY_COOLDOWN_SECONDS
+        if cool:
+            logging.warning(f"Proxy {_redact_proxy(proxy)} blocked {health.blocks_in_row}x in a row; cooling down")
 
     def mark_proxy_down(self, proxy):
         """Skip a proxy that failed to connect for a short while, then let it back in."""
         with self._proxy_lock:
+            self._health(proxy).record(None, blocked=True)
             self.proxy_cooldown_until[proxy] = time.time() + PROXY_COOLDOWN_SECONDS
 
+    def proxies_due_back(self, within):
+        """Cooling proxies whose cooldown ends within `within` seconds (the ones to probe)."""
+        now = time.time()
+        with self._proxy_lock:
+            return [p for p in _PROXIES if now < self.proxy_cooldown_until.get(p, 0) <= now + within]
+
+    def probe_passed(self, proxy, latency):
+        """A probe got through: forget the block streak, so the proxy rejoins at full
+        weight when its cooldown ends (not before: one good probe isn't proof)."""
+        with self._proxy_lock:
+            health = self._health(proxy)
+            health.record(latency, blocked=False)
+            health.credit = 0.0
+
+    def cooling_proxies(self):
+        now = time.time()
+        with self._proxy_lock:
+            return [p for p in _PROXIES if self.proxy_cooldown_until.get(p, 0) > now]
+
+    def proxy_snapshot(self):
+        """Per-proxy health for bot_status.json (credentials redacted)."""
+        now = time.time()
+        with self._proxy_lock:
+            result = {}
+            for proxy in _PROXIES:
+                health = self.proxy_health.get(proxy) or _ProxyHealth()
+                result[_redact_proxy(proxy)] = {
+                    'latency_ms': None if health.latency is None else round(health.latency * 1000),
+                    'block_rate': round(health.block_rate, 3),
+                    'cooling_down': self.proxy_cooldown_until.get(proxy, 0) > now,
+                }
+            return result
+
 
 _state = _SourceState()
 
@@ -235,6 +689,12 @@ def get_active_source():
     return _state.active_source
 
 
+def get_fetch_health():
+    """This process's input to the Kuma heartbeats (see health): a worker of a sharded bot
+    reports it in its status section, and the coordinator sends the heartbeats."""
+    return {'last_fetch_success_ts': _state.last_fetch_success_ts, 'active_source': _state.active_source}
+
+
 def _claim_auth_error_notification():
     return _state.claim_auth_error_notification()
 
@@ -259,12 +719,161 @@ def _coalesce(key, producer):
     return _state.coalesce(key, producer)
 
 
+def save_source_state():
+    """Write the state a restart should keep (see _SourceState.persisted_snapshot) to
+    source_state.json, skipping the write when nothing changed since the last one."""
+    snapshot = _state.persisted_snapshot()
+    if snapshot == _state.last_persisted:
+        return
+    try:
+        filestore.write_json_atomic(config.get_source_state_path(), {**snapshot, 'saved_at': time.time()})
+    except OSError as e:
+        logging.error(f"Failed to save source state: {e}")
+        return
+    _state.last_persisted = snapshot
+
+
+def restore_source_state():
+    """Resume the cooldowns/backoff saved by the previous run, so a restart doesn't
+    immediately hit a source that was blocked when it stopped."""
+    saved = filestore.read_json(config.get_source_state_path())
+    if not saved:
+        return
+    _state.restore_persisted(saved)
+    cooling = {s: int(until - time.time()) for s, until in _state.source_cooldown_until.items()}
+    if cooling:
+        logging.info(f"Resuming source cooldowns from before restart: {cooling} (seconds left)")
+
+
+def use_shared_budgets(shared):
+    _state.attach_shared(shared)
+
+
+def open_response_cache():
+    """Open the on-disk response cache (see RESPONSE_CACHE_TTL) if enabled; returns how many
+    fresh listings it held, for the startup log."""
+    if RESPONSE_CACHE_TTL <= 0:
+        return 0
+    cache = diskcache.DiskCache(config.get_response_cache_path(), RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+    return _state.open_disk_cache(cache)
+
+
+def _sources_for(subreddit, urgent=False):
+    return _plan(_state.sources_for(subreddit, config.get_source_order()), urgent)
+
+
+def _paid_allowance(urgent):
+    """How many paid requests today a monitor of this priority may bring the total to."""
+    return SYLVIA_DAILY_BUDGET if urgent else int(SYLVIA_DAILY_BUDGET * (1 - SYLVIA_URGENT_RESERVE))
+
+
+def _plan(order, urgent=False):
+    """Apply the daily paid-request budget to a source order (see SYLVIA_DAILY_BUDGET):
+    paid sources last for ordinary monitors, dropped once their allowance is spent."""
+    if not SYLVIA_DAILY_BUDGET:
+        return order
+    paid = [s for s in order if s in config.PAID_SOURCES]
+    if not paid:
+        return order
+    free = [s for s in order if s not in config.PAID_SOURCES]
+    if max(_state.spent(s) for s in paid) >= _paid_allowance(urgent):
+        key = (_state.usage_date, urgent)
+        if _state.budget_warned != key:
+            _state.budget_warned = key
+            who = 'urgent monitors' if urgent else 'non-urgent monitors'
+            logging.warning(f"Daily paid-request budget used up for {who}; using free sources only until UTC midnight")
+        return free
+    return order if urgent else free + paid
+
+
+def get_source_usage():
+    """Today's request counts per source plus the paid-request budget and the spend
+    forecast for the day (linear in the time elapsed since UTC midnight), for /api/status."""
+    snapshot = _state.usage_snapshot()
+    spent = sum(_state.spent(s) for s in config.PAID_SOURCES)
+    now = time.time()
+    day_fraction = max((now % 86400) / 86400, 1 / 1440)  # at least a minute in, so it's not inflated
+    snapshot['paid'] = {
+        'budget': SYLVIA_DAILY_BUDGET or None,
+        'spent': spent,
+        'remaining': max(0, SYLVIA_DAILY_BUDGET - spent) if SYLVIA_DAILY_BUDGET else None,
+        'forecast': round(spent / day_fraction),
+        'non_urgent_exhausted': bool(SYLVIA_DAILY_BUDGET) and spent >= _paid_allowance(False),
+        'exhausted': bool(SYLVIA_DAILY_BUDGET) and spent >= SYLVIA_DAILY_BUDGET,
+    }
+    return snapshot
+
+
+def restore_source_usage(saved):
+    _state.restore_usage(saved)
+
+
+def get_unavailable_reason(subreddit):
+    """Why a subreddit is negatively cached as gone (e.g. 'banned'), or None."""
+    return _state.unavailable_reason(subreddit)
+
+
+def _note_subreddit_source(subreddit, source):
+    _state.note_subreddit_source(subreddit, source)
+
+
+def _mark_subreddit_unavailable(source, e):
+    """Record a SubredditUnavailable from `source` (see _SourceState.mark_subreddit_unavailable)."""
+    if not _state.mark_subreddit_unavailable(source, e.subreddit, e.reason):
+        return
+    if e.reason in GONE_REASONS:
+        hours = UNAVAILABLE_SUBREDDIT_SECONDS / 3600
+        logging.warning(f"r/{e.subreddit} is {e.reason}; not fetching it for {hours:g}h")
+        notifications.notify_error(f"r/{e.subreddit} is unavailable ({e.reason}); check the monitors watching it.")
+    else:
+        logging.warning(f"r/{e.subreddit} is {e.reason} to source '{source}'; using other sources for it")
+
+
+def forget_subreddit(subreddit):
+    _state.forget_subreddit(subreddit)
+
+
+def set_subreddit_profile(subreddit, **fields):
+    _state.set_subreddit_profile(subreddit, **fields)
+
+
+def _age_cutoff(subreddit):
+    return _state.age_cutoff(subreddit)
+
+
+def _past_cutoff(post, cutoff):
+    """True once a new-sorted listing reaches a post older than cutoff; the rest are older
+    still, so the fetcher stops parsing there. Posts without a timestamp never stop it."""
+    return cutoff is not None and bool(post.get('created_utc')) and post['created_utc'] < cutoff
+
+
 def _set_active_source(source):
     _state.set_active_source(source)
 
 
-def _rss_throttle():
-    _state.rss_throttle()
+def _next_rss_proxy():
+    """Wait for the earliest free RSS slot and return its proxy (None = direct, or no
+    proxy available when a pool is configured)."""
+    _check_deadline()
+    proxy, at = _state.reserve_rss_slot()
+    if at is not None and at > time.time():
+        wait = at - time.time()
+        left = _time_left()
+        if left is not None and wait >= left:
+            _state.release_rss_slot(proxy, at)  # leave it to a run that can wait for it
+            raise DeadlineExceeded(f"next RSS slot is {wait:.0f}s away, past the run deadline")
+        time.sleep(wait)
+    return proxy
+
+
+def _record_request(source, kind, started, ok):
+    """Count one fetch attempt against a source and its latency (see metrics), and in
+    today's per-source usage (see _plan)."""
+    _state.count_request(source, ok)
+    metrics.SOURCE_REQUESTS.inc(source=source, kind=kind)
+    metrics.SOURCE_LATENCY.observe(time.monotonic() - started, source=source, kind=kind)
+    if not ok:
+        metrics.SOURCE_ERRORS.inc(source=source, kind=kind)
 
 
 def _redact_proxy(proxy):
@@ -280,24 +889,85 @@ def _mark_proxy_down(proxy):
     _state.mark_proxy_down(proxy)
 
 
-def _http_get(url, headers, timeout=15):
+def get_proxy_health():
+    """{proxy (redacted): {latency_ms, block_rate, cooling_down}} for the status file."""
+    return _state.proxy_snapshot()
+
+
+def _proxy_blocked(response):
+    """A response that means the proxy's IP is being refused (not the subreddit)."""
+    return response.status_code == 429 or (response.status_code == 403 and _subreddit_reason(response) is None)
+
+
+def probe_proxies():
+    """Probe the cooled-down proxies due back within the next PROXY_PROBE_INTERVAL: one that
+    is still blocked (as judged for a real fetch) or can't connect is cooled down again."""
+    for proxy in _state.proxies_due_back(PROXY_PROBE_INTERVAL):
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                PROXY_PROBE_URL,
+                headers={'User-Agent': RSS_USER_AGENT},
+                timeout=10,
+                proxies={'http': proxy, 'https': proxy},
+            )
+        except requests.exceptions.RequestException as e:
+            logging.debug(f"Probe via {_redact_proxy(proxy)} failed: {e}; cooling down again")
+            _mark_proxy_down(proxy)
+            continue
+        if _proxy_blocked(response):
+            logging.info(f"Proxy {_redact_proxy(proxy)} still blocked ({response.status_code}); cooling down again")
+            _mark_proxy_down(proxy)
+            continue
+        _state.probe_passed(proxy, time.monotonic() - started)
+        logging.info(f"Proxy {_redact_proxy(proxy)} passed its probe; back in rotation when its cooldown ends")
+
+
+def start_proxy_prober(interval=None):
+    """Run probe_proxies every `interval` seconds (PROXY_PROBE_INTERVAL) in a daemon
+    thread. No-op (returns None) when no proxies are configured."""
+    if not _PROXIES:
+        return None
+    interval = PROXY_PROBE_INTERVAL if interval is None else interval
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                probe_proxies()
+            except Exception as e:
+                logging.error(f"Proxy prober failed: {e}")
+
+    threading.Thread(target=run, name='proxy-prober', daemon=True).start()
+    return stop
+
+
+def _http_get(url, headers, timeout=15, rss=False):
     """GET `url`, routed through a configured proxy when one is set.
 
     With no proxy configured this is a plain requests.get. With a pool, requests are
-    rotated across proxies and a proxy that fails to *connect* is cooled down and the
-    next one tried. If proxies are configured but all are cooling down we raise rather
+    spread across proxies by health (latency, block rate) and a proxy that fails to
+    *connect* is cooled down and the next one tried. If proxies are configured but all are cooling down we raise rather
     than fall back to a direct request, so IP hiding, once on, can't silently leak.
+    `rss=True` paces the request through its egress IP's RSS bucket (see
+    _SourceState.reserve_rss_slot) and picks the proxy that is free soonest.
     """
+    pick = _next_rss_proxy if rss else _next_proxy
     if not _PROXIES:
-        return requests.get(url, headers=headers, timeout=timeout)
+        if rss:
+            pick()
+        return _timed_get(url, timeout, headers=headers)
 
     last_err = None
     for _ in range(len(_PROXIES)):
-        proxy = _next_proxy()
+        proxy = pick()
         if proxy is None:
             break
+        started = time.monotonic()
         try:
-            return requests.get(url, headers=headers, timeout=timeout, proxies={'http': proxy, 'https': proxy})
+            response = _timed_get(url, timeout, headers=headers, proxies={'http': proxy, 'https': proxy})
+            _state.record_proxy_result(proxy, time.monotonic() - started, _proxy_blocked(response))
+            return response
         except (
             requests.exceptions.ProxyError,
             requests.exceptions.ConnectTimeout,
@@ -309,28 +979,36 @@ def _http_get(url, headers, timeout=15):
     raise last_err or RuntimeError("All configured proxies are cooling down")
 
 
+def _post_from_json(post_data):
+    """Normalize a native Reddit t3 `data` object (new.json / api/info.json) to a post dict."""
+    return {
+        'id': post_data.get('id', ''),
+        'title': post_data.get('title', ''),
+        'url': post_data.get('url', ''),
+        'score': post_data.get('score', 0),
+        'permalink': post_data.get('permalink', ''),
+        'domain': post_data.get('domain', ''),
+        'link_flair_text': post_data.get('link_flair_text', ''),
+        'author': post_data.get('author', ''),
+        'created_utc': post_data.get('created_utc'),
+    }
+
+
 def fetch_posts_json(subreddit, limit=10):
     """Fetch posts via the anonymous old.reddit.com JSON endpoint (mostly blocked now)."""
     url = f"https://old.reddit.com/r/{subreddit}/new.json?limit={limit}"
     try:
         response = _http_get(url, headers={'User-Agent': JSON_USER_AGENT})
+        _raise_if_subreddit_unavailable(response, subreddit)
         response.raise_for_status()
         data = response.json()
         posts = []
+        cutoff = _age_cutoff(subreddit)
         for child in data.get('data', {}).get('children', []):
             post_data = child.get('data', {})
-            posts.append(
-                {
-                    'id': post_data.get('id', ''),
-                    'title': post_data.get('title', ''),
-                    'url': post_data.get('url', ''),
-                    'score': post_data.get('score', 0),
-                    'permalink': post_data.get('permalink', ''),
-                    'domain': post_data.get('domain', ''),
-                    'link_flair_text': post_data.get('link_flair_text', ''),
-                    'author': post_data.get('author', ''),
-                }
-            )
+            if _past_cutoff(post_data, cutoff):
+                break
+            posts.append(_post_from_json(post_data))
         record_fetch_success()
         return posts
     except requests.exceptions.RequestException as e:
@@ -362,19 +1040,25 @@ def fetch_thread_comments_json(subreddit, thread_id, limit=500):
                     'author': d.get('author', ''),
                     'score': d.get('score', 0),
                     'permalink': d.get('permalink', ''),
+                    'created_utc': d.get('created_utc'),
                 }
             )
         return comments
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logging.error(f"Error fetching comments for thread {thread_id}: {e}")
         return None
 
 
-def _sylvia_get(path):
+def _sylvia_get(path, subreddit=None):
     """GET a Sylvia gateway path with the API key. Raises RuntimeError on auth (401/403)
     and rate-limit (429) so the dispatcher cools the source down; raises for other HTTP
-    errors too. Returns the parsed JSON body."""
-    response = requests.get(f"{SYLVIA_BASE_URL}{path}", headers={'X-API-KEY': SYLVIA_API_KEY}, timeout=SYLVIA_TIMEOUT)
+    errors too (SubredditUnavailable for a 404 on a `subreddit` listing). Returns the
+    parsed JSON body."""
+    response = _timed_get(f"{SYLVIA_BASE_URL}{path}", SYLVIA_TIMEOUT, headers={'X-API-KEY': SYLVIA_API_KEY})
+    if subreddit and response.status_code == 404:
+        _raise_if_subreddit_unavailable(response, subreddit)
     if response.status_code in (401, 403):
         raise RuntimeError(f"Sylvia auth failed ({response.status_code}); check SYLVIA_API_KEY")
     if response.status_code == 429:
@@ -387,9 +1071,12 @@ def fetch_posts_sylvia(subreddit, limit=10):
     """Fetch posts via the Sylvia Reddit gateway. Returns native-Reddit-shaped post data
     (score/domain/flair all present), fetched from Sylvia's IP rather than ours. Paid per
     request, so only reached when 'sylvia' is in the source order and SYLVIA_API_KEY is set."""
-    data = _sylvia_get(f"/r/{subreddit}/new?limit={limit}")
+    data = _sylvia_get(f"/r/{subreddit}/new?limit={limit}", subreddit)
     posts = []
+    cutoff = _age_cutoff(subreddit)
     for post_data in data.get('data', {}).get('posts', [])[:limit]:
+        if _past_cutoff(post_data, cutoff):
+            break
         posts.append(
             {
                 'id': post_data.get('id', ''),
@@ -400,6 +1087,7 @@ def fetch_posts_sylvia(subreddit, limit=10):
                 'domain': post_data.get('domain', ''),
                 'link_flair_text': post_data.get('link_flair_text') or '',
                 'author': post_data.get('author', ''),
+                'created_utc': post_data.get('created_utc'),
             }
         )
     record_fetch_success()
@@ -428,24 +1116,35 @@ def fetch_thread_comments_sylvia(subreddit, thread_id, limit=500):
                 'author': d.get('author', ''),
                 'score': d.get('score', 0),
                 'permalink': d.get('permalink', ''),
+                'created_utc': d.get('created_utc'),
             }
         )
     return comments
 
 
+def _parse_atom_time(value):
+    """Epoch seconds from an Atom <published>/<updated> timestamp, or None."""
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
 def fetch_posts_rss(subreddit, limit=10):
     """Fetch posts via the www.reddit.com Atom feed (no auth). Raises on 403/429 so the
     dispatcher can fall through and back off. Note: RSS exposes no score and no external
     domain, so those fields degrade to 0 / '' (score/domain filters won't match)."""
-    _rss_throttle()
     url = f"https://www.reddit.com/r/{subreddit}/new/.rss?limit={limit}"
-    response = _http_get(url, headers={'User-Agent': RSS_USER_AGENT})
+    response = _http_get(url, headers={'User-Agent': RSS_USER_AGENT}, rss=True)
+    if response.status_code == 404:  # RSS 403s carry no reason, so only a 404 is the subreddit's
+        raise SubredditUnavailable(subreddit, 'not_found')
     if response.status_code in (403, 429):
         raise RuntimeError(f"RSS blocked ({response.status_code})")
     response.raise_for_status()
 
     root = ET.fromstring(response.content)
     posts = []
+    cutoff = _age_cutoff(subreddit)
     for entry in root.findall('a:entry', ATOM_NS)[:limit]:
 
         def text(tag):
@@ -474,16 +1173,19 @@ def fetch_posts_rss(subreddit, limit=10):
                 'domain': '',  # not exposed via RSS
                 'link_flair_text': flair or '',
                 'author': author,
+                'created_utc': _parse_atom_time(text('published') or text('updated')),
             }
         )
+        if _past_cutoff(posts[-1], cutoff):
+            posts.pop()
+            break
     return posts
 
 
 def fetch_thread_comments_rss(subreddit, thread_id, limit=500):
     """Fetch a thread's comments via the www.reddit.com Atom feed (no auth)."""
-    _rss_throttle()
     url = f"https://www.reddit.com/r/{subreddit}/comments/{thread_id}/.rss?sort=new&limit={limit}"
-    response = _http_get(url, headers={'User-Agent': RSS_USER_AGENT})
+    response = _http_get(url, headers={'User-Agent': RSS_USER_AGENT}, rss=True)
     if response.status_code in (403, 429):
         raise RuntimeError(f"RSS blocked ({response.status_code})")
     response.raise_for_status()
@@ -504,6 +1206,9 @@ def fetch_thread_comments_rss(subreddit, thread_id, limit=500):
             author = author[3:]
         link_el = entry.find('a:link', ATOM_NS)
         permalink = urlparse(link_el.get('href')).path if link_el is not None else ''
+        published_el = entry.find('a:published', ATOM_NS)
+        if published_el is None:
+            published_el = entry.find('a:updated', ATOM_NS)
         comments.append(
             {
                 'id': raw_id.split('_')[-1],
@@ -511,6 +1216,7 @@ def fetch_thread_comments_rss(subreddit, thread_id, limit=500):
                 'author': author,
                 'score': 0,
                 'permalink': permalink,
+                'created_utc': _parse_atom_time(published_el.text if published_el is not None else None),
             }
         )
     return comments
@@ -520,41 +1226,140 @@ def _fetch_posts_oauth(reddit, subreddit, limit):
     """Fetch posts via the authenticated PRAW API. Raises on auth/API errors."""
     sub = reddit.subreddit(subreddit)
     posts = []
-    for s in sub.new(limit=limit):
-        posts.append(
-            {
-                'id': s.id,
-                'title': s.title,
-                'url': s.url,
-                'score': s.score,
-                'permalink': s.permalink,
-                'domain': getattr(s, 'domain', '') or '',
-                'link_flair_text': getattr(s, 'link_flair_text', '') or '',
-                'author': s.author.name if s.author else '',
-            }
-        )
+    cutoff = _age_cutoff(subreddit)
+    try:
+        for s in sub.new(limit=limit):  # lazy listing: stopping early skips further pages
+            if _past_cutoff({'created_utc': getattr(s, 'created_utc', None)}, cutoff):
+                break
+            posts.append(_post_from_submission(s))
+    except Exception as e:
+        # prawcore's Forbidden/NotFound carry the response; Redirect (to the subreddit
+        # search page) is how a subreddit that doesn't exist shows up.
+        response = getattr(e, 'response', None)
+        if type(e).__name__ == 'Redirect':
+            raise SubredditUnavailable(subreddit, 'not_found') from e
+        reason = _subreddit_reason(response) if response is not None else None
+        if reason:
+            raise SubredditUnavailable(subreddit, reason) from e
+        raise
     return posts
 
 
-def fetch_posts(subreddit, limit, reddit):
+def _call_oauth(reddit, fn, *args):
+    """Run fn(client, *args) on the 'oauth' pathway. `reddit` is a single PRAW client
+    (used as-is) or a credentials.RedditPool, in which case the account with the most
+    rate-limit budget left serves the request and one whose credentials are rejected is
+    benched and the next tried, so a 401 on one account doesn't take OAuth down. Raises
+    the last auth error once no account is left."""
+    if not isinstance(reddit, credentials.RedditPool):
+        return fn(reddit, *args)
+    error = None
+    while (account := reddit.acquire()) is not None:
+        try:
+            result = fn(account.client, *args)
+        except Exception as e:
+            if not reddit.release(account, e):
+                raise
+            error = e
+            notifications.notify_error(
+                f"Reddit account '{account.name}' failed authentication; "
+                f"{reddit.healthy_count()} other account(s) still serving OAuth."
+            )
+            continue
+        reddit.release(account)
+        return result
+    raise error or RuntimeError("Reddit 401: every OAuth account is benched after auth failures")
+
+
+def _post_from_submission(s):
+    """Normalize a PRAW Submission to a post dict (same shape as the other fetchers)."""
+    return {
+        'id': s.id,
+        'title': s.title,
+        'url': s.url,
+        'score': s.score,
+        'permalink': s.permalink,
+        'domain': getattr(s, 'domain', '') or '',
+        'link_flair_text': getattr(s, 'link_flair_text', '') or '',
+        'author': s.author.name if s.author else '',
+        'created_utc': getattr(s, 'created_utc', None),
+    }
+
+
+# /api/info takes at most 100 fullnames per call.
+INFO_BATCH_SIZE = 100
+
+
+def fetch_info_json(post_ids):
+    """Current data for specific posts via the anonymous old.reddit.com /api/info.json."""
+    url = f"https://old.reddit.com/api/info.json?id={','.join(f't3_{i}' for i in post_ids)}"
+    try:
+        response = _http_get(url, headers={'User-Agent': JSON_USER_AGENT})
+        response.raise_for_status()
+        children = response.json().get('data', {}).get('children', [])
+    except requests.exceptions.RequestException as e:
+        logging.error(f"JSON info endpoint error: {e}")
+        return None
+    return [_post_from_json(c.get('data', {})) for c in children if c.get('kind') == 't3']
+
+
+def _fetch_comments_oauth(reddit, thread_id):
+    submission = reddit.submission(id=thread_id)
+    submission.comment_sort = 'new'
+    submission.comments.replace_more(limit=0)
+    return [
+        {
+            'id': c.id,
+            'body': c.body,
+            'author': c.author.name if c.author else '[deleted]',
+            'permalink': c.permalink,
+            'created_utc': getattr(c, 'created_utc', None),
+        }
+        for c in submission.comments
+    ]
+
+
+def _fetch_info_oauth(reddit, post_ids):
+    return [_post_from_submission(s) for s in reddit.info(fullnames=[f't3_{i}' for i in post_ids])]
+
+
+def _stamp_fetch(items, source):
+    """Tag fetched posts/comments with when and where they were fetched, so a match can
+    report its detection latency (see latency). Coalesced callers share the same stamp."""
+    fetched_at = time.time()
+    for item in items:
+        item['fetched_at'] = fetched_at
+        item['source'] = source
+
+
+def fetch_posts(subreddit, limit, reddit, urgent=False):
     """Fetch posts, coalescing concurrent/duplicate calls for the same subreddit+limit
-    so overlapping monitors share one request. See _fetch_posts_impl for the chain."""
-    return _coalesce(('posts', subreddit, limit), lambda: _fetch_posts_impl(subreddit, limit, reddit))
+    so overlapping monitors share one request. See _fetch_posts_impl for the chain;
+    `urgent` lets it spend paid requests first (see _plan). Urgent and ordinary callers
+    coalesce separately, since each plans its sources differently."""
+    return _coalesce(('posts', subreddit, limit, urgent), lambda: _fetch_posts_impl(subreddit, limit, reddit, urgent))
 
 
-def _fetch_posts_impl(subreddit, limit, reddit):
+def _fetch_posts_impl(subreddit, limit, reddit, urgent=False):
     """Try each configured source in order until one returns data.
 
-    Returns (posts, source_name), or (None, None) if every source failed.
+    Returns (posts, source_name), or (None, None) if every source failed or the
+    subreddit is negatively cached as gone.
     """
-    for source in config.get_source_order():
+    order = _sources_for(subreddit, urgent)
+    if not order and get_unavailable_reason(subreddit):
+        logging.debug(f"Skipping r/{subreddit}: {get_unavailable_reason(subreddit)}")
+        return None, None
+    for source in order:
         if not _source_available(source):
             continue
+        _check_deadline()
+        started = time.monotonic()
         try:
             if source == 'oauth':
                 if reddit is None:
                     continue
-                posts = _fetch_posts_oauth(reddit, subreddit, limit)
+                posts = _call_oauth(reddit, _fetch_posts_oauth, subreddit, limit)
             elif source == 'rss':
                 posts = fetch_posts_rss(subreddit, limit)
             elif source == 'json':
@@ -563,7 +1368,18 @@ def _fetch_posts_impl(subreddit, limit, reddit):
                 posts = fetch_posts_sylvia(subreddit, limit)
             else:
                 continue
+        except DeadlineExceeded:
+            _record_request(source, 'posts', started, ok=False)
+            raise
+        except SubredditUnavailable as e:
+            _record_request(source, 'posts', started, ok=False)
+            _mark_subreddit_unavailable(source, e)
+            if e.reason in GONE_REASONS:
+                return None, None
+            continue
         except Exception as e:
+            _record_request(source, 'posts', started, ok=False)
+            _check_deadline()  # a timeout cut short by the deadline isn't the source's fault
             error_str = str(e)
             if source == 'oauth' and ('401' in error_str or 'unauthorized' in error_str.lower()):
                 if _claim_auth_error_notification():
@@ -574,7 +1390,9 @@ def _fetch_posts_impl(subreddit, limit, reddit):
             _mark_source_down(source)
             continue
 
+        _record_request(source, 'posts', started, ok=posts is not None)
         if posts is None:
+            _check_deadline()
             logging.warning(f"Reddit source '{source}' returned nothing for r/{subreddit}")
             _mark_source_down(source)
             continue
@@ -582,43 +1400,98 @@ def _fetch_posts_impl(subreddit, limit, reddit):
         if source == 'oauth':
             _reset_auth_error_notification()
         _note_source_success(source)
+        _note_subreddit_source(subreddit, source)
         record_fetch_success()
         _set_active_source(source)
+        _stamp_fetch(posts, source)
         return posts, source
 
     logging.error(f"All Reddit sources failed for r/{subreddit}")
     return None, None
 
 
-def fetch_thread_comments(subreddit, thread_id, reddit):
+def fetch_info(post_ids, reddit):
+    """Refresh specific posts by id (e.g. to re-check their scores), INFO_BATCH_SIZE per
+    request, through the sources that have an info endpoint (oauth, json; RSS has none).
+
+    Returns {post_id: post}. Posts a lookup didn't return (deleted, removed) are absent;
+    the ids of a batch every source failed on map to None, so callers can tell "gone"
+    from "couldn't check".
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    found = {}
+    for start in range(0, len(post_ids), INFO_BATCH_SIZE):
+        batch = post_ids[start : start + INFO_BATCH_SIZE]
+        posts = _fetch_info_batch(batch, reddit)
+        if posts is None:
+            found.update(dict.fromkeys(batch))
+            continue
+        for post in posts:
+            found[post['id']] = post
+    return found
+
+
+def _fetch_info_batch(post_ids, reddit):
+    for source in config.get_source_order():
+        if source not in ('oauth', 'json') or not _source_available(source):
+            continue
+        _check_deadline()
+        started = time.monotonic()
+        try:
+            if source == 'oauth':
+                if reddit is None:
+                    continue
+                posts = _call_oauth(reddit, _fetch_info_oauth, post_ids)
+            else:
+                posts = fetch_info_json(post_ids)
+        except DeadlineExceeded:
+            _record_request(source, 'info', started, ok=False)
+            raise
+        except Exception as e:
+            _record_request(source, 'info', started, ok=False)
+            _check_deadline()
+            logging.warning(f"Reddit source '{source}' failed for an info lookup: {e}")
+            _mark_source_down(source)
+            continue
+
+        _record_request(source, 'info', started, ok=posts is not None)
+        if posts is None:
+            _check_deadline()
+            _mark_source_down(source)
+            continue
+
+        _note_source_success(source)
+        record_fetch_success()
+        _stamp_fetch(posts, source)
+        return posts
+
+    logging.warning(f"No source could refresh {len(post_ids)} post(s) by id")
+    return None
+
+
+def fetch_thread_comments(subreddit, thread_id, reddit, urgent=False):
     """Fetch a thread's comments, coalescing concurrent/duplicate calls for the same
-    thread so overlapping monitors share one request. See _fetch_thread_comments_impl."""
+    thread so overlapping monitors share one request (urgent and ordinary callers
+    separately, as in fetch_posts). See _fetch_thread_comments_impl."""
     return _coalesce(
-        ('comments', subreddit, thread_id), lambda: _fetch_thread_comments_impl(subreddit, thread_id, reddit)
+        ('comments', subreddit, thread_id, urgent),
+        lambda: _fetch_thread_comments_impl(subreddit, thread_id, reddit, urgent),
     )
 
 
-def _fetch_thread_comments_impl(subreddit, thread_id, reddit):
-    """Fetch a thread's comments through the configured source chain (see config.get_source_order)."""
-    for source in config.get_source_order():
+def _fetch_thread_comments_impl(subreddit, thread_id, reddit, urgent=False):
+    """Fetch a thread's comments through the configured source chain (see config.get_source_order),
+    skipping sources the subreddit is closed to and rationing paid ones (see _plan)."""
+    for source in _sources_for(subreddit, urgent):
         if not _source_available(source):
             continue
+        _check_deadline()
+        started = time.monotonic()
         try:
             if source == 'oauth':
                 if reddit is None:
                     continue
-                submission = reddit.submission(id=thread_id)
-                submission.comment_sort = 'new'
-                submission.comments.replace_more(limit=0)
-                comments = [
-                    {
-                        'id': c.id,
-                        'body': c.body,
-                        'author': c.author.name if c.author else '[deleted]',
-                        'permalink': c.permalink,
-                    }
-                    for c in submission.comments
-                ]
+                comments = _call_oauth(reddit, _fetch_comments_oauth, thread_id)
             elif source == 'rss':
                 comments = fetch_thread_comments_rss(subreddit, thread_id)
             elif source == 'json':
@@ -627,17 +1500,25 @@ def _fetch_thread_comments_impl(subreddit, thread_id, reddit):
                 comments = fetch_thread_comments_sylvia(subreddit, thread_id)
             else:
                 continue
+        except DeadlineExceeded:
+            _record_request(source, 'comments', started, ok=False)
+            raise
         except Exception as e:
+            _record_request(source, 'comments', started, ok=False)
+            _check_deadline()
             logging.warning(f"Comment source '{source}' failed for thread {thread_id}: {e}")
             _mark_source_down(source)
             continue
 
+        _record_request(source, 'comments', started, ok=comments is not None)
         if comments is None:
+            _check_deadline()
             _mark_source_down(source)
             continue
 
         _note_source_success(source)
         record_fetch_success()
+        _stamp_fetch(comments, source)
         return comments
 
     logging.error(f"All sources failed fetching comments for thread {thread_id}")
@@ -1,23 +1,43 @@
 """Bot status file written for the API/frontend to read."""
 
-import json
 import logging
 from datetime import datetime, timezone
 
-from . import config, credentials
+from . import config, credentials, filestore
 
 
-def save_bot_status(using_fallback, message=None, active_source=None):
-    """Persist current bot status (active source, fallback state, credential warning)."""
+def read_bot_status():
+    """Current bot_status.json contents ({} if missing/invalid)."""
+    return filestore.read_json(config.get_bot_status_path(), {}) or {}
+
+
+def update_bot_status(**sections):
+    """Merge top-level sections into bot_status.json (locked + atomic) so each writer
+    preserves the others' sections and the API never reads a half-written status."""
     try:
-        status = {
-            'using_json_fallback': using_fallback,
-            'active_source': active_source,
-            'message': message,
-            'credentials_warning': credentials.CREDENTIAL_WARNING,
-            'updated_at': datetime.now(timezone.utc).isoformat(),
-        }
-        with open(config.get_bot_status_path(), 'w') as f:
-            json.dump(status, f)
+        with filestore.update_json(config.get_bot_status_path()) as current:
+            current.update(sections)
     except Exception as e:
         logging.error(f"Failed to save bot status: {e}")
+
+
+def update_shard_status(index, **sections):
+    """update_bot_status for one worker of a sharded bot: its sections go under shards.<index>."""
+    try:
+        with filestore.update_json(config.get_bot_status_path()) as current:
+            shards = current.get('shards') or {}
+            shards[str(index)] = sections
+            current['shards'] = shards
+    except Exception as e:
+        logging.error(f"Failed to save bot status: {e}")
+
+
+def save_bot_status(using_fallback, message=None, active_source=None):
+    """Persist current bot status (active source, fallback state, credential warning)."""
+    update_bot_status(
+        using_json_fallback=using_fallback,
+        active_source=active_source,
+        message=message,
+        credentials_warning=credentials.CREDENTIAL_WARNING,
+        updated_at=datetime.now(timezone.utc).isoformat(),
+    )
@@ -0,0 +1,152 @@
+"""Watch DATA_DIR for changes to search.json / credentials.json and wake the bot.
+
+Uses Linux inotify (via ctypes, no extra dependency) on the directory rather than the
+files, so a file replaced by rename (how filestore writes) is seen as well as in-place
+edits. Where inotify isn't available (non-Linux, exotic filesystems) it falls back to
+polling each file's stat signature (inode, mtime_ns, size), which unlike a bare
+`mtime > last_mtime` comparison also catches same-second edits and renames.
+
+Bursts of writes (an editor's save dance, several API updates in a row) are debounced into
+one callback per file.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+from . import config
+
+# inotify flags (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MODIFY
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+DEBOUNCE_SECONDS = float(os.getenv('WATCH_DEBOUNCE_SECONDS', '0.25'))
+POLL_INTERVAL_SECONDS = float(os.getenv('WATCH_POLL_INTERVAL_SECONDS', '2'))
+
+
+def _open_inotify(directory):
+    """An inotify fd watching `directory`, or None if inotify isn't usable here."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _parse_events(data):
+    """Names (str) from a buffer of raw inotify events."""
+    names = []
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+        offset += _EVENT_HEADER.size
+        raw = data[offset : offset + length].rstrip(b'\0')
+        offset += length
+        if raw:
+            names.append(os.fsdecode(raw))
+    return names
+
+
+class FileWatcher:
+    """Calls `on_change(token)` when a watched file in `directory` changes.
+
+    `files` maps a file name to the token passed to the callback, e.g.
+    {'search.json': 'config', 'credentials.json': 'credentials'}.
+    """
+
+    def __init__(self, directory, files, on_change, debounce=None, poll_interval=None, use_inotify=True):
+        self.directory = directory
+        self.files = dict(files)
+        self.on_change = on_change
+        self.debounce = DEBOUNCE_SECONDS if debounce is None else debounce
+        self.poll_interval = POLL_INTERVAL_SECONDS if poll_interval is None else poll_interval
+        self.use_inotify = use_inotify
+        self.mode = None  # 'inotify' or 'poll' once started
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+        self._signatures = {}
+
+    def _signature(self, name):
+        return config.file_signature(os.path.join(self.directory, name))
+
+    def start(self):
+        self._fd = _open_inotify(self.directory) if self.use_inotify else None
+        # Baseline taken before returning, so a write right after start() isn't missed.
+        self._signatures = {name: self._signature(name) for name in self.files}
+        self.mode = 'inotify' if self._fd is not None else 'poll'
+        target = self._run_inotify if self._fd is not None else self._run_poll
+        self._thread = threading.Thread(target=target, name='file-watcher', daemon=True)
+        self._thread.start()
+        logging.info(f"👀 Watching {self.directory} for changes to {', '.join(self.files)} ({self.mode})")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _fire(self, tokens):
+        for token in sorted(tokens):
+            try:
+                self.on_change(token)
+            except Exception as e:
+                logging.error(f"File watcher callback failed for {token}: {e}")
+
+    def _run_inotify(self):
+        pending = set()
+        quiet_at = 0.0
+        while not self._stop.is_set():
+            timeout = max(0.0, quiet_at - time.monotonic()) if pending else 0.5
+            ready, _, _ = select.select([self._fd], [], [], min(timeout, 0.5))
+            if ready:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    data = b''
+                hits = {self.files[n] for n in _parse_events(data) if n in self.files}
+                if hits:
+                    pending |= hits
+                    quiet_at = time.monotonic() + self.debounce
+            if pending and time.monotonic() >= quiet_at:
+                self._fire(pending)
+                pending = set()
+
+    def _run_poll(self):
+        signatures = self._signatures
+        pending = set()
+        quiet_at = 0.0
+        while not self._stop.wait(self.poll_interval if not pending else max(0.0, quiet_at - time.monotonic())):
+            for name in self.files:
+                sig = self._signature(name)
+                if sig != signatures[name]:
+                    signatures[name] = sig
+                    pending.add(self.files[name])
+                    quiet_at = time.monotonic() + self.debounce
+            if pending and time.monotonic() >= quiet_at:
+                self._fire(pending)
+                pending = set()
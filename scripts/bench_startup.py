@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the two entry points: how long a fresh interpreter takes to import them.
+
+Usage:  python3 scripts/bench_startup.py [--runs 10] [--importtime]
+
+Each run is a new `python -c "import bot"` / `import api` process, so nothing is warm but
+the OS page cache; the median wall time is reported, next to a bare interpreter and the
+heavy optional dependencies (praw, apprise) that the entry points now import only on first
+use. --importtime also prints the slowest modules from `python -X importtime` per entry point.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGETS = {
+    'python (baseline)': 'pass',
+    'bot.py': 'import bot',
+    'api.py': 'import api',
+    'praw + apprise': 'import praw, apprise',
+}
+
+
+def run(code, env, extra=()):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *extra, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return time.perf_counter() - started, result.stderr
+
+
+def slowest_imports(code, env, top=8):
+    """(cumulative µs, module) for the slowest top-level imports of `code`."""
+    _, stderr = run(code, env, extra=('-X', 'importtime'))
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:') :].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2  # importtime indents 2 spaces per level
+        if depth == 1:  # imports made directly by the entry point
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--importtime', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {**os.environ, 'DATA_DIR': data_dir}
+        for code in TARGETS.values():
+            run(code, env)  # compile .pyc once so every measured run is alike
+        for label, code in TARGETS.items():
+            times = [run(code, env)[0] for _ in range(args.runs)]
+            print(f'{label:<18} {statistics.median(times) * 1000:>7.0f} ms median  ({min(times) * 1000:.0f} ms best)')
+        if args.importtime:
+            for label in ('bot.py', 'api.py'):
+                print(f'\nslowest imports for {label}:')
+                for cumulative, name in slowest_imports(TARGETS[label], env):
+                    print(f'  {cumulative / 1000:>7.1f} ms  {name}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tiny load generator for the web API: requests/sec per endpoint against a running server.
+
+Usage:  python3 scripts/loadtest_api.py [--url http://localhost:5001] [--concurrency 16]
+                                         [--duration 10] [--seed 500]
+
+--seed N writes N synthetic monitors into $DATA_DIR/search.json first (point DATA_DIR at a
+scratch directory, never your real one), so /api/monitors is measured at a realistic size.
+Compare `python api.py` (Flask dev server) with `python api.py --serve` on the same data.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import requests
+
+ENDPOINTS = ['/api/monitors', '/api/status']
+
+
+def seed(n):
+    data_dir = Path(os.environ.get('DATA_DIR', '/data'))
+    monitors = [
+        {
+            'id': str(uuid.uuid4()),
+            'name': f'Monitor {i}',
+            'subreddit': f'sub{i % 50}',
+            'color': '#8B5CF6',
+            'keywords': ['4090', 'deal'],
+        }
+        for i in range(n)
+    ]
+    (data_dir / 'search.json').write_text(json.dumps({'subreddits_to_search': monitors}, indent=4))
+    print(f'seeded {n} monitors into {data_dir / "search.json"}')
+
+
+def hammer(url, concurrency, duration):
+    """Hit `url` from `concurrency` threads for `duration` seconds; return (ok, errors)."""
+    counts = {'ok': 0, 'err': 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def worker():
+        session = requests.Session()
+        ok = err = 0
+        while time.monotonic() < stop:
+            try:
+                ok += session.get(url, timeout=10).status_code == 200
+            except requests.RequestException:
+                err += 1
+        with lock:
+            counts['ok'] += ok
+            counts['err'] += err
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts['ok'], counts['err']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5001')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed)
+    for path in ENDPOINTS:
+        ok, err = hammer(args.url.rstrip('/') + path, args.concurrency, args.duration)
+        print(f'{path:<16} {ok / args.duration:>8.1f} req/s  ({ok} ok, {err} errors)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -110,6 +110,30 @@ class TestAPIEndpoints:
         response = client.get('/api/monitors/nonexistent-id')
         assert response.status_code == 404
 
+    def test_run_now_unknown_monitor_is_404(self, client):
+        assert client.post('/api/monitors/nonexistent-id/run').status_code == 404
+
+    def test_run_now_without_bot_is_503(self, client):
+        monitor_id = client.post(
+            '/api/monitors', data=json.dumps({'subreddit': 'gamedeals'}), content_type='application/json'
+        ).get_json()['id']
+        response = client.post(f'/api/monitors/{monitor_id}/run')
+        assert response.status_code == 503  # no bot listening on the control socket
+
+    def test_save_notifies_bot(self, client):
+        with patch('api.rs_control.notify') as notify:
+            client.post('/api/monitors', data=json.dumps({'subreddit': 'gamedeals'}), content_type='application/json')
+        notify.assert_called_once_with('config_changed')
+
+    def test_metrics_counts_requests_by_route(self, client):
+        client.get('/api/monitors/nope')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        body = response.get_data(as_text=True)
+        assert 'reddit_api_requests_total{method="GET",endpoint="/api/monitors/<monitor_id>",status="404"}' in body
+        assert '# TYPE reddit_source_request_seconds histogram' in body
+
 
 class TestCredentialsAPI:
     """Tests for credentials API endpoints."""
@@ -205,3 +229,113 @@ class TestCredentialsAPI:
         status = client.get('/api/status').get_json()
         assert status['rich_filters_supported'] is True
         assert status['oauth_available'] is False  # no Reddit app configured
+
+
+class TestServerOptions:
+    def test_defaults_use_threaded_workers(self, monkeypatch):
+        import api
+
+        monkeypatch.delenv('API_WORKERS', raising=False)
+        monkeypatch.delenv('API_THREADS', raising=False)
+        options = api.server_options()
+        assert options['worker_class'] == 'gthread'
+        assert options['workers'] == 2 and options['threads'] == 8
+        assert options['bind'].endswith(f":{api.API_PORT}")
+
+    def test_env_and_explicit_overrides(self, monkeypatch):
+        import api
+
+        monkeypatch.setenv('API_WORKERS', '3')
+        options = api.server_options(threads=4, port=6000)
+        assert options['workers'] == 3 and options['threads'] == 4
+        assert options['bind'] == '0.0.0.0:6000'
+
+
+class TestConditionalGet:
+    """ETag / If-None-Match on the endpoints the UI polls."""
+
+    @pytest.fixture
+    def client(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {'DATA_DIR': tmpdir}):
+                with open(os.path.join(tmpdir, 'search.json'), 'w') as f:
+                    json.dump({'subreddits_to_search': []}, f)
+                with open(os.path.join(tmpdir, 'credentials.json'), 'w') as f:
+                    json.dump({}, f)
+
+                import importlib
+
+                import api
+
+                importlib.reload(api)
+                api.app.config['TESTING'] = True
+                with api.app.test_client() as client:
+                    yield client
+
+    @pytest.mark.parametrize('path', ['/api/monitors', '/api/status', '/api/credentials/status'])
+    def test_matching_etag_gets_304(self, client, path):
+        first = client.get(path)
+        assert first.status_code == 200 and first.headers.get('ETag')
+        again = client.get(path, headers={'If-None-Match': first.headers['ETag']})
+        assert again.status_code == 304
+        assert again.data == b''
+
+    def test_monitors_etag_changes_with_config(self, client):
+        etag = client.get('/api/monitors').headers['ETag']
+        client.post('/api/monitors', data=json.dumps({'subreddit': 'gamedeals'}), content_type='application/json')
+        response = client.get('/api/monitors', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(response.get_json()['monitors']) == 1
+
+    def test_etag_is_exposed_to_cors_clients(self, client):
+        response = client.get('/api/monitors', headers={'Origin': 'http://nas.local:8080'})
+        assert 'ETag' in response.headers.get('Access-Control-Expose-Headers', '')
+
+
+class TestEventStream:
+    def test_streams_published_events(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {'DATA_DIR': tmpdir}):
+                import importlib
+
+                import api
+                from reddit_scraper import events
+
+                importlib.reload(api)
+                monkeypatch.setattr(api, 'EVENTS_KEEPALIVE_SECONDS', 0.05)
+                api.app.config['TESTING'] = True
+                with api.app.test_client() as client:
+                    response = client.get('/api/events', buffered=False)
+                    assert response.mimetype == 'text/event-stream'
+                    stream = iter(response.response)
+                    assert next(stream).startswith(b'retry:')
+                    events.publish('match', title='RTX 4090')
+                    frame = next(stream).decode()
+                    while frame.startswith(':'):  # skip keep-alives
+                        frame = next(stream).decode()
+                    assert 'event: match' in frame and 'RTX 4090' in frame
+                    assert frame.startswith('id: ')
+                    response.close()
+
+    def test_open_streams_are_capped(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {'DATA_DIR': tmpdir}):
+                import importlib
+                import threading
+
+                import api
+
+                importlib.reload(api)
+                monkeypatch.setattr(api, '_event_streams', threading.BoundedSemaphore(1))
+                api.app.config['TESTING'] = True
+                client = api.app.test_client()
+                first = client.get('/api/events', buffered=False)
+                assert next(iter(first.response)).startswith(b'retry:')
+                refused = client.get('/api/events')
+                assert refused.status_code == 503 and refused.headers['Retry-After']
+                first.close()  # the client went away: its slot is free again
+                second = client.get('/api/events', buffered=False)
+                assert second.status_code == 200
+                assert next(iter(second.response)).startswith(b'retry:')
+                second.close()
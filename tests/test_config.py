@@ -1,5 +1,8 @@
 """Tests for source-order resolution (reddit_scraper.config)."""
 
+import json
+import threading
+
 import pytest
 
 from reddit_scraper import config
@@ -58,3 +61,84 @@ class TestApplySourceOrderFromConfig:
         monkeypatch.delenv('REDDIT_SOURCE_ORDER', raising=False)
         config.apply_source_order_from_config({})
         assert config.get_source_order() == ['oauth', 'json', 'rss']
+
+
+class TestManagedConfigCache:
+    @pytest.fixture(autouse=True)
+    def data_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('DATA_DIR', str(tmp_path))
+        config._config_cache.clear()
+        self.path = tmp_path / 'search.json'
+        self.path.write_text(json.dumps({'subreddits_to_search': [{'id': 'a', 'subreddit': 'gamedeals'}]}))
+        yield
+        config._config_cache.clear()
+
+    def test_unchanged_file_is_not_reloaded(self, monkeypatch):
+        config.get_cached_config()
+        monkeypatch.setattr(config, 'load_managed_config', lambda: pytest.fail("should be served from cache"))
+        assert config.get_cached_config()['subreddits_to_search'][0]['id'] == 'a'
+
+    def test_external_edit_invalidates(self):
+        config.get_cached_config()
+        self.path.write_text(json.dumps({'subreddits_to_search': [{'id': 'b', 'subreddit': 'apphookup', 'x': 1}]}))
+        assert config.get_cached_config()['subreddits_to_search'][0]['id'] == 'b'
+
+    def test_edit_during_load_is_picked_up_next_time(self, monkeypatch):
+        load = config.load_managed_config
+
+        def load_then_edit():
+            loaded = load()
+            self.path.write_text(json.dumps({'subreddits_to_search': [{'id': 'b', 'subreddit': 'apphookup'}]}))
+            return loaded
+
+        monkeypatch.setattr(config, 'load_managed_config', load_then_edit)
+        assert config.get_cached_config()['subreddits_to_search'][0]['id'] == 'a'
+        monkeypatch.setattr(config, 'load_managed_config', load)
+        assert config.get_cached_config()['subreddits_to_search'][0]['id'] == 'b'
+
+    def test_stale_get_and_locked_save_dont_deadlock(self, monkeypatch):
+        config.get_cached_config()
+        self.path.write_text(json.dumps({'subreddits_to_search': [{'id': 'b', 'subreddit': 'apphookup'}]}))
+        saving, reloading = threading.Event(), threading.Event()
+        load = config.load_managed_config
+
+        def reload_after_save_started():
+            reloading.set()
+            return load()  # blocks on the flock the save holds
+
+        def get():  # a GET that finds the cache stale
+            saving.wait(1)
+            config.get_cached_config()
+
+        def put():  # the API's write handlers: flock, then read through the cache, then save
+            with config.config_lock():
+                saving.set()
+                reloading.wait(1)
+                cfg = config.get_cached_config()
+                cfg['subreddits_to_search'].append({'id': 'c', 'subreddit': 'x'})
+                config.save_managed_config(cfg)
+
+        monkeypatch.setattr(config, 'load_managed_config', reload_after_save_started)
+        threads = [threading.Thread(target=get, daemon=True), threading.Thread(target=put, daemon=True)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(3)
+        assert not any(t.is_alive() for t in threads)
+        assert config.find_cached_monitor('c')[0] == 1
+
+    def test_find_monitor_by_id(self):
+        i, monitor = config.find_cached_monitor('a')
+        assert i == 0 and monitor['subreddit'] == 'gamedeals'
+        assert config.find_cached_monitor('missing') == (None, None)
+
+    def test_save_primes_cache_and_index(self, monkeypatch):
+        cfg = config.get_cached_config()
+        cfg['subreddits_to_search'].append({'id': 'c', 'subreddit': 'x', 'color': '#000000', 'name': 'r/x'})
+        config.save_managed_config(cfg)
+        monkeypatch.setattr(config, 'load_managed_config', lambda: pytest.fail("save should prime the cache"))
+        assert config.find_cached_monitor('c')[0] == 1
+
+    def test_returned_copy_does_not_mutate_cache(self):
+        config.get_cached_config()['subreddits_to_search'].clear()
+        assert len(config.get_cached_config()['subreddits_to_search']) == 1
@@ -0,0 +1,89 @@
+"""Tests for the bot control socket (reddit_scraper.control) and the bot's handlers."""
+
+import pytest
+
+from reddit_scraper import control
+
+
+@pytest.fixture
+def server(tmp_path):
+    calls = []
+    handlers = {
+        'config_changed': lambda: calls.append('config') or {'queued': 'config'},
+        'run_monitor': lambda monitor_id: {'queued': monitor_id},
+        'boom': lambda: 1 / 0,
+    }
+    srv = control.ControlServer(handlers, path=str(tmp_path / 'bot.sock'))
+    assert srv.start()
+    srv.calls = calls
+    yield srv
+    srv.stop()
+
+
+class TestControlSocket:
+    def test_round_trip(self, server):
+        assert control.send_command('config_changed', path=server.path) == {'queued': 'config'}
+        assert server.calls == ['config']
+
+    def test_args_are_passed(self, server):
+        assert control.send_command('run_monitor', path=server.path, monitor_id='m1') == {'queued': 'm1'}
+
+    def test_unknown_command_raises(self, server):
+        with pytest.raises(control.ControlError, match='unknown command'):
+            control.send_command('nope', path=server.path)
+
+    def test_handler_error_is_reported(self, server):
+        with pytest.raises(control.ControlError, match='division'):
+            control.send_command('boom', path=server.path)
+
+    def test_missing_socket_raises_and_notify_is_false(self, tmp_path, monkeypatch):
+        with pytest.raises(control.ControlError):
+            control.send_command('config_changed', path=str(tmp_path / 'missing.sock'))
+        monkeypatch.setenv('CONTROL_SOCKET_PATH', str(tmp_path / 'missing.sock'))
+        assert control.notify('config_changed') is False
+
+    def test_stale_socket_is_replaced(self, tmp_path):
+        path = tmp_path / 'bot.sock'
+        path.write_text('stale')
+        srv = control.ControlServer({'config_changed': lambda: 'ok'}, path=str(path))
+        assert srv.start()
+        try:
+            assert control.send_command('config_changed', path=str(path)) == 'ok'
+        finally:
+            srv.stop()
+        assert not path.exists()
+
+
+class TestBotHandlers:
+    def test_commands_queue_and_wake(self):
+        import bot
+
+        signals = bot.BotSignals()
+        handlers = bot.control_handlers(signals)
+        handlers['config_changed']()
+        handlers['run_monitor'](monitor_id='m1')
+        assert signals.wait(0)  # woken
+        assert signals.take() == ({'config'}, {'m1'})
+        assert not signals.wait(0)  # cleared after take
+
+    def test_stop_request_ends_a_long_sleep(self, monkeypatch):
+        import threading
+        import time
+
+        import bot
+
+        monkeypatch.setattr(bot, 'STOP_CHECK_SECONDS', 0.05)
+        signals = bot.BotSignals()
+        threading.Timer(0.1, signals.request_stop).start()  # what the SIGTERM handler does
+        started = time.monotonic()
+        assert signals.wait(60)
+        assert time.monotonic() - started < 1
+
+    def test_dump_stats_includes_loop_and_source_state(self):
+        import bot
+
+        signals = bot.BotSignals()
+        signals.publish_stats(cycle=3)
+        stats = bot.control_handlers(signals)['dump_stats']()
+        assert stats['cycle'] == 3
+        assert 'active_source' in stats and 'source_cooldowns' in stats
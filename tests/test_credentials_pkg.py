@@ -1,6 +1,10 @@
 """Tests for credential loading, the encoding guard, and PRAW auth modes
 (reddit_scraper.credentials)."""
 
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
 
 from reddit_scraper import credentials
@@ -83,3 +87,123 @@ class TestAuthenticateReddit:
         reddit = credentials.authenticate_reddit()
         assert reddit is not None
         assert reddit.read_only is False
+
+
+def _account(name, client=None):
+    return credentials.RedditAccount(name, client or object())
+
+
+class TestRedditPool:
+    def test_builds_one_client_per_app(self):
+        credentials.CREDENTIALS = {
+            'reddit_client_id': 'id1',
+            'reddit_client_secret': 's1',
+            'reddit_accounts': [
+                {'reddit_client_id': 'id2', 'reddit_client_secret': 's2', 'reddit_username': 'bob'},
+                {'reddit_client_id': 'id3'},  # no secret: ignored
+            ],
+        }
+        pool = credentials.authenticate_reddit_pool()
+        assert [a.name for a in pool.accounts] == ['app id1', 'bob']
+
+    def test_no_apps_means_no_pool(self):
+        credentials.CREDENTIALS = {'reddit_client_id': None, 'reddit_client_secret': None}
+        assert credentials.authenticate_reddit_pool() is None
+
+    def test_extra_accounts_checked_for_lookalikes(self):
+        offenders = credentials.check_credential_encoding(
+            {'reddit_accounts': [{'reddit_client_id': 'ok', 'reddit_password': 'pаss'}]}  # Cyrillic а
+        )
+        assert offenders == ['reddit_accounts[0].reddit_password (positions [1])']
+
+    def test_acquire_prefers_most_remaining_budget(self):
+        a, b = _account('a'), _account('b')
+        a.remaining, b.remaining = 10, 500
+        pool = credentials.RedditPool([a, b])
+        assert pool.acquire() is b
+
+    def test_in_flight_requests_count_against_budget(self):
+        a, b = _account('a'), _account('b')
+        a.remaining, b.remaining = 100, 101
+        pool = credentials.RedditPool([a, b])
+        assert [pool.acquire().name for _ in range(3)] == ['b', 'a', 'b']
+
+    def test_release_reads_praw_rate_limits(self):
+        client = type('C', (), {'auth': type('A', (), {'limits': {'remaining': 42.0, 'reset_timestamp': 9e9}})()})()
+        pool = credentials.RedditPool([_account('a', client)])
+        account = pool.acquire()
+        pool.release(account)
+        assert account.remaining == 42.0 and account.in_flight == 0
+
+    def test_auth_failure_benches_only_that_account(self):
+        a, b = _account('a'), _account('b')
+        pool = credentials.RedditPool([a, b])
+        assert pool.release(pool.acquire(), RuntimeError("received 401 HTTP response")) is True
+        assert pool.healthy_count() == 1
+        assert {pool.acquire().name for _ in range(3)} == {'b'}
+        assert pool.snapshot()['a']['benched'] is True
+
+    def test_other_errors_do_not_bench(self):
+        pool = credentials.RedditPool([_account('a')])
+        assert pool.release(pool.acquire(), RuntimeError("503 Service Unavailable")) is False
+        assert pool.healthy_count() == 1
+
+
+def _fake_client(token=None, expires_at=0.0):
+    authorizer = SimpleNamespace(access_token=token, _expiration_timestamp=expires_at, scopes={'read'})
+    return SimpleNamespace(_core=SimpleNamespace(_authorizer=authorizer))
+
+
+class TestTokenCache:
+    @pytest.fixture(autouse=True)
+    def data_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('DATA_DIR', str(tmp_path))
+
+    def test_saved_token_is_reused_by_a_new_client(self):
+        credentials.save_token(_fake_client('tok', time.time() + 3600), 'k1')
+        fresh = _fake_client()
+        assert credentials.restore_token(fresh, 'k1') is True
+        assert fresh._core._authorizer.access_token == 'tok'
+        assert fresh._core._authorizer.scopes == {'read'}
+
+    def test_expired_or_unknown_token_is_not_reused(self):
+        credentials.save_token(_fake_client('old', time.time() + 30), 'k1')
+        assert credentials.restore_token(_fake_client(), 'k1') is False
+        assert credentials.restore_token(_fake_client(), 'other') is False
+
+    def test_key_depends_on_app_and_user_only(self):
+        key = credentials._token_key({'reddit_client_id': 'id', 'reddit_username': 'bob', 'reddit_password': 'a'})
+        assert key == credentials._token_key({'reddit_client_id': 'id', 'reddit_username': 'bob'})
+        assert key != credentials._token_key({'reddit_client_id': 'id'})
+
+    def test_pool_builds_clients_lazily_and_persists_new_tokens(self, monkeypatch):
+        built = []
+
+        def build():
+            built.append(1)
+            return _fake_client('tok', time.time() + 3600)
+
+        account = credentials.RedditAccount('a', build=build, token_key='k1')
+        pool = credentials.RedditPool([account])
+        assert built == []
+        account = pool.acquire()
+        assert account.client is not None  # first real use builds it
+        pool.release(account)
+        assert built == [1]
+        assert credentials.restore_token(_fake_client(), 'k1') is True
+
+    def test_concurrent_first_use_builds_one_client(self):
+        built = []
+
+        def build():
+            built.append(1)
+            time.sleep(0.05)  # the token exchange
+            return _fake_client('tok', time.time() + 3600)
+
+        account = credentials.RedditAccount('a', build=build)
+        threads = [threading.Thread(target=lambda: account.client) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert built == [1]
@@ -0,0 +1,50 @@
+"""Tests for the on-disk response cache (reddit_scraper.diskcache)."""
+
+import os
+import time
+
+from reddit_scraper import diskcache
+
+POSTS = ([{'id': 'abc123', 'title': 'RTX 4090', 'created_utc': 1751223600.0}], 'sylvia')
+
+
+def _cache(tmp_path, max_bytes=1 << 20, max_age=300):
+    return diskcache.DiskCache(str(tmp_path / 'response_cache.bin'), max_bytes, max_age)
+
+
+class TestDiskCache:
+    def test_round_trip_keeps_tuples_and_newest_record(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(('posts', 'gamedeals', 25), ([], 'rss'))
+        cache.put(('posts', 'gamedeals', 25), POSTS)
+        cache.put(('comments', 'hardwareswap', 'xyz'), [{'id': 'c1'}])
+        loaded = _cache(tmp_path).load()
+        assert loaded[('posts', 'gamedeals', 25)][1] == POSTS
+        assert isinstance(loaded[('posts', 'gamedeals', 25)][1], tuple)
+        assert loaded[('comments', 'hardwareswap', 'xyz')][1] == [{'id': 'c1'}]
+
+    def test_expired_records_are_not_loaded(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(('posts', 'old', 25), POSTS, written_at=time.time() - 301)
+        cache.put(('posts', 'new', 25), POSTS)
+        assert list(cache.load()) == [('posts', 'new', 25)]
+
+    def test_torn_tail_is_dropped(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(('posts', 'gamedeals', 25), POSTS)
+        cache.put(('posts', 'buildapcsales', 25), POSTS)
+        with open(cache.path, 'r+b') as f:
+            f.truncate(os.path.getsize(cache.path) - 3)  # crash mid-append
+        assert list(cache.load()) == [('posts', 'gamedeals', 25)]
+
+    def test_missing_file_loads_empty(self, tmp_path):
+        assert _cache(tmp_path).load() == {}
+
+    def test_compaction_bounds_size_and_keeps_newest(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=2000)
+        for i in range(50):
+            cache.put(('posts', f'sub{i}', 25), POSTS, written_at=time.time() - 50 + i)
+        assert os.path.getsize(cache.path) <= 2000
+        loaded = cache.load()
+        assert ('posts', 'sub49', 25) in loaded and ('posts', 'sub0', 25) not in loaded
+        assert sorted(os.listdir(tmp_path)) == ['response_cache.bin']
@@ -0,0 +1,86 @@
+"""Tests for the append-only event log and its tail reader (reddit_scraper.events)."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from reddit_scraper import events
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+class TestPublish:
+    def test_appends_json_lines(self, data_dir):
+        events.publish('status', active_source='rss')
+        events.publish('match', title='RTX 4090')
+        lines = (data_dir / 'events.log').read_text().splitlines()
+        assert len(lines) == 2
+        assert '"type": "status"' in lines[0]
+
+    def test_rotates_when_too_big(self, data_dir, monkeypatch):
+        monkeypatch.setattr(events, 'EVENT_LOG_MAX_BYTES', 10)
+        events.publish('a')
+        events.publish('b')
+        assert (data_dir / 'events.log.1').exists()
+        assert '"type": "b"' in (data_dir / 'events.log').read_text()
+
+    def test_never_raises(self, monkeypatch):
+        monkeypatch.setenv('DATA_DIR', '/nonexistent/dir')
+        events.publish('status')  # logged at debug, not raised
+
+
+class TestEventTail:
+    def test_new_tail_starts_at_end(self):
+        events.publish('old')
+        tail = events.EventTail()
+        assert tail.read() == []
+        events.publish('new', n=1)
+        [(cursor, event)] = tail.read()
+        assert event['type'] == 'new' and event['data'] == {'n': 1}
+        assert cursor == tail.cursor
+
+    def test_resumes_from_cursor(self):
+        events.publish('one')
+        cursor = events.EventTail().cursor
+        events.publish('two')
+        events.publish('three')
+        assert [e['type'] for _, e in events.EventTail(cursor).read()] == ['two', 'three']
+
+    def test_tail_before_log_exists_reads_from_start(self):
+        tail = events.EventTail()
+        events.publish('first')
+        assert [e['type'] for _, e in tail.read()] == ['first']
+
+    def test_partial_line_is_deferred(self, data_dir):
+        tail = events.EventTail()
+        with open(data_dir / 'events.log', 'a') as f:
+            f.write('{"type": "half"')
+        assert tail.read() == []
+        with open(data_dir / 'events.log', 'a') as f:
+            f.write(', "data": {}}\n')
+        assert [e['type'] for _, e in tail.read()] == ['half']
+
+    def test_follows_rotation(self, data_dir, monkeypatch):
+        events.publish('before')
+        tail = events.EventTail()
+        os.replace(data_dir / 'events.log', data_dir / 'events.log.1')
+        events.publish('after')
+        assert [e['type'] for _, e in tail.read()] == ['after']
+
+    def test_wait_times_out_empty(self):
+        events.publish('x')
+        assert events.EventTail().wait(0.05, poll_interval=0.01) == []
+
+    def test_wait_is_woken_by_a_publish(self):
+        events.publish('x')
+        tail = events.EventTail()
+        threading.Timer(0.2, events.publish, ('wake',)).start()
+        started = time.monotonic()
+        assert [e['type'] for _, e in tail.wait(5, poll_interval=5)] == ['wake']
+        assert time.monotonic() - started < 2  # woken by the watcher, not the 5s poll
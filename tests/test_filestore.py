@@ -0,0 +1,92 @@
+"""Tests for atomic JSON writes and cross-process locking (reddit_scraper.filestore)."""
+
+import json
+import multiprocessing
+import os
+import stat
+import threading
+
+import pytest
+
+from reddit_scraper import filestore
+
+
+def _increment(path, n):
+    for _ in range(n):
+        with filestore.update_json(path, default={'n': 0}) as data:
+            data['n'] += 1
+
+
+class TestWriteJsonAtomic:
+    def test_writes_and_leaves_no_temp_files(self, tmp_path):
+        path = str(tmp_path / 'search.json')
+        filestore.write_json_atomic(path, {'a': 1}, indent=4)
+        assert json.loads((tmp_path / 'search.json').read_text()) == {'a': 1}
+        assert sorted(os.listdir(tmp_path)) == ['search.json']
+
+    def test_failed_serialization_keeps_original(self, tmp_path):
+        path = str(tmp_path / 'search.json')
+        filestore.write_json_atomic(path, {'a': 1})
+        with pytest.raises(TypeError):
+            filestore.write_json_atomic(path, {'a': object()})
+        assert json.loads((tmp_path / 'search.json').read_text()) == {'a': 1}
+        assert sorted(os.listdir(tmp_path)) == ['search.json']
+
+    def test_existing_mode_is_preserved(self, tmp_path):
+        path = str(tmp_path / 'credentials.json')
+        filestore.write_json_atomic(path, {})
+        os.chmod(path, 0o600)
+        filestore.write_json_atomic(path, {'k': 'v'})
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_replaces_inode(self, tmp_path):
+        """Rename-based: a reader holding the old file keeps a complete old copy."""
+        path = str(tmp_path / 'search.json')
+        filestore.write_json_atomic(path, {'v': 1})
+        with open(path) as old:
+            filestore.write_json_atomic(path, {'v': 2})
+            assert json.load(old) == {'v': 1}
+        assert filestore.read_json(path) == {'v': 2}
+
+
+class TestReadJson:
+    def test_missing_and_invalid_return_default(self, tmp_path):
+        assert filestore.read_json(str(tmp_path / 'nope.json'), {}) == {}
+        bad = tmp_path / 'bad.json'
+        bad.write_text('{not json')
+        assert filestore.read_json(str(bad), 'd') == 'd'
+
+
+class TestUpdateJson:
+    def test_creates_from_default(self, tmp_path):
+        path = str(tmp_path / 'status.json')
+        with filestore.update_json(path, default={'n': 0}) as data:
+            data['n'] += 1
+        assert filestore.read_json(path) == {'n': 1}
+
+    def test_lock_is_reentrant_in_thread(self, tmp_path):
+        path = str(tmp_path / 'search.json')
+        with filestore.locked(path):
+            with filestore.update_json(path) as data:
+                data['ok'] = True
+        assert filestore.read_json(path) == {'ok': True}
+
+    def test_threads_do_not_lose_updates(self, tmp_path):
+        path = str(tmp_path / 'counter.json')
+        threads = [threading.Thread(target=_increment, args=(path, 25)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert filestore.read_json(path) == {'n': 100}
+
+    @pytest.mark.skipif(filestore.fcntl is None, reason="advisory locking needs fcntl")
+    def test_processes_do_not_lose_updates(self, tmp_path):
+        path = str(tmp_path / 'counter.json')
+        ctx = multiprocessing.get_context('fork')
+        procs = [ctx.Process(target=_increment, args=(path, 25)) for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        assert filestore.read_json(path) == {'n': 100}
@@ -85,3 +85,9 @@ class TestPrimaryHeartbeat:
         sources._state.last_fetch_success_ts = time.time() - 600
         health.send_kuma_heartbeat()
         assert captured[0][1]['status'] == 'down'
+
+    def test_reports_the_health_it_is_given(self, captured, monkeypatch):
+        monkeypatch.setenv('KUMA_PUSH_URL', 'http://kuma/api/push/MAIN')
+        sources._state.last_fetch_success_ts = None  # the coordinator itself never fetches
+        health.send_kuma_heartbeat({'last_fetch_success_ts': time.time(), 'active_source': 'oauth'})
+        assert captured[0][1]['status'] == 'up'
@@ -0,0 +1,66 @@
+"""Tests for the bot's execution lanes (reddit_scraper.lanes)."""
+
+import threading
+import time
+
+from reddit_scraper import lanes
+
+
+def _reap_until(runner, predicate, timeout=2):
+    done = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done += runner.reap()
+        if predicate(done):
+            return done
+        time.sleep(0.01)
+    raise AssertionError(f"lanes never produced the expected results: {done}")
+
+
+class TestLanes:
+    def test_routes_thread_monitors_to_their_own_lane(self):
+        assert lanes.lane_for({'monitor_type': 'thread_comments'}) == lanes.THREADS
+        assert lanes.lane_for({'monitor_type': 'posts'}) == lanes.POSTS
+        assert lanes.lane_for({}) == lanes.POSTS
+
+    def test_slow_thread_scan_does_not_hold_up_post_monitors(self):
+        runner = lanes.Lanes({lanes.POSTS: (1, 60), lanes.THREADS: (1, 60)})
+        release = threading.Event()
+        try:
+            runner[lanes.THREADS].submit('bst', release.wait)
+            runner[lanes.POSTS].submit('gpu', lambda: None, payload='gpu-entry')
+            done = _reap_until(runner, lambda d: any(x.key == 'gpu' for x in d))
+            assert [(d.key, d.payload, d.error) for d in done] == [('gpu', 'gpu-entry', None)]
+            assert runner[lanes.THREADS].busy('bst')
+        finally:
+            release.set()
+            runner.shutdown()
+
+    def test_running_key_is_not_submitted_twice(self):
+        runner = lanes.Lanes({lanes.POSTS: (2, 60)})
+        release = threading.Event()
+        try:
+            assert runner[lanes.POSTS].submit('gpu', release.wait)
+            assert not runner[lanes.POSTS].submit('gpu', release.wait)
+            release.set()
+            _reap_until(runner, lambda d: d)
+            assert runner[lanes.POSTS].submit('gpu', lambda: None)
+        finally:
+            release.set()
+            runner.shutdown()
+
+    def test_errors_and_overruns_are_reported(self):
+        runner = lanes.Lanes({lanes.THREADS: (2, 0.05)})
+        release = threading.Event()
+        try:
+            runner[lanes.THREADS].submit('broken', lambda: 1 / 0)
+            runner[lanes.THREADS].submit('stuck', release.wait)
+            done = _reap_until(runner, lambda d: {x.key for x in d} == {'broken', 'stuck'})
+            by_key = {d.key: d for d in done}
+            assert isinstance(by_key['broken'].error, ZeroDivisionError)
+            assert by_key['stuck'].overrun and runner[lanes.THREADS].busy('stuck')
+            assert not [d for d in runner.reap() if d.key == 'stuck']  # an overrun is reported once
+            assert runner.snapshot()[lanes.THREADS]['running'] == 1
+        finally:
+            release.set()
+            runner.shutdown()
@@ -0,0 +1,39 @@
+"""Tests for detection-latency tracking (reddit_scraper.latency)."""
+
+import pytest
+
+from reddit_scraper import latency, metrics
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    latency.reset()
+    metrics.REGISTRY.reset()
+    yield
+    latency.reset()
+
+
+def test_records_each_stage_per_monitor_and_source():
+    latency.record('m1', 'rss', 1000.0, fetch=1030.0, match=1031.0, notify=1032.5)
+    snap = latency.snapshot()
+    assert snap['by_monitor']['m1']['fetch'] == {'count': 1, 'p50': 30.0, 'p90': 30.0, 'max': 30.0}
+    assert snap['by_monitor']['m1']['last'] == {'fetch': 30.0, 'match': 31.0, 'notify': 32.5}
+    assert snap['by_source']['rss']['notify']['max'] == 32.5
+    assert metrics.DETECTION_LAG.value(stage='match', monitor='m1', source='rss') == (1, 31.0)
+
+
+def test_percentiles_over_window():
+    for lag in range(1, 11):
+        latency.record('m1', 'oauth', 1000.0, fetch=1000.0 + lag)
+    fetch = latency.snapshot()['by_monitor']['m1']['fetch']
+    assert (fetch['count'], fetch['p50'], fetch['p90'], fetch['max']) == (10, 6.0, 10.0, 10.0)
+
+
+def test_items_without_creation_time_are_ignored():
+    latency.record('m1', 'rss', None, fetch=1030.0)
+    assert latency.snapshot() == {'by_monitor': {}, 'by_source': {}}
+
+
+def test_clock_skew_never_goes_negative():
+    latency.record('m1', 'json', 1000.0, fetch=990.0)
+    assert latency.snapshot()['by_monitor']['m1']['fetch']['max'] == 0.0
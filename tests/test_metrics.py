@@ -0,0 +1,97 @@
+"""Tests for the metrics registry, text rendering and instrumentation (reddit_scraper.metrics)."""
+
+import urllib.request
+
+import pytest
+
+from reddit_scraper import metrics, sources
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.REGISTRY.reset()
+    sources._state.reset()
+    yield
+    metrics.REGISTRY.reset()
+
+
+class TestMetricTypes:
+    def test_counter_renders_with_labels(self):
+        c = metrics.Counter('t_total', 'help text', ('source',))
+        c.inc(source='rss')
+        c.inc(2, source='rss')
+        assert c.value(source='rss') == 3
+        assert c.render() == '# HELP t_total help text\n# TYPE t_total counter\nt_total{source="rss"} 3'
+
+    def test_unlabelled_metric_renders_zero(self):
+        assert metrics.Gauge('g', 'h').render().endswith('\ng 0')
+
+    def test_wrong_labels_rejected(self):
+        c = metrics.Counter('t_total', 'h', ('source',))
+        with pytest.raises(ValueError):
+            c.inc(kind='posts')
+
+    def test_label_values_are_escaped(self):
+        c = metrics.Counter('t_total', 'h', ('path',))
+        c.inc(path='a"b\\c')
+        assert 't_total{path="a\\"b\\\\c"} 1' in c.render()
+
+    def test_histogram_buckets_are_cumulative(self):
+        h = metrics.Histogram('lat', 'h', buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.7, 5):
+            h.observe(value)
+        lines = h.render().splitlines()[2:]
+        assert lines == [
+            'lat_bucket{le="0.1"} 1',
+            'lat_bucket{le="1.0"} 3',
+            'lat_bucket{le="+Inf"} 4',
+            'lat_sum 6.25',
+            'lat_count 4',
+        ]
+        assert h.value() == (4, 6.25)
+
+    def test_duplicate_registration_rejected(self):
+        registry = metrics.Registry()
+        registry.register(metrics.Counter('x_total', 'h'))
+        with pytest.raises(ValueError):
+            registry.register(metrics.Counter('x_total', 'h'))
+
+
+class TestInstrumentation:
+    def test_coalesce_counts_hits_and_misses(self, monkeypatch):
+        monkeypatch.setattr(sources, 'FETCH_CACHE_TTL', 60)
+        sources._coalesce(('posts', 'sub', 10), lambda: 1)
+        sources._coalesce(('posts', 'sub', 10), lambda: 1)
+        assert metrics.FETCH_CACHE.value(result='miss') == 1
+        assert metrics.FETCH_CACHE.value(result='hit') == 1
+
+    def test_source_requests_and_errors(self, monkeypatch):
+        monkeypatch.setattr(sources, 'FETCH_CACHE_TTL', 0)
+        monkeypatch.setattr(sources, 'SYLVIA_API_KEY', None)
+        monkeypatch.setattr(sources.config, 'get_source_order', lambda: ['rss', 'json'])
+        monkeypatch.setattr(sources, 'fetch_posts_rss', lambda sub, lim: None)
+        monkeypatch.setattr(sources, 'fetch_posts_json', lambda sub, lim: [{'id': 'p1'}])
+        posts, source = sources.fetch_posts('sub', 10, None)
+        assert source == 'json'
+        assert metrics.SOURCE_REQUESTS.value(source='rss', kind='posts') == 1
+        assert metrics.SOURCE_ERRORS.value(source='rss', kind='posts') == 1
+        assert metrics.SOURCE_ERRORS.value(source='json', kind='posts') == 0
+        assert metrics.SOURCE_LATENCY.value(source='json', kind='posts')[0] == 1
+
+
+def test_http_listener_serves_metrics():
+    metrics.MATCHES.inc(item='post')
+    server = metrics.start_http_server(port=0, host='127.0.0.1')
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+        assert 'reddit_matches_total{item="post"} 1' in body
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_listener_off_without_port(monkeypatch):
+    monkeypatch.delenv('METRICS_PORT', raising=False)
+    assert metrics.start_http_server() is None
@@ -30,6 +30,10 @@ class TestMonitorModel:
         assert 'exclude_keywords' not in stored and 'min_upvotes' not in stored
         assert stored['keywords'] == []  # keywords is always kept
 
+    def test_poll_bounds_stored_only_when_set(self):
+        stored = models.Monitor(id='1', subreddit='x', color='#fff', poll_floor_minutes=2).to_stored_dict()
+        assert stored['poll_floor_minutes'] == 2 and 'poll_ceiling_minutes' not in stored
+
     def test_round_trips_a_full_monitor(self):
         data = {
             'id': 'abc',
@@ -1,7 +1,11 @@
 """Tests for post filtering in RedditMonitor._process_post (reddit_scraper.monitor)."""
 
+import time
 from unittest.mock import MagicMock
 
+import pytest
+
+from reddit_scraper import latency
 from reddit_scraper.monitor import RedditMonitor
 
 
@@ -9,6 +13,7 @@ def make_monitor(keywords=('4090',), **overrides):
     """Build a RedditMonitor without __init__ (no file/network), with mocked side effects."""
     m = RedditMonitor.__new__(RedditMonitor)
     m.subreddit = 'hardwareswap'
+    m.urgent = overrides.get('urgent', False)
     m.keywords = list(keywords)
     m.exclude_keywords = overrides.get('exclude_keywords', [])
     m.min_upvotes = overrides.get('min_upvotes', None)
@@ -87,3 +92,155 @@ class TestProcessPost:
         m.send_push_notification.reset_mock()
         assert process(m, post_id='dup') is False
         m.send_push_notification.assert_not_called()
+
+
+class TestDetectionLatency:
+    def test_match_records_latency_from_fetched_item(self):
+        latency.reset()
+        m = make_monitor()
+        m.monitor_id = 'm1'
+        fetched = {'created_utc': 1.0, 'fetched_at': 2.0, 'source': 'rss'}
+        assert m._process_post(
+            post_id='p1',
+            title='RTX 4090',
+            url='http://x',
+            score=1,
+            permalink='/p1',
+            domain='ebay.com',
+            flair='',
+            author='a',
+            fetched=fetched,
+        )
+        snap = latency.snapshot()
+        assert snap['by_monitor']['m1']['fetch']['max'] == 1.0
+        assert set(snap['by_source']['rss']) == {'fetch', 'match', 'notify'}
+        latency.reset()
+
+
+class TestMaxPostAge:
+    def _process(self, m, age_hours):
+        return m._process_post(
+            post_id='p1',
+            title='RTX 4090',
+            url='http://x',
+            score=1,
+            permalink='/p1',
+            domain='ebay.com',
+            flair='',
+            author='a',
+            fetched={'created_utc': time.time() - age_hours * 3600},
+        )
+
+    def test_post_older_than_window_is_skipped(self):
+        m = make_monitor()
+        m.max_post_age_hours = 12
+        assert self._process(m, 13) is False
+        m.send_push_notification.assert_not_called()
+
+    def test_post_within_window_matches(self):
+        m = make_monitor()
+        m.max_post_age_hours = 12
+        assert self._process(m, 1) is True
+
+
+class TestWatchlist:
+    def _near_miss(self):
+        m = make_monitor(min_upvotes=100)
+        m.reddit = None
+        m.max_post_age_hours = 12
+        assert process(m, post_id='p1', score=10) is False
+        return m
+
+    def test_score_only_miss_is_watched(self):
+        m = self._near_miss()
+        assert list(m.watchlist) == ['p1']
+
+    def test_other_filter_miss_is_not_watched(self):
+        m = make_monitor(min_upvotes=100, exclude_keywords=['wanted'])
+        process(m, title='RTX 4090 wanted', score=10)
+        assert m.watchlist == {}
+
+    def test_refresh_notifies_once_score_is_reached(self, monkeypatch):
+        m = self._near_miss()
+        post = {
+            'id': 'p1',
+            'title': 'RTX 4090 for sale',
+            'url': 'http://x',
+            'score': 150,
+            'permalink': '/p1',
+            'domain': 'ebay.com',
+            'link_flair_text': '',
+            'author': 'seller1',
+        }
+        lookups = []
+        monkeypatch.setattr(
+            'reddit_scraper.sources.fetch_info', lambda ids, reddit: lookups.append(ids) or {'p1': post}
+        )
+        m.refresh_watchlist()
+        assert lookups == [['p1']]
+        m.send_push_notification.assert_called_once()
+        assert m.watchlist == {}
+
+    def test_refresh_skips_posts_still_in_listing(self, monkeypatch):
+        m = self._near_miss()
+        monkeypatch.setattr('reddit_scraper.sources.fetch_info', lambda ids, reddit: pytest.fail("no lookup"))
+        m.refresh_watchlist(skip={'p1'})
+        assert list(m.watchlist) == ['p1']
+
+    def test_expired_and_deleted_posts_are_dropped(self, monkeypatch):
+        m = self._near_miss()
+        m.watchlist['old'] = {'created_utc': time.time() - 13 * 3600, 'added_at': time.time()}
+        monkeypatch.setattr('reddit_scraper.sources.fetch_info', lambda ids, reddit: {})
+        m.refresh_watchlist()
+        assert m.watchlist == {}
+
+    def test_failed_lookup_keeps_watched_posts(self, monkeypatch):
+        m = self._near_miss()
+        m.watchlist['p2'] = {'created_utc': time.time(), 'added_at': time.time()}
+        monkeypatch.setattr('reddit_scraper.sources._fetch_info_batch', lambda ids, reddit: None)
+        m.refresh_watchlist()
+        assert list(m.watchlist) == ['p1', 'p2']
+        m.send_push_notification.assert_not_called()
+
+
+class TestListingTimes:
+    def test_failed_fetch_leaves_no_post_rate_sample(self, monkeypatch):
+        m = make_monitor()
+        m.reddit = None
+        m.last_listing_times = [1000.0, 940.0]  # from the previous, successful run
+        monkeypatch.setattr('reddit_scraper.sources.fetch_posts', lambda *a: (None, None))
+        m.search_reddit_for_keywords()
+        assert m.last_listing_times is None  # scheduler.observe skips this run
+
+
+class TestProcessedSubmissions:
+    @pytest.fixture(autouse=True)
+    def data_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('DATA_DIR', str(tmp_path))
+        return tmp_path
+
+    @staticmethod
+    def _store(ids=()):
+        m = RedditMonitor.__new__(RedditMonitor)
+        m.processed_submissions = set(ids)
+        return m
+
+    def test_save_merges_with_other_writers(self):
+        worker_a, worker_b = self._store(), self._store()
+        worker_a.processed_submissions.add('a')
+        worker_a.save_processed_submissions()
+        worker_b.processed_submissions.add('b')
+        worker_b.save_processed_submissions()  # must not drop worker_a's 'a'
+        fresh = self._store()
+        fresh.load_processed_submissions()
+        assert fresh.processed_submissions == {'a', 'b'}
+
+    def test_truncated_file_loads_empty(self, data_dir):
+        (data_dir / 'processed_submissions.pkl').write_bytes(b'\x80\x04\x95')
+        m = self._store({'x'})
+        m.load_processed_submissions()
+        assert m.processed_submissions == set()
+        m.processed_submissions.add('c')
+        m.save_processed_submissions()
+        m.load_processed_submissions()
+        assert m.processed_submissions == {'c'}
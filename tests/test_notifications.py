@@ -0,0 +1,60 @@
+"""Tests for error-notification aggregation (reddit_scraper.notifications)."""
+
+import pytest
+
+from reddit_scraper import notifications
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Capture dispatched notifications instead of calling Apprise."""
+    calls = []
+    notifications._errors.reset()
+    monkeypatch.setattr(notifications, '_notification_urls', lambda: ['json://localhost'])
+    monkeypatch.setattr(notifications, 'dispatch', lambda body, title: calls.append(body) or True)
+    yield calls
+    notifications._errors.reset()
+
+
+class TestFingerprint:
+    def test_numbers_are_ignored(self):
+        a = notifications.error_fingerprint("HTTP 503 after 1.2s")
+        b = notifications.error_fingerprint("HTTP 502 after 30.5s")
+        assert a == b
+
+    def test_different_messages_differ(self):
+        assert notifications.error_fingerprint("timeout") != notifications.error_fingerprint("forbidden")
+
+
+class TestErrorAggregation:
+    def test_first_error_is_sent_immediately(self, sent):
+        notifications.notify_error("RSS blocked (403)")
+        assert sent == ["Error in Reddit Scraper: RSS blocked (403)"]
+
+    def test_burst_within_window_is_held(self, sent):
+        for _ in range(5):
+            notifications.notify_error("RSS blocked (403)")
+        assert len(sent) == 1  # only the leading-edge alert
+        assert notifications.flush_errors() is False  # window not elapsed yet
+
+    def test_summary_counts_by_fingerprint(self, sent, monkeypatch):
+        notifications.notify_error("first")
+        for code in (403, 429, 403):
+            notifications.notify_error(f"RSS blocked ({code})")
+        notifications.notify_error("timeout")
+        monkeypatch.setattr(notifications, 'ERROR_NOTIFY_WINDOW_SECONDS', 0)
+        assert notifications.flush_errors() is True
+        summary = sent[-1]
+        assert summary.startswith("4 errors (2 distinct)")
+        assert "- 3x RSS blocked (403)" in summary
+        assert "- 1x timeout" in summary
+
+    def test_force_flush_ignores_window(self, sent):
+        notifications.notify_error("a")
+        notifications.notify_error("b")
+        assert notifications.flush_errors(force=True) is True
+        assert len(sent) == 2
+
+    def test_nothing_pending_sends_nothing(self, sent):
+        assert notifications.flush_errors(force=True) is False
+        assert sent == []
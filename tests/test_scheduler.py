@@ -0,0 +1,233 @@
+"""Tests for the incremental monitor schedule (reddit_scraper.scheduler)."""
+
+from unittest.mock import patch
+
+import pytest
+
+from reddit_scraper import scheduler, sources
+from reddit_scraper.monitor import RedditMonitor
+
+
+def mon(id, subreddit='hardwareswap', **fields):
+    return {'id': id, 'subreddit': subreddit, 'keywords': ['4090'], 'cooldown_minutes': 10, **fields}
+
+
+@pytest.fixture(autouse=True)
+def reset_sources():
+    sources._state.reset()
+    RedditMonitor._thread_cache.clear()
+    yield
+    RedditMonitor._thread_cache.clear()
+
+
+class TestDiffMonitors:
+    def test_classifies_each_kind_of_change(self):
+        old = {'a': mon('a'), 'b': mon('b'), 'c': mon('c'), 'd': mon('d')}
+        new = {
+            'a': mon('a'),
+            'b': mon('b', keywords=['3080']),
+            'c': mon('c', cooldown_minutes=30),
+            'e': mon('e'),
+        }
+        diff = scheduler.diff_monitors(old, new)
+        assert diff.added == ['e']
+        assert diff.removed == ['d']
+        assert diff.rule_changed == ['b']
+        assert diff.schedule_changed == ['c']
+
+    def test_toggling_enabled_is_a_schedule_change(self):
+        diff = scheduler.diff_monitors({'a': mon('a')}, {'a': mon('a', enabled=False)})
+        assert diff.schedule_changed == ['a'] and not diff.rule_changed
+
+    def test_no_changes_is_falsy(self):
+        assert not scheduler.diff_monitors({'a': mon('a')}, {'a': mon('a')})
+
+
+class TestScheduler:
+    def test_new_monitors_are_due_immediately(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a'), mon('b', enabled=False)])
+        assert [e.params['id'] for e in s.due(1000)] == ['a']
+        assert s.due(1000 + 60) == []
+        assert [e.params['id'] for e in s.due(1000 + 600)] == ['a']
+
+    def test_run_now_ignores_interval(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a')])
+        s.due(1000)
+        assert [e.params['id'] for e in s.due(1001, run_now={'a'})] == ['a']
+
+    def test_unchanged_and_schedule_changed_keep_instance_and_last_run(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a'), mon('b')])
+        s.due(1000)
+        monitors = {k: e.monitor_for(None) for k, e in s.entries.items()}
+
+        s.apply([mon('a'), mon('b', cooldown_minutes=1)])
+        assert s.entries['a'].monitor is monitors['a']
+        assert s.entries['b'].monitor is monitors['b']
+        assert s.last_run_times() == {'a': 1000, 'b': 1000}
+        assert [e.params['id'] for e in s.due(1000 + 60)] == ['b']
+
+    def test_rule_change_rebuilds_monitor_but_keeps_last_run(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a')])
+        s.due(1000)
+        old = s.entries['a'].monitor_for(None)
+        s.apply([mon('a', keywords=['3080'])])
+        new = s.entries['a'].monitor_for(None)
+        assert new is not old and new.keywords == ['3080']
+        assert s.last_run_times() == {'a': 1000}
+
+    def test_monitor_for_uses_current_reddit_client(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a')])
+        entry = s.entries['a']
+        assert entry.monitor_for('client1').reddit == 'client1'
+        assert entry.monitor_for('client2').reddit == 'client2'
+
+    def test_forgets_caches_only_for_unwatched_subreddits(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1'), mon('b', 'sub1'), mon('c', 'sub2')])
+        with patch.object(sources, 'forget_subreddit') as forget:
+            s.apply([mon('a', 'sub1'), mon('c', 'sub3')])
+        forget.assert_called_once_with('sub2')
+
+    def test_moving_a_subreddit_between_monitors_keeps_cache(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1')])
+        with patch.object(sources, 'forget_subreddit') as forget:
+            s.apply([mon('b', 'sub1')])
+        forget.assert_not_called()
+
+    def test_removed_subreddit_drops_cached_fetches_and_threads(self, monkeypatch):
+        monkeypatch.setattr(sources, 'FETCH_CACHE_TTL', 60)
+        sources._coalesce(('posts', 'sub1', 10), lambda: ['post'])
+        sources._coalesce(('posts', 'sub2', 10), lambda: ['other'])
+        RedditMonitor._thread_cache['sub1-Buy/Sell/Trade'] = {'thread_id': 't1', 'cached_at': 0}
+
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1'), mon('b', 'sub2')])
+        s.apply([mon('b', 'sub2')])
+
+        assert list(sources._state.fetch_cache) == [('posts', 'sub2', 10)]
+        assert RedditMonitor._thread_cache == {}
+
+    def test_profile_uses_widest_age_window(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1', max_post_age_hours=6), mon('b', 'sub1', max_post_age_hours=24)])
+        assert sources._state.subreddit_profiles['sub1'] == {'max_age_hours': 24}
+        s.apply([mon('a', 'sub1', max_post_age_hours=6)])
+        assert sources._state.subreddit_profiles['sub1'] == {'max_age_hours': 6}
+
+    def test_thread_monitor_disables_cutoff(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1'), mon('b', 'sub1', monitor_type='thread_comments')])
+        assert sources._state.subreddit_profiles['sub1'] == {'max_age_hours': None}
+
+    def test_default_window_matches_model(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1')])
+        assert sources._state.subreddit_profiles['sub1'] == {'max_age_hours': 12}
+
+
+class TestAdaptivePolling:
+    def run(self, s, now, times):
+        due = s.due(now)
+        for entry in due:
+            entry.monitor = type('M', (), {'last_listing_times': times})()
+        s.observe(due, now)
+        return due
+
+    def test_fixed_interval_without_bounds(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a')])
+        entry = s.entries['a']
+        s.velocity['hardwareswap'] = scheduler._Velocity()
+        s.velocity['hardwareswap'].rate = 100.0
+        assert s.interval(entry) == 600
+        assert s.snapshot(0)['a']['adaptive'] is False
+
+    def test_starts_at_floor_until_rate_known(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', poll_floor_minutes=2, poll_ceiling_minutes=30)])
+        assert s.interval(s.entries['a']) == 120
+
+    def test_busy_subreddit_polls_at_floor_and_quiet_one_at_ceiling(self):
+        s = scheduler.Scheduler()
+        s.apply(
+            [
+                mon('busy', 'sub1', poll_floor_minutes=2, poll_ceiling_minutes=30),
+                mon('quiet', 'sub2', poll_floor_minutes=2, poll_ceiling_minutes=30),
+            ]
+        )
+        s.entries['busy'].monitor = type('M', (), {'last_listing_times': [1000 - 10 * i for i in range(25)]})()
+        s.entries['quiet'].monitor = type('M', (), {'last_listing_times': [1000 - 7200 * i for i in range(25)]})()
+        s.observe(list(s.entries.values()), 1000)
+        assert s.interval(s.entries['busy']) == 120
+        assert s.interval(s.entries['quiet']) == 1800
+
+    def test_interval_tracks_rate_between_bounds(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', poll_floor_minutes=1, poll_ceiling_minutes=60)])
+        # One post a minute, so ~3 minutes for VELOCITY_TARGET_POSTS new posts.
+        self.run(s, 10_000, [10_000 - 60 * i for i in range(25)])
+        assert s.velocity['hardwareswap'].rate == pytest.approx(1.0)
+        assert s.interval(s.entries['a']) == pytest.approx(scheduler.VELOCITY_TARGET_POSTS * 60)
+
+    def test_rate_is_smoothed_with_new_posts_only(self, monkeypatch):
+        monkeypatch.setattr(scheduler, 'VELOCITY_ALPHA', 0.5)
+        velocity = scheduler._Velocity()
+        velocity.observe([600 - 60 * i for i in range(11)], 600)
+        assert velocity.rate == pytest.approx(1.0)
+        # 10 minutes later: 20 new posts (2/min) plus the old ones still in the listing.
+        velocity.observe([600 + 30 * i for i in range(1, 21)] + [600, 540], 1200)
+        assert velocity.rate == pytest.approx(1.5)
+        # The same listing seen again moments later (another monitor on the sub) is ignored.
+        velocity.observe([1200], 1205)
+        assert velocity.rate == pytest.approx(1.5)
+
+    def test_empty_listings_move_interval_toward_ceiling(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', poll_floor_minutes=1, poll_ceiling_minutes=60)])
+        self.run(s, 10_000, [10_000 - 60 * i for i in range(25)])
+        intervals = [s.interval(s.entries['a'])]
+        now = 10_000
+        for _ in range(20):  # a quiet subreddit: fetched fine, nothing in the age window
+            now += intervals[-1]
+            self.run(s, now, [])
+            intervals.append(s.interval(s.entries['a']))
+        assert intervals == sorted(intervals) and intervals[-1] == 3600
+
+    def test_quiet_subreddit_leaves_the_floor_from_the_first_look(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', poll_floor_minutes=1, poll_ceiling_minutes=60)])
+        self.run(s, 10_000, [])
+        assert s.interval(s.entries['a']) == 3600
+
+    def test_missing_bound_falls_back_to_cooldown(self):
+        entry = scheduler._Entry(mon('a', cooldown_minutes=10, poll_floor_minutes=2))
+        assert entry.bounds == (120, 600)
+        entry = scheduler._Entry(mon('a', cooldown_minutes=10, poll_ceiling_minutes=60))
+        assert entry.bounds == (600, 3600)
+
+    def test_next_due_in_and_snapshot(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', poll_floor_minutes=2, poll_ceiling_minutes=30), mon('b')])
+        self.run(s, 1000, [1000 - 60 * i for i in range(25)])
+        assert s.next_due_in(1000) == pytest.approx(180)
+        snap = s.snapshot(1000)
+        assert snap['a'] == {
+            'interval_minutes': 3.0,
+            'adaptive': True,
+            'posts_per_minute': 1.0,
+            'next_run_in_seconds': 180,
+        }
+        assert snap['b']['interval_minutes'] == 10.0
+
+    def test_removed_subreddit_forgets_rate(self):
+        s = scheduler.Scheduler()
+        s.apply([mon('a', 'sub1', poll_floor_minutes=2)])
+        self.run(s, 1000, [1000, 900])
+        s.apply([mon('b', 'sub2')])
+        assert 'sub1' not in s.velocity
@@ -0,0 +1,122 @@
+"""Tests for the sharded bot mode (reddit_scraper.shards)."""
+
+import multiprocessing
+import queue
+import time
+
+import pytest
+
+from reddit_scraper import config, credentials, notifications, shards, sources
+
+
+@pytest.fixture
+def budgets():
+    yield shards.SharedBudgets(multiprocessing.get_context('spawn'), ['http://p1:8000'], ['sylvia'])
+    sources._state.reset()  # drop the shared budgets attached by a test
+
+
+def _shard(index, count, outbox=None, budgets=None):
+    return shards.Shard(index, count, queue.Queue(), outbox or queue.Queue(), budgets)
+
+
+class TestSharding:
+    def test_every_monitor_lands_on_exactly_one_stable_worker(self):
+        monitors = [{'id': str(i), 'subreddit': f'sub{i}'} for i in range(40)]
+        split = [_shard(i, 3).select(monitors) for i in range(3)]
+        assert sorted(m['id'] for part in split for m in part) == sorted(m['id'] for m in monitors)
+        assert all(split)  # 40 subreddits spread over all three
+        assert shards.shard_of('GameDeals', 3) == shards.shard_of('gamedeals', 3)
+
+    def test_monitors_of_one_subreddit_share_a_worker(self):
+        monitors = [{'id': 'a', 'subreddit': 'gamedeals'}, {'id': 'b', 'subreddit': 'gamedeals'}]
+        assert [len(_shard(i, 4).select(monitors)) for i in range(4)].count(2) == 1
+
+    def test_workers_get_their_own_state_files(self, monkeypatch):
+        assert config.get_source_state_path().endswith('source_state.json')
+        monkeypatch.setenv('BOT_SHARD', '2')
+        assert config.get_source_state_path().endswith('source_state.2.json')
+        assert config.get_response_cache_path().endswith('response_cache.2.bin')
+
+    def test_forwarded_requests_reach_the_loop(self):
+        shard = _shard(0, 2)
+        got = queue.Queue()
+        shard.listen(lambda what: got.put(('reload', what)), lambda monitor_id: got.put(('run', monitor_id)))
+        shard.inbox.put(('reload', 'config'))
+        shard.inbox.put(('run', 'm1'))
+        assert [got.get(timeout=1), got.get(timeout=1)] == [('reload', 'config'), ('run', 'm1')]
+
+
+class TestSharedBudgets:
+    def test_paid_spend_is_counted_across_workers(self, budgets, monkeypatch):
+        monkeypatch.setattr(sources, 'SYLVIA_DAILY_BUDGET', 10)
+        budgets.add_paid('sylvia')  # another worker's request
+        sources.use_shared_budgets(budgets)
+        sources._state.count_request('sylvia', True)
+        sources._state.count_request('sylvia', False)
+        assert sources._state.spent('sylvia') == 2
+        assert sources.get_source_usage()['paid']['spent'] == 2
+        assert sources._state.usage['sylvia'] == {'requests': 2, 'successes': 1}  # this worker's own
+
+    def test_rss_clocks_are_shared(self, budgets, monkeypatch):
+        monkeypatch.setattr(sources, '_PROXIES', ['http://p1:8000'])
+        monkeypatch.setattr(sources, 'RSS_MIN_INTERVAL', 30)
+        budgets.rss_clocks['http://p1:8000'] = time.time() + 20  # another worker just used p1
+        sources.use_shared_budgets(budgets)
+        proxy, at = sources._state.reserve_rss_slot()
+        assert proxy == 'http://p1:8000' and at >= time.time() + 19
+        assert budgets.rss_clocks.get('http://p1:8000') == at + 30
+
+    def test_seed_sums_today_usage_from_every_section(self, budgets):
+        today = {'date': time.strftime('%Y-%m-%d', time.gmtime())}
+        saved = {
+            'source_usage': {**today, 'sources': {'sylvia': {'requests': 4, 'successes': 3}}},
+            'shards': {
+                '0': {'source_usage': {**today, 'sources': {'sylvia': {'requests': 2, 'successes': 2}}}},
+                '1': {'source_usage': {'date': '2000-01-01', 'sources': {'sylvia': {'successes': 50}}}},
+            },
+        }
+        budgets.seed_paid(saved)
+        assert budgets.paid_spent('sylvia') == 5
+
+
+class TestFetchHealth:
+    @staticmethod
+    def _coordinator(count):
+        coordinator = shards.Coordinator.__new__(shards.Coordinator)
+        coordinator.count = count
+        return coordinator
+
+    def test_workers_combine_into_one_bots_health(self):
+        saved = {
+            'shards': {
+                '0': {'fetch_health': {'last_fetch_success_ts': 100.0, 'active_source': 'oauth'}},
+                '1': {'fetch_health': {'last_fetch_success_ts': 250.0, 'active_source': 'rss'}},
+                '2': {'fetch_health': {'last_fetch_success_ts': None, 'active_source': None}},  # no monitors
+            }
+        }
+        assert self._coordinator(3).fetch_health(saved) == {'last_fetch_success_ts': 250.0, 'active_source': 'rss'}
+        assert self._coordinator(3).fetch_health({}) == {'last_fetch_success_ts': None, 'active_source': None}
+
+    def test_idle_worker_does_not_push_its_own_heartbeat(self, monkeypatch):
+        import bot
+
+        pushed = []
+        monkeypatch.setattr(bot.health, 'send_kuma_heartbeat', lambda *a: pushed.append(a))
+        monkeypatch.setattr(bot.status, 'update_shard_status', lambda index, **sections: pushed.append(sections))
+        monkeypatch.setattr(bot.sources, 'save_source_state', lambda: None)
+        monkeypatch.setattr(sources._state, 'last_fetch_success_ts', None)
+        monkeypatch.setattr(sources._state, 'active_source', None)
+        bot.housekeeping({}, _shard(1, 2))
+        assert pushed == [{'fetch_health': {'last_fetch_success_ts': None, 'active_source': None}}]
+
+
+class TestOutbox:
+    def test_notifications_go_to_the_coordinator(self, monkeypatch):
+        outbox = queue.Queue()
+        monkeypatch.setattr(notifications, '_outbox', outbox)
+        monkeypatch.setattr(credentials, 'CREDENTIALS', {'notification_urls': ['json://localhost']})
+        assert notifications.dispatch('RTX 4090 $900', 'Reddit Alert: r/hardwareswap')
+        notifications.notify_error('RSS blocked (403)')
+        assert outbox.get_nowait() == ('dispatch', 'RTX 4090 $900', 'Reddit Alert: r/hardwareswap')
+        assert outbox.get_nowait() == ('error', 'RSS blocked (403)')
+        assert notifications._errors.pending == {}  # the digest lives in the coordinator
@@ -118,6 +118,7 @@ class TestProcessComment:
 
         monitor = RedditMonitor.__new__(RedditMonitor)
         monitor.subreddit = 'frugalmalefashion'
+        monitor.urgent = False
         monitor.keywords = keywords
         monitor.keyword_logic = keyword_logic
         monitor.exclude_keywords = exclude_keywords or []
@@ -231,6 +232,7 @@ class TestFindCurrentThread:
 
         monitor = RedditMonitor.__new__(RedditMonitor)
         monitor.reddit = None
+        monitor.urgent = False
         monitor.subreddit = 'frugalmalefashion'
         monitor.thread_title_pattern = 'Buy/Sell/Trade'
 
@@ -253,6 +255,7 @@ class TestFindCurrentThread:
 
         monitor = RedditMonitor.__new__(RedditMonitor)
         monitor.reddit = None
+        monitor.urgent = False
         monitor.subreddit = 'frugalmalefashion'
         monitor.thread_title_pattern = 'Buy/Sell/Trade'
 
@@ -273,6 +276,7 @@ class TestFindCurrentThread:
 
         monitor = RedditMonitor.__new__(RedditMonitor)
         monitor.reddit = None
+        monitor.urgent = False
         monitor.subreddit = 'frugalmalefashion'
         monitor.thread_title_pattern = 'Buy/Sell/Trade'
 
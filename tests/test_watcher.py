@@ -0,0 +1,103 @@
+"""Tests for the DATA_DIR file watcher (reddit_scraper.watcher)."""
+
+import os
+import threading
+
+import pytest
+
+from reddit_scraper import filestore, watcher
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, token):
+        self.calls.append(token)
+        self.event.set()
+
+    def wait(self, timeout=3):
+        fired = self.event.wait(timeout)
+        self.event.clear()
+        return fired
+
+
+@pytest.fixture(params=['inotify', 'poll'])
+def watch(request, tmp_path):
+    recorder = Recorder()
+    w = watcher.FileWatcher(
+        str(tmp_path),
+        {'search.json': 'config', 'credentials.json': 'credentials'},
+        recorder,
+        debounce=0.05,
+        poll_interval=0.02,
+        use_inotify=request.param == 'inotify',
+    ).start()
+    if request.param == 'inotify' and w.mode != 'inotify':
+        w.stop()
+        pytest.skip('inotify not available')
+    yield tmp_path, recorder
+    w.stop()
+
+
+class TestFileWatcher:
+    def test_atomic_replace_is_seen(self, watch):
+        data_dir, recorder = watch
+        filestore.write_json_atomic(data_dir / 'search.json', {'subreddits_to_search': []})
+        assert recorder.wait()
+        assert recorder.calls == ['config']
+
+    def test_same_size_same_second_edit_is_seen(self, watch):
+        data_dir, recorder = watch
+        path = data_dir / 'credentials.json'
+        path.write_text('{"a": 1}')
+        assert recorder.wait()
+        path.write_text('{"a": 2}')
+        assert recorder.wait()
+        assert recorder.calls == ['credentials', 'credentials']
+
+    def test_burst_is_debounced(self, watch):
+        data_dir, recorder = watch
+        for i in range(5):
+            (data_dir / 'search.json').write_text(str(i))
+        assert recorder.wait()
+        assert recorder.calls == ['config']
+
+    def test_unwatched_files_are_ignored(self, watch):
+        data_dir, recorder = watch
+        (data_dir / 'bot_status.json').write_text('{}')
+        (data_dir / 'search.json.lock').touch()
+        assert not recorder.wait(0.3)
+
+    def test_delete_is_seen(self, watch):
+        data_dir, recorder = watch
+        (data_dir / 'search.json').write_text('{}')
+        assert recorder.wait()
+        os.unlink(data_dir / 'search.json')
+        assert recorder.wait()
+
+
+def test_callback_errors_do_not_stop_the_watcher(tmp_path):
+    recorder = Recorder()
+
+    def flaky(token):
+        recorder(token)
+        raise RuntimeError('boom')
+
+    w = watcher.FileWatcher(str(tmp_path), {'search.json': 'config'}, flaky, debounce=0.05, poll_interval=0.02)
+    w.start()
+    try:
+        (tmp_path / 'search.json').write_text('1')
+        assert recorder.wait()
+        (tmp_path / 'search.json').write_text('22')
+        assert recorder.wait()
+    finally:
+        w.stop()
+
+
+def test_falls_back_to_polling_when_directory_unwatchable(tmp_path):
+    w = watcher.FileWatcher(str(tmp_path / 'missing'), {'search.json': 'config'}, lambda token: None)
+    w.start()
+    w.stop()
+    assert w.mode == 'poll'